@@ -1,8 +1,7 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
-from flask_bcrypt import Bcrypt
 from flask_cors import CORS
 from config import get_config
 
@@ -10,12 +9,19 @@ from config import get_config
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
-bcrypt = Bcrypt()
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
     app.config.from_object(get_config())
     
+    # Allow tests to override settings before the extensions read them
+    if test_config:
+        app.config.update(test_config)
+    
+    # JSON logging through a background thread
+    from app.utils.log import configure_logging
+    configure_logging(app)
+    
     # Disable strict slashes to handle URLs with or without trailing slashes
     app.url_map.strict_slashes = False
     
@@ -23,10 +29,28 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
-    bcrypt.init_app(app)
+    
+    # orjson-backed JSON encoding, and a cache of encoded published events
+    from app.utils.json_provider import FastJSONProvider
+    from app.services.serialization import create_event_json_cache
+    app.json = FastJSONProvider(app)
+    app.extensions['event_json_cache'] = create_event_json_cache(app)
+    
+    # Response cache for anonymous event reads
+    from app.services.cache import create_cache
+    app.extensions['response_cache'] = create_cache(app)
+    
+    # Turns away seat claims for events known to be full, and sheds excess ones
+    from app.services.admission import create_admission_gate
+    app.extensions['admission_gate'] = create_admission_gate(app)
+    
+    # Releases seat holds at their deadlines (started by the first hold taken)
+    from app.services.holds import HoldSweeper
+    app.extensions['hold_sweeper'] = HoldSweeper(app)
     
     # Configure CORS properly to handle preflight requests
-    CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True, methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
+    CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True, methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+         expose_headers=["X-Next-Cursor", "X-Next-Offset"])
     
     # Import and register blueprints
     from app.routes.auth import auth_bp
@@ -37,6 +61,28 @@ def create_app():
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(events_bp, url_prefix='/api/events')
     
+    # Shed load instead of queueing requests behind a saturated hashing pool
+    from app.services.passwords import PasswordHashingBusy
+    
+    @app.errorhandler(PasswordHashingBusy)
+    def handle_password_hashing_busy(e):
+        response = jsonify({'message': 'Server is busy, please try again shortly'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    
+    # Per-endpoint latency, SQL and response size metrics on /metrics
+    from app.services.metrics import init_metrics
+    init_metrics(app)
+    
+    # Warn about N+1 lazy loading while developing
+    from app.utils.query_tracking import init_query_debugging
+    init_query_debugging(app)
+    
+    # Register maintenance commands for flask cli
+    from app.commands import events_cli, users_cli
+    app.cli.add_command(events_cli)
+    app.cli.add_command(users_cli)
+    
     # Shell context for flask cli
     @app.shell_context_processor
     def ctx():
@@ -0,0 +1,93 @@
+import json
+import os
+import click
+from flask.cli import AppGroup
+from app import db
+from app.models.event import Event, event_waitlist
+from app.services.idempotency import prune_idempotency_keys
+from app.services.registration import promote_waitlist
+from app.services.search import rebuild_search_index
+from app.services.user_import import UserImportError, import_users
+from app.utils.bulk_input import detect_format, iter_records
+
+events_cli = AppGroup('events', help='Event maintenance commands.')
+users_cli = AppGroup('users', help='User administration commands.')
+
+@events_cli.command('recount-attendees')
+def recount_attendees():
+    """Recompute the denormalized attendee and held seat counts."""
+    updated = Event.recount_attendees()
+    # Seats freed by the recount go to the waitlists
+    waitlisted = db.session.execute(db.select(event_waitlist.c.event_id).distinct()).scalars().all()
+    promoted = sum(len(promote_waitlist(event_id)) for event_id in waitlisted)
+    db.session.commit()
+    click.echo(f"Recounted attendees for {updated} events")
+    if promoted:
+        click.echo(f"Promoted {promoted} users from waitlists")
+
+@events_cli.command('rebuild-search-index')
+def rebuild_search():
+    """Repopulate the full-text search index from the events table."""
+    rebuild_search_index()
+    db.session.commit()
+    click.echo("Rebuilt the event search index")
+
+@events_cli.command('prune-idempotency-keys')
+def prune_idempotency():
+    """Delete stored Idempotency-Key responses past their expiry."""
+    deleted = prune_idempotency_keys()
+    click.echo(f"Pruned {deleted} idempotency keys")
+
+def _read_progress(path):
+    try:
+        with open(path) as f:
+            return json.load(f)['processed']
+    except FileNotFoundError:
+        return 0
+
+def _write_progress(path, report):
+    # Replace the file in one step so an interrupted write never loses the count
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'processed': report['processed'], 'created': report['created']}, f)
+    os.replace(path + '.tmp', path)
+
+@users_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-size', type=int, default=None,
+              help='Rows committed per transaction (default USER_IMPORT_CHUNK_SIZE).')
+@click.option('--progress', 'progress_path', default=None,
+              help='File recording the rows done so far (default PATH.progress).')
+@click.option('--restart', is_flag=True, help='Ignore earlier progress and start from the first row.')
+def import_users_command(path, chunk_size, progress_path, restart):
+    """Create regular users from a CSV or JSONL file with username, email and password.
+
+    Progress is saved after every committed chunk, so an interrupted import resumes
+    where it stopped when run again.
+    """
+    try:
+        fmt = detect_format(filename=path)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='PATH')
+
+    progress_path = progress_path or path + '.progress'
+    skip = 0 if restart else _read_progress(progress_path)
+    if skip:
+        click.echo(f"Resuming after {skip} rows")
+
+    def on_chunk(report):
+        _write_progress(progress_path, report)
+        click.echo(f"{report['processed']} rows processed, {report['created']} users created")
+
+    with open(path, 'rb') as f:
+        try:
+            report = import_users(iter_records(f, fmt), chunk_size=chunk_size, skip=skip, on_chunk=on_chunk)
+        except UserImportError as e:
+            for row in e.report['rejected']:
+                click.echo(f"Row {row['row']}: {row['message']}", err=True)
+            raise click.ClickException(f"{e} (import stopped after {e.report['processed']} rows)")
+
+    for row in report['rejected']:
+        click.echo(f"Row {row['row']}: {row['message']}", err=True)
+    if os.path.exists(progress_path):
+        os.remove(progress_path)
+    click.echo(f"Imported {report['created']} users, rejected {len(report['rejected'])} rows")
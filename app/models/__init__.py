@@ -1,2 +1,3 @@
 from app.models.user import User, UserRole, event_attendees
-from app.models.event import Event
+from app.models.event import Event, event_waitlist, seat_holds
+from app.models.idempotency import idempotency_keys
@@ -1,9 +1,45 @@
 from datetime import datetime
 from app import db
 from app.models.user import event_attendees
+from app.utils.conditional import make_etag
+
+# Users waiting for a seat at a full event, served in position order. The primary key
+# leads with (event_id, position), so the head of an event's waitlist is one index seek.
+event_waitlist = db.Table('event_waitlist',
+    db.Column('event_id', db.Integer, db.ForeignKey('events.id'), primary_key=True),
+    db.Column('position', db.Integer, primary_key=True, autoincrement=False),
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), nullable=False),
+    db.Column('joined_at', db.DateTime, default=datetime.utcnow),
+    db.UniqueConstraint('event_id', 'user_id', name='uq_event_waitlist_event_user')
+)
+
+# Seats reserved for a user until expires_at, counted in Event.held_count until the hold
+# is confirmed (turned into a registration), released or expired
+seat_holds = db.Table('seat_holds',
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('event_id', db.Integer, db.ForeignKey('events.id'), nullable=False),
+    db.Column('user_id', db.Integer, db.ForeignKey('users.id'), nullable=False),
+    db.Column('expires_at', db.DateTime, nullable=False),
+    db.Column('created_at', db.DateTime, default=datetime.utcnow),
+    db.UniqueConstraint('event_id', 'user_id', name='uq_seat_holds_event_user'),
+    # Expired holds of one event, reclaimed when the event looks full
+    db.Index('ix_seat_holds_event_expires_at', 'event_id', 'expires_at'),
+    # All outstanding holds in deadline order, loaded when the expiry sweeper starts
+    db.Index('ix_seat_holds_expires_at', 'expires_at')
+)
 
 class Event(db.Model):
     __tablename__ = 'events'
+    __table_args__ = (
+        # Public listing: WHERE is_published ORDER BY start_time, id (keyset pagination)
+        db.Index('ix_events_published_start_time', 'is_published', 'start_time', 'id'),
+        # Listing version check: COUNT(*) / MAX(updated_at) of the published events
+        db.Index('ix_events_published_updated_at', 'is_published', 'updated_at'),
+        # A publisher's own events, in listing order
+        db.Index('ix_events_publisher_start_time', 'publisher_id', 'start_time', 'id'),
+        # Unfiltered (admin) listing
+        db.Index('ix_events_start_time', 'start_time', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100), nullable=False)
@@ -14,6 +50,10 @@ class Event(db.Model):
     capacity = db.Column(db.Integer, nullable=True)
     is_published = db.Column(db.Boolean, default=False)
     ticket_price = db.Column(db.Float, nullable=True, default=0.0)
+    # Denormalized number of rows in event_attendees, kept in sync on register/unregister
+    attendee_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Number of rows in seat_holds; held seats count against capacity like registrations
+    held_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -29,11 +69,11 @@ class Event(db.Model):
             return False
             
         # Check if event is already full
-        if self.capacity and len(self.attendees) >= self.capacity:
+        if self.is_full():
             return False
             
         # Check if user is already registered
-        if user in self.attendees:
+        if self.has_attendee(user):
             return False
             
         return True
@@ -42,40 +82,134 @@ class Event(db.Model):
         """Register a user for this event"""
         if self.can_register(user):
             self.attendees.append(user)
+            self.increment_attendee_count(1)
             return True
         return False
     
     def unregister_user(self, user):
         """Unregister a user from this event"""
-        if user in self.attendees:
+        if self.has_attendee(user):
             self.attendees.remove(user)
+            self.increment_attendee_count(-1)
             return True
         return False
     
+    def has_attendee(self, user):
+        """Check if a user is registered without loading the attendee list"""
+        return Event.is_registered(self.id, user.id)
+    
+    @staticmethod
+    def is_registered(event_id, user_id):
+        """Check for a registration row in event_attendees"""
+        return db.session.query(
+            db.exists().where(
+                event_attendees.c.event_id == event_id,
+                event_attendees.c.user_id == user_id
+            )
+        ).scalar()
+    
+    def increment_attendee_count(self, amount):
+        """Adjust the attendee counter in SQL so concurrent updates are not lost"""
+        self.attendee_count = Event.attendee_count + amount
+        # Flush right away so the counter reads back as a number, not a SQL expression
+        db.session.flush()
+    
     def get_attendee_count(self):
         """Get the number of attendees"""
-        return len(self.attendees)
+        return self.attendee_count or 0
+    
+    def get_held_count(self):
+        """Get the number of seats currently on hold"""
+        return self.held_count or 0
+    
+    def has_unlimited_capacity(self):
+        """A capacity of None, 0 or less means any number of attendees can register"""
+        return self.capacity is None or self.capacity <= 0
+    
+    @classmethod
+    def unlimited_capacity(cls):
+        """SQL condition matching has_unlimited_capacity()"""
+        return db.or_(cls.capacity.is_(None), cls.capacity <= 0)
     
     def is_full(self):
-        """Check if the event is at capacity"""
-        if not self.capacity:
+        """Check if the event is at capacity, counting held seats"""
+        if self.has_unlimited_capacity():
             return False
-        return self.get_attendee_count() >= self.capacity
-    
-    def to_dict(self):
-        return {
-            'id': self.id,
-            'title': self.title,
-            'description': self.description,
-            'location': self.location,
-            'start_time': self.start_time.isoformat(),
-            'end_time': self.end_time.isoformat(),
-            'capacity': self.capacity,
-            'is_published': self.is_published,
-            'ticket_price': self.ticket_price,
-            'publisher_id': self.publisher_id,
-            'attendee_count': self.get_attendee_count(),
-            'is_full': self.is_full(),
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        return self.get_attendee_count() + self.get_held_count() >= self.capacity
+    
+    @classmethod
+    def recount_attendees(cls, now=None):
+        """
+        Recompute attendee_count and held_count for every event from event_attendees and
+        seat_holds. Holds past their deadline are deleted first: they no longer reserve
+        a seat, and counting them would leave it unavailable.
+        """
+        db.session.execute(seat_holds.delete().where(seat_holds.c.expires_at <= (now or datetime.utcnow())))
+        registrations = db.select(db.func.count()).where(
+            event_attendees.c.event_id == cls.id
+        ).scalar_subquery()
+        holds = db.select(db.func.count()).where(
+            seat_holds.c.event_id == cls.id
+        ).scalar_subquery()
+        result = db.session.execute(
+            db.update(cls).values(attendee_count=registrations, held_count=holds),
+            execution_options={'synchronize_session': False}
+        )
+        return result.rowcount
+    
+    def etag(self):
+        """ETag for this event's representation (changes on edits, registrations and holds)"""
+        return make_etag('event', self.id, self.updated_at.isoformat(), self.get_attendee_count(),
+                         self.get_held_count())
+    
+    def to_dict(self, fields=None):
+        """Serialize the event, or only the given fields (see SERIALIZED_FIELDS)"""
+        if fields is None:
+            return {
+                'id': self.id,
+                'title': self.title,
+                'description': self.description,
+                'location': self.location,
+                'start_time': self.start_time.isoformat(),
+                'end_time': self.end_time.isoformat(),
+                'capacity': self.capacity,
+                'is_published': self.is_published,
+                'ticket_price': self.ticket_price,
+                'publisher_id': self.publisher_id,
+                'attendee_count': self.get_attendee_count(),
+                'held_count': self.get_held_count(),
+                'is_full': self.is_full(),
+                'created_at': self.created_at.isoformat(),
+                'updated_at': self.updated_at.isoformat()
+            }
+        # Only touch the requested attributes, so columns left unloaded stay unloaded
+        return {name: serialize(self) for name, serialize in SERIALIZED_FIELDS.items() if name in fields}
+
+def _isoformat(column):
+    return lambda event: getattr(event, column).isoformat()
+
+def _attribute(column):
+    return lambda event: getattr(event, column)
+
+# Fields of Event.to_dict(), in output order
+SERIALIZED_FIELDS = {
+    'id': _attribute('id'),
+    'title': _attribute('title'),
+    'description': _attribute('description'),
+    'location': _attribute('location'),
+    'start_time': _isoformat('start_time'),
+    'end_time': _isoformat('end_time'),
+    'capacity': _attribute('capacity'),
+    'is_published': _attribute('is_published'),
+    'ticket_price': _attribute('ticket_price'),
+    'publisher_id': _attribute('publisher_id'),
+    'attendee_count': Event.get_attendee_count,
+    'held_count': Event.get_held_count,
+    'is_full': Event.is_full,
+    'created_at': _isoformat('created_at'),
+    'updated_at': _isoformat('updated_at'),
+}
+
+# Columns each serialized field reads, for loading only what a projection needs
+FIELD_COLUMNS = {name: (name,) for name in SERIALIZED_FIELDS}
+FIELD_COLUMNS['is_full'] = ('capacity', 'attendee_count', 'held_count')
@@ -0,0 +1,18 @@
+from datetime import datetime
+from app import db
+
+# Responses of requests sent with an Idempotency-Key header, replayed when the client
+# retries the same request. status_code is NULL while the first request is in flight;
+# rows past expires_at are pruned (and may be taken over by a new request).
+idempotency_keys = db.Table('idempotency_keys',
+    db.Column('user_id', db.Integer, primary_key=True, autoincrement=False),
+    db.Column('key', db.String(255), primary_key=True),
+    db.Column('route', db.String(200), primary_key=True),
+    # SHA-256 of the request body, to refuse a key reused for a different request
+    db.Column('fingerprint', db.String(64), nullable=False),
+    db.Column('status_code', db.Integer, nullable=True),
+    db.Column('headers', db.Text, nullable=True),
+    db.Column('body', db.LargeBinary, nullable=True),
+    db.Column('created_at', db.DateTime, default=datetime.utcnow),
+    db.Column('expires_at', db.DateTime, nullable=False, index=True)
+)
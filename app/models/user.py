@@ -1,7 +1,7 @@
 from datetime import datetime
-from flask_sqlalchemy import SQLAlchemy
-from flask_bcrypt import Bcrypt
 from app import db
+from app.services import passwords
+from app.utils.conditional import make_etag
 
 # User roles as enum-like constants
 class UserRole:
@@ -13,7 +13,11 @@ class UserRole:
 event_attendees = db.Table('event_attendees',
     db.Column('user_id', db.Integer, db.ForeignKey('users.id'), primary_key=True),
     db.Column('event_id', db.Integer, db.ForeignKey('events.id'), primary_key=True),
-    db.Column('registered_at', db.DateTime, default=datetime.utcnow)
+    db.Column('registered_at', db.DateTime, nullable=False, default=datetime.utcnow),
+    # The primary key leads with user_id, so lookups by event need their own index;
+    # both indexes also serve the registration-order pagination
+    db.Index('ix_event_attendees_event_registered_at', 'event_id', 'registered_at', 'user_id'),
+    db.Index('ix_event_attendees_user_registered_at', 'user_id', 'registered_at', 'event_id')
 )
 
 class User(db.Model):
@@ -23,7 +27,9 @@ class User(db.Model):
     username = db.Column(db.String(50), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
-    role = db.Column(db.String(20), nullable=False, default=UserRole.USER)
+    role = db.Column(db.String(20), nullable=False, default=UserRole.USER, index=True)
+    # Bumped on every role change so tokens carrying the old role claim can be rejected
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -32,19 +38,42 @@ class User(db.Model):
     published_events = db.relationship('Event', backref='publisher', lazy=True)
     
     # Events this user is attending (many-to-many)
+    # Loaded only when accessed: eager loading here would fetch every registration
+    # on each authenticated request. Use registrations_query() for paginated access.
     events_attending = db.relationship('Event', 
                                      secondary=event_attendees,
-                                     lazy='subquery',
+                                     lazy='select',
                                      backref=db.backref('attendees', lazy=True))
 
     def __init__(self, username, email, password, role=UserRole.USER):
         self.username = username
         self.email = email
-        self.password_hash = Bcrypt().generate_password_hash(password).decode('utf-8')
+        self.set_password(password)
         self.role = role
 
+    def set_password(self, password):
+        self.password_hash = passwords.hash_password(password)
+
     def check_password(self, password):
-        return Bcrypt().check_password_hash(self.password_hash, password)
+        return passwords.check_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """Check if the stored hash uses a different bcrypt cost than the configured one"""
+        return passwords.needs_rehash(self.password_hash)
+    
+    def registrations_query(self):
+        """Query of (Event, registered_at, event_id) rows for the events this user is attending"""
+        from app.models.event import Event
+        return db.session.query(
+            Event, event_attendees.c.registered_at, event_attendees.c.event_id
+        ).join(
+            event_attendees, event_attendees.c.event_id == Event.id
+        ).filter(event_attendees.c.user_id == self.id)
+    
+    def set_role(self, role):
+        """Change the user's role and invalidate tokens that embed the previous one"""
+        self.role = role
+        self.token_version = (self.token_version or 0) + 1
     
     def is_admin(self):
         return self.role == UserRole.ADMIN
@@ -58,6 +87,10 @@ class User(db.Model):
     def can_manage_publishers(self):
         return self.is_admin()
     
+    def etag(self):
+        """ETag for this user's representation"""
+        return make_etag('user', self.id, self.updated_at.isoformat())
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -1,12 +1,15 @@
+import logging
 from flask import Blueprint, request, jsonify, make_response
-from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt, get_jwt_identity, verify_jwt_in_request
 from app import db
 from app.models.user import User, UserRole
 from email_validator import validate_email, EmailNotValidError
-from app.utils.auth import custom_jwt_required
+from app.utils.conditional import conditional_json
+from app.utils.auth import custom_jwt_required, get_current_user, load_user, role_claims_enabled, token_claims
 from functools import wraps
 
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
 
 # Add a route to handle OPTIONS preflight requests for all auth endpoints
 @auth_bp.route('/<path:path>', methods=['OPTIONS'])
@@ -73,9 +76,15 @@ def login():
     if not user or not user.check_password(data['password']):
         return jsonify({'message': 'Invalid email or password'}), 401
     
+    # Upgrade hashes made with an outdated cost while we have the plain password
+    if user.password_needs_rehash():
+        user.set_password(data['password'])
+        db.session.commit()
+    
     # Create access and refresh tokens
-    access_token = create_access_token(identity=str(user.id))
-    refresh_token = create_refresh_token(identity=str(user.id))
+    claims = token_claims(user)
+    access_token = create_access_token(identity=str(user.id), additional_claims=claims)
+    refresh_token = create_refresh_token(identity=str(user.id), additional_claims=claims)
     
     return jsonify({
         'message': 'Login successful',
@@ -101,10 +110,7 @@ def custom_jwt_refresh_required():
                 verify_jwt_in_request(refresh=True)
                 return fn(*args, **kwargs)
             except Exception as e:
-                # Print detailed error for debugging
-                import traceback
-                print(f"Refresh Token Validation Error: {str(e)}")
-                print(traceback.format_exc())
+                logger.debug('Refresh token validation failed: %s', e)
                 
                 # Return more specific error response
                 if 'expired' in str(e).lower():
@@ -124,7 +130,19 @@ def refresh():
     # Make sure identity is a string
     if not isinstance(identity, str):
         identity = str(identity)
-    access_token = create_access_token(identity=identity)
+    
+    claims = {}
+    if role_claims_enabled():
+        # Re-read the role so the new access token carries the current one,
+        # and refuse refresh tokens issued before the last role change
+        user = load_user(identity)
+        if not user:
+            return jsonify({'message': 'User not found'}), 404
+        if get_jwt().get('tv') != user.token_version:
+            return jsonify({"message": "Refresh token has been revoked", "error_type": "token_revoked"}), 401
+        claims = token_claims(user)
+    
+    access_token = create_access_token(identity=identity, additional_claims=claims)
     
     return jsonify({
         'access_token': access_token
@@ -134,18 +152,12 @@ def refresh():
 @auth_bp.route('/me/', methods=['GET'])
 @custom_jwt_required()
 def get_me():
-    user_id = get_jwt_identity()
-    
-    # Convert string ID to integer if needed
-    if isinstance(user_id, str) and user_id.isdigit():
-        user_id = int(user_id)
-    
-    user = User.query.filter_by(id=user_id).first()
+    user = get_current_user()
     
     if not user:
         return jsonify({'message': 'User not found'}), 404
     
-    return jsonify(user.to_dict()), 200
+    return conditional_json(lambda: jsonify(user.to_dict()), user.etag(), user.updated_at)
 
 @auth_bp.route('/validate-token', methods=['POST'])
 @auth_bp.route('/validate-token/', methods=['POST'])
@@ -177,9 +189,7 @@ def validate_token():
             }), 200
             
         except Exception as e:
-            import traceback
-            print(f"Token validation error: {str(e)}")
-            print(traceback.format_exc())
+            logger.debug('Token validation failed: %s', e)
             
             return jsonify({
                 'message': f'Token validation failed: {str(e)}',
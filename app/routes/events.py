@@ -1,12 +1,49 @@
-from flask import Blueprint, request, jsonify, make_response
+import logging
+from flask import Blueprint, current_app, request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from datetime import datetime
+from itertools import islice
 from app import db
-from app.models.event import Event
-from app.models.user import User
-from app.utils.auth import publisher_required, get_current_user, custom_jwt_required
+from app.models.event import Event, event_waitlist, seat_holds
+from app.models.user import User, event_attendees
+from app.utils.auth import admin_required, publisher_required, get_current_user, custom_jwt_required, get_optional_user_id, load_user
+from app.utils.pagination import get_page_args, keyset_paginate, parse_datetime
+from app.utils.streaming import STREAM_BATCH_SIZE, stream_csv, stream_json, wants_ndjson
+from app.utils.json_provider import json_array, raw_json_response
+from app.utils.bulk_input import request_records
+from app.utils.projection import (
+    attendee_query, attendee_serializer, event_serializer, load_fields, parse_attendee_fields, parse_fields,
+    parse_includes, representation_etag_parts
+)
+from app.utils.conditional import conditional_json, make_etag, not_modified_response, set_validators
+from app.services.registration import (
+    RegistrationResult, join_waitlist, leave_waitlist, promote_waitlist, register_attendee,
+    unregister_attendee, waitlist_length, waitlist_position
+)
+from app.services.attendee_import import import_attendees
+from app.services.admission import admission_controlled, get_admission_stats, get_gate
+from app.services.holds import confirm_hold, hold_seat, release_hold
+from app.services.idempotency import idempotent
+from app.services.search import search_events
+from app.services.serialization import encode_event
+from app.services.cache import EVENT_LIST_TAG, cached_response, event_tag, get_cache_stats, invalidate, invalidate_event
 
 events_bp = Blueprint('events', __name__)
+logger = logging.getLogger(__name__)
+
+# Error responses for rejected registration attempts
+REGISTRATION_ERRORS = {
+    RegistrationResult.EVENT_NOT_FOUND: ('Event not found', 404),
+    RegistrationResult.NOT_PUBLISHED: ('Event is not published', 400),
+    RegistrationResult.ALREADY_REGISTERED: ('Already registered for this event', 400),
+    RegistrationResult.NOT_REGISTERED: ('Not registered for this event', 400),
+    RegistrationResult.FULL: ('Event is at full capacity', 400),
+    RegistrationResult.ALREADY_WAITLISTED: ('Already on the waitlist for this event', 400),
+    RegistrationResult.NOT_WAITLISTED: ('Not on the waitlist for this event', 400),
+    RegistrationResult.ALREADY_HELD: ('Already holding a seat for this event', 400),
+    RegistrationResult.NO_HOLD: ('No seat held for this event', 400),
+    RegistrationResult.HOLD_EXPIRED: ('Seat hold has expired', 410),
+}
 
 # Add a route to handle OPTIONS preflight requests for all events endpoints
 @events_bp.route('/<path:path>', methods=['OPTIONS'])
@@ -19,11 +56,117 @@ def handle_options(path=None):
     response.headers.add('Access-Control-Allow-Credentials', 'true')
     return response
 
+def filter_events(query, args):
+    """
+    Apply the listing filters (start time range, location and publisher) from the query string
+    """
+    try:
+        if args.get('from'):
+            query = query.filter(Event.start_time >= parse_datetime(args['from']))
+        if args.get('to'):
+            query = query.filter(Event.start_time <= parse_datetime(args['to']))
+    except ValueError:
+        raise ValueError('Invalid datetime format')
+    
+    if args.get('location'):
+        query = query.filter(Event.location.ilike(f"%{args['location']}%"))
+    
+    if args.get('publisher_id'):
+        try:
+            query = query.filter(Event.publisher_id == int(args['publisher_id']))
+        except ValueError:
+            raise ValueError('Invalid publisher_id')
+    
+    return query
+
+def registration_user_id(includes):
+    """The user whose registration status was requested with ?include=, if any"""
+    if 'registration_status' in includes:
+        return get_optional_user_id()
+    return None
+
+def events_serializer(events, fields, includes, user_id):
+    """Serializer for a page of events: cached full encodings unless ?fields=/?include= were given"""
+    if fields is None and not includes:
+        return encode_event
+    return event_serializer(events, fields, includes, user_id)
+
+def event_response(event, fields, includes):
+    """Conditional JSON response for a single event, honouring ?fields= and ?include="""
+    if fields is None and not includes:
+        return conditional_json(lambda: raw_json_response(encode_event(event)), event.etag(), event.updated_at)
+    
+    user_id = registration_user_id(includes)
+    etag = make_etag(event.etag(), *representation_etag_parts(fields, includes, user_id))
+    serialize = lambda: jsonify(event_serializer([event], fields, includes, user_id)(event))
+    return conditional_json(serialize, etag, event.updated_at)
+
+def paginated_events_response(query):
+    """
+    Filter and paginate an event query, returning the page with its next cursor header
+    """
+    try:
+        query = filter_events(query, request.args)
+        position, limit = get_page_args(request.args)
+        fields = parse_fields(request.args)
+        includes = parse_includes(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    user_id = registration_user_id(includes)
+    
+    # Collection version: one aggregate over the filtered rows, checked before loading any
+    last_modified, count = query.with_entities(db.func.max(Event.updated_at), db.func.count(Event.id)).one()
+    etag = make_etag('events', count, last_modified.isoformat() if last_modified else '',
+                     'ndjson' if wants_ndjson() else 'json',
+                     *representation_etag_parts(fields, includes, user_id))
+    not_modified = not_modified_response(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    
+    # Only the columns behind the requested fields are loaded
+    events, next_cursor = keyset_paginate(load_fields(query, fields, includes), Event.start_time, Event.id, position, limit)
+    
+    serialize = events_serializer(events, fields, includes, user_id)
+    response = set_validators(stream_json(events, serialize), etag, last_modified)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response, 200
+
 @events_bp.route('/', methods=['GET'])
+@cached_response(tags=lambda: [EVENT_LIST_TAG])
 def get_events():
-    """Get all published events"""
-    events = Event.query.filter_by(is_published=True).all()
-    return jsonify([event.to_dict() for event in events]), 200
+    """Get published events, paginated by start time"""
+    return paginated_events_response(Event.query.filter_by(is_published=True))
+
+@events_bp.route('/search', methods=['GET'])
+def search_published_events():
+    """Full-text search over published events, best matches first"""
+    query = search_events(request.args.get('q', ''))
+    if query is None:
+        return jsonify({'message': 'Search query is required'}), 400
+    
+    try:
+        _, limit = get_page_args(request.args)
+        offset = int(request.args.get('offset', 0))
+        if offset < 0:
+            raise ValueError
+    except ValueError:
+        return jsonify({'message': 'Invalid limit or offset'}), 400
+    
+    try:
+        fields = parse_fields(request.args)
+        includes = parse_includes(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    query = load_fields(query.filter(Event.is_published == True), fields, includes)
+    events = query.offset(offset).limit(limit + 1).all()
+    
+    page = events[:limit]
+    response = stream_json(page, events_serializer(page, fields, includes, registration_user_id(includes)))
+    if len(events) > limit:
+        response.headers['X-Next-Offset'] = str(offset + limit)
+    return response, 200
 
 @events_bp.route('/all', methods=['GET'])
 @jwt_required()
@@ -34,38 +177,34 @@ def get_all_events():
     
     # Admins can see all events
     if user.is_admin():
-        events = Event.query.all()
+        query = Event.query
     else:
         # Publishers can only see their own events (published or not) and all published events
-        events = Event.query.filter(
+        query = Event.query.filter(
             (Event.publisher_id == user.id) | (Event.is_published == True)
-        ).all()
+        )
     
-    return jsonify([event.to_dict() for event in events]), 200
+    return paginated_events_response(query)
 
 @events_bp.route('/<int:event_id>', methods=['GET'])
+@cached_response(tags=lambda event_id: [event_tag(event_id)])
 def get_event(event_id):
     """Get a specific event"""
-    print(f"Fetching event with ID: {event_id}")
-    
-    # Check for auth header first
-    auth_header = request.headers.get('Authorization', '')
-    print(f"Authorization header present: {bool(auth_header)}")
-    if auth_header:
-        print(f"Auth header format: {auth_header[:10]}...")
+    try:
+        fields = parse_fields(request.args)
+        includes = parse_includes(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     event = Event.query.get(event_id)
     
     if not event:
-        print(f"Event with ID {event_id} not found in database")
+        logger.debug('Event %s not found', event_id)
         return jsonify({'message': 'Event not found'}), 404
     
-    print(f"Event found: {event.title}, Published: {event.is_published}, Publisher ID: {event.publisher_id}")
-    
     # If event is published, anyone can view it
     if event.is_published:
-        print(f"Event {event_id} is published, returning to any user")
-        return jsonify(event.to_dict()), 200
+        return event_response(event, fields, includes)
     
     # For unpublished events, verify authentication directly
     try:
@@ -73,42 +212,31 @@ def get_event(event_id):
         try:
             verify_jwt_in_request()
             user_id = get_jwt_identity()
-            print(f"Successfully verified JWT token. User ID: {user_id}")
             
-            # Convert string ID to integer if needed
-            if isinstance(user_id, str) and user_id.isdigit():
-                user_id = int(user_id)
-                
-            # Get user from database
-            user = User.query.filter_by(id=user_id).first()
+            # Get user from the request cache or the database
+            user = load_user(user_id)
             
             if not user:
-                print(f"User with ID {user_id} not found in database")
+                logger.debug('User %s from token not found', user_id)
                 return jsonify({'message': 'Authentication required to view this event'}), 401
             
-            print(f"User authenticated: ID {user.id}, Username: {user.username}, Role: {user.role}")
-            
             # Check if user is the publisher or an admin
             if user.id == event.publisher_id or user.role == 'admin':
-                print(f"User {user.id} has permission to view unpublished event {event_id}")
-                print(f"Matched condition: publisher_id match: {user.id == event.publisher_id}, admin role: {user.role == 'admin'}")
-                return jsonify(event.to_dict()), 200
+                return event_response(event, fields, includes)
             else:
-                print(f"User {user.id} does not have permission to view unpublished event {event_id}")
-                print(f"Failed condition: user.id: {user.id}, event.publisher_id: {event.publisher_id}, user.role: {user.role}")
+                logger.debug('User %s may not view unpublished event %s', user.id, event_id)
                 return jsonify({'message': 'You do not have permission to view this event'}), 403
                 
         except Exception as e:
-            print(f"JWT verification failed: {str(e)}")
+            logger.debug('JWT verification failed for unpublished event %s: %s', event_id, e)
             return jsonify({'message': 'Authentication required to view this event'}), 401
-    except Exception as e:
-        print(f"Error checking event permissions: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Error checking permissions for event %s', event_id)
         return jsonify({'message': 'Authentication error occurred'}), 401
 
 @events_bp.route('/', methods=['POST'])
 @jwt_required()
+@idempotent
 @publisher_required()
 def create_event():
     """Create a new event (publishers only)"""
@@ -148,6 +276,10 @@ def create_event():
     db.session.add(event)
     db.session.commit()
     
+    # A new event only changes the public listings once it is published
+    if event.is_published:
+        invalidate(EVENT_LIST_TAG)
+    
     return jsonify({
         'message': 'Event created successfully',
         'event': event.to_dict()
@@ -169,6 +301,8 @@ def update_event(event_id):
     if event.publisher_id != user.id and not user.is_admin():
         return jsonify({'message': 'Permission denied'}), 403
     
+    was_published = event.is_published
+    
     # Update fields if provided
     if 'title' in data:
         event.title = data['title']
@@ -201,8 +335,18 @@ def update_event(event_id):
     if event.start_time >= event.end_time:
         return jsonify({'message': 'End time must be after start time'}), 400
     
+    # Seats added by a capacity increase (or republishing) go to the waitlist first
+    if 'capacity' in data or 'is_published' in data:
+        db.session.flush()
+        promote_waitlist(event.id)
+    
     db.session.commit()
     
+    if was_published or event.is_published:
+        invalidate_event(event.id)
+    if 'capacity' in data or 'is_published' in data:
+        get_gate().reopen(event.id)
+    
     return jsonify({
         'message': 'Event updated successfully',
         'event': event.to_dict()
@@ -223,15 +367,24 @@ def delete_event(event_id):
     if event.publisher_id != user.id and not user.is_admin():
         return jsonify({'message': 'Permission denied'}), 403
     
+    was_published = event.is_published
+    db.session.execute(event_waitlist.delete().where(event_waitlist.c.event_id == event.id))
+    db.session.execute(seat_holds.delete().where(seat_holds.c.event_id == event.id))
     db.session.delete(event)
     db.session.commit()
     
+    if was_published:
+        invalidate_event(event_id)
+    get_gate().reopen(event_id)
+    
     return jsonify({
         'message': 'Event deleted successfully'
     }), 200
 
 @events_bp.route('/<int:event_id>/register', methods=['POST'])
 @jwt_required()
+@idempotent
+@admission_controlled
 def register_for_event(event_id):
     """Register for an event (any authenticated user except publishers/admins)"""
     user = get_current_user()
@@ -240,25 +393,16 @@ def register_for_event(event_id):
     if user.role in ['publisher', 'admin']:
         return jsonify({'message': 'Event managers cannot register for events'}), 403
     
-    event = Event.query.get(event_id)
-    if not event:
-        return jsonify({'message': 'Event not found'}), 404
-    
-    # Check if event is published
-    if not event.is_published:
-        return jsonify({'message': 'Event is not published'}), 400
+    # Claim a seat and insert the registration in one guarded transaction
+    result = register_attendee(event_id, user.id)
+    if result != RegistrationResult.REGISTERED:
+        get_gate().observe(event_id, result)
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
     
-    # Check if user is already registered
-    if user in event.attendees:
-        return jsonify({'message': 'Already registered for this event'}), 400
-    
-    # Check if event is full
-    if event.capacity and len(event.attendees) >= event.capacity:
-        return jsonify({'message': 'Event is at full capacity'}), 400
-    
-    # Register user for event
-    event.attendees.append(user)
-    db.session.commit()
+    invalidate_event(event_id)
+    event = Event.query.get(event_id)
+    get_gate().observe(event_id, result, event)
     
     return jsonify({
         'message': 'Successfully registered for event',
@@ -267,31 +411,153 @@ def register_for_event(event_id):
 
 @events_bp.route('/<int:event_id>/unregister', methods=['DELETE'])
 @jwt_required()
+@idempotent
 def unregister_from_event(event_id):
     """Unregister from an event (any authenticated user)"""
     user = get_current_user()
     
+    result = unregister_attendee(event_id, user.id)
+    if result != RegistrationResult.UNREGISTERED:
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
+    
+    invalidate_event(event_id)
+    get_gate().reopen(event_id)
     event = Event.query.get(event_id)
-    if not event:
-        return jsonify({'message': 'Event not found'}), 404
     
-    # Check if user is registered
-    if user not in event.attendees:
-        return jsonify({'message': 'Not registered for this event'}), 400
+    return jsonify({
+        'message': 'Successfully unregistered from event',
+        'event': event.to_dict()
+    }), 200
+
+@events_bp.route('/<int:event_id>/hold', methods=['POST'])
+@jwt_required()
+@admission_controlled
+def hold_event_seat(event_id):
+    """Reserve a seat for SEAT_HOLD_TTL seconds, to be confirmed within that time"""
+    user = get_current_user()
+    
+    if user.role in ['publisher', 'admin']:
+        return jsonify({'message': 'Event managers cannot register for events'}), 403
     
-    # Unregister user from event
-    event.attendees.remove(user)
-    db.session.commit()
+    result, hold = hold_seat(event_id, user.id)
+    if result != RegistrationResult.HELD:
+        get_gate().observe(event_id, result)
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
+    
+    invalidate_event(event_id)
+    event = Event.query.get(event_id)
+    get_gate().observe(event_id, result, event)
+    hold_id, expires_at = hold
     
     return jsonify({
-        'message': 'Successfully unregistered from event',
+        'message': 'Seat held',
+        'hold': {
+            'id': hold_id,
+            'event_id': event_id,
+            'expires_at': expires_at.isoformat()
+        },
         'event': event.to_dict()
+    }), 201
+
+@events_bp.route('/<int:event_id>/hold/confirm', methods=['POST'])
+@jwt_required()
+def confirm_event_hold(event_id):
+    """Turn the current user's seat hold into a registration"""
+    user = get_current_user()
+    
+    result = confirm_hold(event_id, user.id)
+    if result != RegistrationResult.REGISTERED:
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
+    
+    invalidate_event(event_id)
+    event = Event.query.get(event_id)
+    
+    return jsonify({
+        'message': 'Successfully registered for event',
+        'event': event.to_dict()
+    }), 200
+
+@events_bp.route('/<int:event_id>/hold', methods=['DELETE'])
+@jwt_required()
+def release_event_hold(event_id):
+    """Give up the current user's seat hold"""
+    user = get_current_user()
+    
+    result = release_hold(event_id, user.id)
+    if result != RegistrationResult.HOLD_RELEASED:
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
+    
+    invalidate_event(event_id)
+    get_gate().reopen(event_id)
+    
+    return jsonify({'message': 'Seat hold released'}), 200
+
+@events_bp.route('/<int:event_id>/waitlist', methods=['POST'])
+@jwt_required()
+def join_event_waitlist(event_id):
+    """Join the waitlist of a full event, or register right away if a seat is free"""
+    user = get_current_user()
+    
+    if user.role in ['publisher', 'admin']:
+        return jsonify({'message': 'Event managers cannot register for events'}), 403
+    
+    result = join_waitlist(event_id, user.id)
+    if result == RegistrationResult.REGISTERED:
+        invalidate_event(event_id)
+        return jsonify({
+            'message': 'Successfully registered for event',
+            'status': result,
+            'event': Event.query.get(event_id).to_dict()
+        }), 200
+    if result != RegistrationResult.WAITLISTED:
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
+    
+    return jsonify({
+        'message': 'Added to the waitlist',
+        'status': result,
+        'position': waitlist_position(event_id, user.id)
+    }), 201
+
+@events_bp.route('/<int:event_id>/waitlist', methods=['DELETE'])
+@jwt_required()
+def leave_event_waitlist(event_id):
+    """Leave the waitlist of an event"""
+    user = get_current_user()
+    
+    result = leave_waitlist(event_id, user.id)
+    if result != RegistrationResult.LEFT_WAITLIST:
+        message, status = REGISTRATION_ERRORS[result]
+        return jsonify({'message': message}), status
+    
+    return jsonify({'message': 'Left the waitlist'}), 200
+
+@events_bp.route('/<int:event_id>/waitlist', methods=['GET'])
+@jwt_required()
+def get_waitlist_status(event_id):
+    """The current user's place in the event's waitlist"""
+    user = get_current_user()
+    
+    if not Event.query.get(event_id):
+        return jsonify({'message': 'Event not found'}), 404
+    
+    return jsonify({
+        'event_id': event_id,
+        'position': waitlist_position(event_id, user.id),
+        'waitlist_length': waitlist_length(event_id)
     }), 200
 
 @events_bp.route('/<int:event_id>/attendees', methods=['GET'])
 @jwt_required()
 def get_event_attendees(event_id):
-    """Get attendees for a specific event (publisher of the event or admin only)"""
+    """
+    Get attendees for a specific event, paginated by registration time (publisher of the
+    event or admin only)
+    """
     user = get_current_user()
     
     event = Event.query.get(event_id)
@@ -302,15 +568,133 @@ def get_event_attendees(event_id):
     if event.publisher_id != user.id and not user.is_admin():
         return jsonify({'message': 'Permission denied'}), 403
     
-    attendees = [user.to_dict() for user in event.attendees]
+    try:
+        position, limit = get_page_args(request.args)
+        fields = parse_attendee_fields(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    # Only the requested columns are selected; no User objects are built
+    query = attendee_query(event.id, fields)
+    if request.args.get('username'):
+        query = query.filter(User.username.startswith(request.args['username'], autoescape=True))
+    if request.args.get('email'):
+        query = query.filter(User.email.startswith(request.args['email'], autoescape=True))
+    
+    rows, next_cursor = keyset_paginate(
+        query, event_attendees.c.registered_at, event_attendees.c.user_id, position, limit
+    )
     
-    return jsonify({
+    response = stream_json(rows, attendee_serializer(fields), envelope={
         'event_id': event.id,
         'event_title': event.title,
-        'attendee_count': len(attendees),
-        'attendees': attendees
+        'attendee_count': event.get_attendee_count()
+    }, key='attendees')
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response, 200
+
+# Columns of the attendee CSV export
+ATTENDEE_CSV_HEADER = ('user_id', 'username', 'email', 'registered_at')
+
+def attendee_csv_rows(event_id):
+    """
+    Attendee rows read straight from the join, without building User objects, in
+    batches of STREAM_BATCH_SIZE from a server-side cursor
+    """
+    yield from db.session.execute(
+        db.select(User.id, User.username, User.email, event_attendees.c.registered_at)
+        .join(event_attendees, event_attendees.c.user_id == User.id)
+        .where(event_attendees.c.event_id == event_id)
+        .order_by(event_attendees.c.registered_at, event_attendees.c.user_id)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+
+@events_bp.route('/<int:event_id>/attendees.csv', methods=['GET'])
+@jwt_required()
+def export_event_attendees(event_id):
+    """Download the attendees of an event as CSV (publisher of the event or admin only)"""
+    user = get_current_user()
+    
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({'message': 'Event not found'}), 404
+    
+    # Check if user is the publisher of this event or an admin
+    if event.publisher_id != user.id and not user.is_admin():
+        return jsonify({'message': 'Permission denied'}), 403
+    
+    return stream_csv(
+        ATTENDEE_CSV_HEADER, attendee_csv_rows(event.id),
+        lambda row: (row.id, row.username, row.email, row.registered_at.isoformat() if row.registered_at else ''),
+        filename=f'event-{event.id}-attendees.csv'
+    ), 200
+
+def bulk_report_rows(rows):
+    """JSON form of import report rows: the row number and the user id or email given"""
+    items = []
+    for number, entry, user_id in rows:
+        item = {'row': number, 'user_id': user_id}
+        if entry is not None and entry[0] == 'email':
+            item['email'] = entry[1]
+        elif entry is not None and user_id is None:
+            item['user_id'] = entry[1]
+        items.append(item)
+    return items
+
+@events_bp.route('/<int:event_id>/attendees/bulk', methods=['POST'])
+@jwt_required()
+@publisher_required()
+def bulk_add_attendees(event_id):
+    """
+    Register many users at once (publisher of the event or admin only), from a JSON
+    array, or an uploaded CSV/NDJSON file, of user ids or emails
+    """
+    user = get_current_user()
+    
+    event = Event.query.get(event_id)
+    if not event:
+        return jsonify({'message': 'Event not found'}), 404
+    
+    # Check if user is the publisher of this event or an admin
+    if event.publisher_id != user.id and not user.is_admin():
+        return jsonify({'message': 'Permission denied'}), 403
+    
+    max_rows = current_app.config['BULK_ATTENDEES_MAX_ROWS']
+    try:
+        records = list(islice(request_records(request), max_rows + 1))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    if len(records) > max_rows:
+        return jsonify({'message': f'At most {max_rows} rows can be imported at once'}), 413
+    
+    report = import_attendees(event_id, records)
+    
+    if report['added']:
+        invalidate_event(event_id)
+        get_gate().reopen(event_id)
+    
+    return jsonify({
+        'message': f"Added {len(report['added'])} attendees",
+        'counts': {outcome: len(rows) for outcome, rows in report.items()},
+        **{outcome: bulk_report_rows(rows) for outcome, rows in report.items()},
+        'event': Event.query.get(event_id).to_dict()
     }), 200
 
+@events_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+@admin_required()
+def get_cache_statistics():
+    """Get hit/miss/eviction counters of the response cache (admin only)"""
+    return jsonify(get_cache_stats()), 200
+
+@events_bp.route('/admission-stats', methods=['GET'])
+@jwt_required()
+@admin_required()
+def get_admission_statistics():
+    """Get accepted/rejected/shed counters of the registration admission gate (admin only)"""
+    return jsonify(get_admission_stats()), 200
+
 @events_bp.route('/my-events', methods=['GET'])
 @jwt_required()
 def get_my_events():
@@ -320,9 +704,7 @@ def get_my_events():
     if not user.is_publisher():
         return jsonify({'message': 'Permission denied'}), 403
     
-    events = Event.query.filter_by(publisher_id=user.id).all()
-    
-    return jsonify([event.to_dict() for event in events]), 200
+    return paginated_events_response(Event.query.filter_by(publisher_id=user.id))
 
 @events_bp.route('/my-registrations', methods=['GET'])
 @custom_jwt_required()
@@ -333,7 +715,33 @@ def get_my_registrations():
     if not user:
         return jsonify({"message": "User not found"}), 404
         
-    # Get all events the user is attending
-    events = user.events_attending
+    try:
+        position, limit = get_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    # Version of the user's registrations from a single aggregate query
+    count, last_registered, last_updated = db.session.query(
+        db.func.count(), db.func.max(event_attendees.c.registered_at), db.func.max(Event.updated_at)
+    ).select_from(event_attendees).join(
+        Event, Event.id == event_attendees.c.event_id
+    ).filter(event_attendees.c.user_id == user.id).one()
+    last_modified = max(filter(None, [last_registered, last_updated]), default=None)
+    etag = make_etag('registrations', user.id, count, last_registered, last_updated)
+    not_modified = not_modified_response(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    
+    # Page through the user's registrations in the order they were made
+    rows, next_cursor = keyset_paginate(
+        user.registrations_query(),
+        event_attendees.c.registered_at,
+        event_attendees.c.event_id,
+        position,
+        limit
+    )
     
-    return jsonify([event.to_dict() for event in events]), 200 
\ No newline at end of file
+    response = set_validators(raw_json_response(json_array(encode_event(row.Event) for row in rows)), etag, last_modified)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response, 200
@@ -2,7 +2,11 @@ from flask import Blueprint, request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app import db
 from app.models.user import User, UserRole
+from app.services.user_import import UserImportError, import_users
 from app.utils.auth import admin_required, get_current_user
+from app.utils.bulk_input import request_records
+from app.utils.conditional import conditional_json
+from app.utils.streaming import iterate_query, stream_json
 
 users_bp = Blueprint('users', __name__)
 
@@ -22,8 +26,32 @@ def handle_options(path=None):
 @admin_required()
 def get_users():
     """Get all users (admin only)"""
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users]), 200
+    users = User.query.order_by(User.id)
+    return stream_json(iterate_query(users), User.to_dict), 200
+
+@users_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@admin_required()
+def bulk_create_users():
+    """
+    Create many regular users at once (admin only) from a JSON array, a JSONL body or
+    an uploaded CSV/JSONL file; ?skip=N resumes an import after its first N rows
+    """
+    skip = request.args.get('skip', 0, type=int)
+    if skip < 0:
+        return jsonify({'message': 'skip must not be negative'}), 400
+    
+    try:
+        report = import_users(request_records(request), skip=skip)
+    except UserImportError as e:
+        return jsonify({'message': str(e), **e.report}), 400
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return jsonify({
+        'message': f"Imported {report['created']} users",
+        **report
+    }), 200
 
 @users_bp.route('/<int:user_id>', methods=['GET'])
 @jwt_required()
@@ -39,7 +67,7 @@ def get_user(user_id):
     if not user:
         return jsonify({'message': 'User not found'}), 404
         
-    return jsonify(user.to_dict()), 200
+    return conditional_json(lambda: jsonify(user.to_dict()), user.etag(), user.updated_at)
 
 @users_bp.route('/publishers', methods=['GET'])
 @jwt_required()
@@ -65,7 +93,7 @@ def make_publisher(user_id):
     if user.role == UserRole.ADMIN:
         return jsonify({'message': 'Admin users already have publisher privileges'}), 400
     
-    user.role = UserRole.PUBLISHER
+    user.set_role(UserRole.PUBLISHER)
     db.session.commit()
     
     return jsonify({
@@ -86,7 +114,7 @@ def make_admin(user_id):
     if user.role == UserRole.ADMIN:
         return jsonify({'message': 'User is already an admin'}), 400
     
-    user.role = UserRole.ADMIN
+    user.set_role(UserRole.ADMIN)
     db.session.commit()
     
     return jsonify({
@@ -113,7 +141,7 @@ def revoke_privileges(user_id):
     if user.role == UserRole.USER:
         return jsonify({'message': 'User already has regular privileges'}), 400
     
-    user.role = UserRole.USER
+    user.set_role(UserRole.USER)
     db.session.commit()
     
     return jsonify({
@@ -0,0 +1,244 @@
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import current_app, jsonify, make_response
+from app.services.metrics import ADMISSION_DECISIONS
+from app.services.registration import RegistrationResult
+
+# Decisions of the admission gate as enum-like constants
+class AdmissionDecision:
+    ACCEPTED = 'accepted'
+    REJECTED = 'rejected'  # the event is known to be full
+    SHED = 'shed'  # too many attempts for the event already in flight
+
+class AdmissionStats:
+    """Thread-safe counters of the gate's decisions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.shed = 0
+
+    def incr(self, decision):
+        with self._lock:
+            setattr(self, decision, getattr(self, decision) + 1)
+        ADMISSION_DECISIONS.labels(decision).inc()
+
+    def to_dict(self):
+        with self._lock:
+            return {'accepted': self.accepted, 'rejected': self.rejected, 'shed': self.shed}
+
+class MemoryAdmissionState:
+    """Per-process known-full flags and remaining-seat hints, trusted for ttl seconds"""
+    name = 'memory'
+
+    def __init__(self, ttl=5):
+        self.ttl = ttl
+        self._entries = {}  # event_id -> (full, remaining, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, event_id):
+        """(full, remaining) of the event, or None when nothing recent is known"""
+        with self._lock:
+            entry = self._entries.get(event_id)
+            if entry is None or entry[2] <= time.monotonic():
+                self._entries.pop(event_id, None)
+                return None
+            return entry[:2]
+
+    def set(self, event_id, full, remaining):
+        with self._lock:
+            self._entries[event_id] = (full, remaining, time.monotonic() + self.ttl)
+
+    def clear(self, event_id):
+        with self._lock:
+            self._entries.pop(event_id, None)
+
+class SQLiteAdmissionState:
+    """
+    Known-full flags and remaining-seat hints in a SQLite file, so a seat freed through
+    one server worker reopens the event in all of them
+    """
+    name = 'sqlite'
+
+    def __init__(self, path, ttl=5):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS admission_state ('
+                'event_id INTEGER PRIMARY KEY, full INTEGER NOT NULL, remaining INTEGER, '
+                'expires_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, event_id):
+        row = self._connect().execute(
+            'SELECT full, remaining FROM admission_state WHERE event_id = ? AND expires_at > ?',
+            (event_id, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return bool(row[0]), row[1]
+
+    def set(self, event_id, full, remaining):
+        self._connect().execute(
+            'INSERT OR REPLACE INTO admission_state (event_id, full, remaining, expires_at) VALUES (?, ?, ?, ?)',
+            (event_id, int(full), remaining, time.time() + self.ttl)
+        )
+
+    def clear(self, event_id):
+        self._connect().execute('DELETE FROM admission_state WHERE event_id = ?', (event_id,))
+
+class AdmissionGate:
+    """
+    Per-event gate in front of registration and seat holds.
+
+    Attempts for an event known to be full are rejected without touching the database.
+    Otherwise at most max_in_flight attempts per event run at once in this process, and
+    no more than the event's remaining seats when that is known: attempts beyond that
+    could not get a seat anyway and are shed with a 429.
+    """
+
+    def __init__(self, state, max_in_flight=16, retry_after=1):
+        self.state = state
+        self.max_in_flight = max_in_flight
+        self.retry_after = retry_after
+        self.stats = AdmissionStats()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def enter(self, event_id):
+        """Decide on one attempt; an ACCEPTED attempt must be followed by leave()"""
+        known = self.state.get(event_id)
+        if known is not None and known[0]:
+            self.stats.incr(AdmissionDecision.REJECTED)
+            return AdmissionDecision.REJECTED
+
+        limit = self.max_in_flight
+        if known is not None and known[1] is not None:
+            limit = min(limit, max(known[1], 1))
+        with self._lock:
+            in_flight = self._in_flight.get(event_id, 0)
+            if in_flight >= limit:
+                decision = AdmissionDecision.SHED
+            else:
+                self._in_flight[event_id] = in_flight + 1
+                decision = AdmissionDecision.ACCEPTED
+        self.stats.incr(decision)
+        return decision
+
+    def leave(self, event_id):
+        with self._lock:
+            in_flight = self._in_flight.get(event_id, 0) - 1
+            if in_flight > 0:
+                self._in_flight[event_id] = in_flight
+            else:
+                self._in_flight.pop(event_id, None)
+
+    def observe(self, event_id, result, event=None):
+        """Learn from the outcome of an admitted attempt"""
+        if result == RegistrationResult.FULL:
+            self.state.set(event_id, True, 0)
+        elif event is not None:
+            if event.has_unlimited_capacity():
+                self.state.set(event_id, False, None)
+            else:
+                remaining = event.capacity - event.get_attendee_count() - event.get_held_count()
+                self.state.set(event_id, remaining <= 0, max(remaining, 0))
+
+    def reopen(self, event_id):
+        """Forget what is known about the event after seats were freed or capacity changed"""
+        self.state.clear(event_id)
+
+    def in_flight(self):
+        with self._lock:
+            return sum(self._in_flight.values())
+
+class NullAdmissionGate(AdmissionGate):
+    """Gate that admits every attempt (admission control disabled)"""
+
+    def __init__(self):
+        super().__init__(None)
+
+    def enter(self, event_id):
+        self.stats.incr(AdmissionDecision.ACCEPTED)
+        return AdmissionDecision.ACCEPTED
+
+    def leave(self, event_id):
+        pass
+
+    def observe(self, event_id, result, event=None):
+        pass
+
+    def reopen(self, event_id):
+        pass
+
+def create_admission_gate(app):
+    """Build the admission gate with the state backend selected by ADMISSION_BACKEND"""
+    backend = app.config.get('ADMISSION_BACKEND', 'memory')
+    ttl = app.config.get('ADMISSION_STATE_TTL', 5)
+
+    if backend == 'memory':
+        state = MemoryAdmissionState(ttl=ttl)
+    elif backend == 'sqlite':
+        path = app.config.get('ADMISSION_PATH')
+        if not path:
+            os.makedirs(app.instance_path, exist_ok=True)
+            path = os.path.join(app.instance_path, 'admission.sqlite3')
+        state = SQLiteAdmissionState(path, ttl=ttl)
+    elif backend in (None, 'null', 'none'):
+        return NullAdmissionGate()
+    else:
+        raise ValueError(f'Unknown ADMISSION_BACKEND: {backend}')
+
+    return AdmissionGate(
+        state,
+        max_in_flight=app.config.get('ADMISSION_MAX_IN_FLIGHT', 16),
+        retry_after=app.config.get('ADMISSION_RETRY_AFTER', 1)
+    )
+
+def get_gate(app=None):
+    """The admission gate of the current app"""
+    return (app or current_app).extensions['admission_gate']
+
+def get_admission_stats():
+    """Decision counters of the current app's admission gate"""
+    gate = get_gate()
+    stats = gate.stats.to_dict()
+    stats.update({'backend': gate.state.name if gate.state else 'null', 'in_flight': gate.in_flight()})
+    return stats
+
+def admission_controlled(fn):
+    """
+    Decorator running a view that claims a seat of the event_id view argument behind
+    the admission gate
+    """
+    @wraps(fn)
+    def decorator(event_id, *args, **kwargs):
+        gate = get_gate()
+        decision = gate.enter(event_id)
+        if decision == AdmissionDecision.REJECTED:
+            return jsonify({'message': 'Event is at full capacity'}), 400
+        if decision == AdmissionDecision.SHED:
+            response = jsonify({'message': 'Too many registration attempts for this event, please try again shortly'})
+            response.headers['Retry-After'] = str(gate.retry_after)
+            return response, 429
+        try:
+            return make_response(fn(event_id, *args, **kwargs))
+        finally:
+            gate.leave(event_id)
+    return decorator
@@ -0,0 +1,166 @@
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.event import Event, event_waitlist, seat_holds
+from app.models.user import User, UserRole, event_attendees
+from app.services.registration import promote_waitlist, release_expired_holds, release_seat
+from app.utils.bulk_input import in_batches
+
+# Attempts at the whole import when concurrent registrations conflict with it
+IMPORT_ATTEMPTS = 3
+
+# Columns of a CSV row or keys of a JSON object naming the user
+ID_KEYS = ('user_id', 'id')
+EMAIL_KEYS = ('email',)
+
+def parse_entry(record):
+    """
+    ('user_id', id) or ('email', address) for one input record: a number, a string
+    holding an id or an email address, or an object/CSV row with a user_id, id or email
+    field. None when the record names no user.
+    """
+    if isinstance(record, dict):
+        for key in ID_KEYS + EMAIL_KEYS:
+            if record.get(key) not in (None, ''):
+                return parse_entry(record[key])
+        return None
+    if isinstance(record, bool):
+        return None
+    if isinstance(record, int):
+        return 'user_id', record
+    if isinstance(record, str):
+        value = record.strip()
+        if value.isdigit():
+            return 'user_id', int(value)
+        if '@' in value:
+            return 'email', value
+    return None
+
+def _resolve(entries):
+    """Look up the attendee accounts named by the entries with batched IN queries"""
+    ids = {value for kind, value in entries if kind == 'user_id'}
+    emails = {value for kind, value in entries if kind == 'email'}
+    by_id, by_email = {}, {}
+    for batch in in_batches(ids):
+        for row in db.session.execute(
+            db.select(User.id).where(User.id.in_(batch), User.role == UserRole.USER)
+        ):
+            by_id[row.id] = row.id
+    for batch in in_batches(emails):
+        for row in db.session.execute(
+            db.select(User.id, User.email).where(User.email.in_(batch), User.role == UserRole.USER)
+        ):
+            by_email[row.email] = row.id
+    return {'user_id': by_id, 'email': by_email}
+
+def _registered(event_id, user_ids):
+    registered = set()
+    for batch in in_batches(user_ids):
+        registered.update(db.session.execute(
+            db.select(event_attendees.c.user_id).where(
+                event_attendees.c.event_id == event_id,
+                event_attendees.c.user_id.in_(batch)
+            )
+        ).scalars())
+    return registered
+
+def _claim_seats(event_id, wanted):
+    """
+    Take up to wanted seats with one guarded UPDATE; returns how many it took. The
+    free seats are read first and the UPDATE only succeeds while they are still free,
+    so a concurrent registration makes it read them again rather than overbook.
+    """
+    while True:
+        event = db.session.execute(
+            db.select(Event.capacity, Event.attendee_count, Event.held_count).where(Event.id == event_id)
+        ).first()
+        if event.capacity is None or event.capacity <= 0:
+            seats = wanted
+        else:
+            free = event.capacity - event.attendee_count - event.held_count
+            if free < wanted and release_expired_holds(event_id):
+                continue
+            seats = max(min(wanted, free), 0)
+        if not seats:
+            return 0
+        claimed = db.session.execute(
+            db.update(Event)
+            .where(Event.id == event_id, or_(
+                Event.unlimited_capacity(),
+                Event.attendee_count + Event.held_count + seats <= Event.capacity
+            ))
+            .values(attendee_count=Event.attendee_count + seats)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed:
+            return seats
+
+def _leave_waitlist_and_holds(event_id, user_ids):
+    """Drop the new attendees' waitlist entries and give back the seats they held"""
+    released = 0
+    for batch in in_batches(user_ids):
+        db.session.execute(event_waitlist.delete().where(
+            event_waitlist.c.event_id == event_id,
+            event_waitlist.c.user_id.in_(batch)
+        ))
+        released += db.session.execute(seat_holds.delete().where(
+            seat_holds.c.event_id == event_id,
+            seat_holds.c.user_id.in_(batch)
+        )).rowcount
+    if released:
+        release_seat(event_id, Event.held_count, released)
+        promote_waitlist(event_id)
+
+def _import(event_id, rows):
+    report = {'added': [], 'duplicate': [], 'unknown': [], 'over_capacity': []}
+    resolved = _resolve([entry for _, entry in rows if entry is not None])
+
+    candidates, seen = [], set()
+    for number, entry in rows:
+        user_id = resolved[entry[0]].get(entry[1]) if entry is not None else None
+        if user_id is None:
+            report['unknown'].append((number, entry, None))
+        elif user_id in seen:
+            report['duplicate'].append((number, entry, user_id))
+        else:
+            seen.add(user_id)
+            candidates.append((number, entry, user_id))
+
+    registered = _registered(event_id, seen)
+    new = []
+    for row in candidates:
+        (report['duplicate'] if row[2] in registered else new).append(row)
+
+    seats = _claim_seats(event_id, len(new)) if new else 0
+    report['added'], report['over_capacity'] = new[:seats], new[seats:]
+
+    if report['added']:
+        db.session.execute(event_attendees.insert(), [
+            {'user_id': user_id, 'event_id': event_id} for _, _, user_id in report['added']
+        ])
+        _leave_waitlist_and_holds(event_id, [user_id for _, _, user_id in report['added']])
+    return report
+
+def import_attendees(event_id, records):
+    """
+    Register the users named by (row number, record) pairs for the event in one
+    transaction, bypassing publication and the waitlist.
+
+    Users are resolved by id or email with batched IN queries, the seats for the whole
+    batch are claimed with a single guarded UPDATE and the registrations inserted with
+    one executemany. Rows are assigned seats in input order. Only attendee accounts
+    can be registered: publishers, admins and missing users are reported as unknown.
+
+    Returns a dict of added, duplicate, unknown and over_capacity lists of
+    (row number, (kind, value) entry or None, user id or None).
+    """
+    rows = [(number, parse_entry(record)) for number, record in records]
+    for _ in range(IMPORT_ATTEMPTS):
+        try:
+            report = _import(event_id, rows)
+            db.session.commit()
+            return report
+        except IntegrityError:
+            # Some of the users registered concurrently: sort them out again
+            db.session.rollback()
+    raise RuntimeError(f'Could not import attendees into event {event_id} under contention')
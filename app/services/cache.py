@@ -0,0 +1,304 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request
+from app.utils.streaming import wants_ndjson
+
+# Tags for cached event responses: every listing page, and one per event detail view
+EVENT_LIST_TAG = 'events'
+
+def event_tag(event_id):
+    return f'event:{event_id}'
+
+class CacheStats:
+    """Thread-safe hit/miss/eviction counters for a cache backend"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def incr(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+class NullCache:
+    """Backend that never stores anything (caching disabled)"""
+    name = 'null'
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key):
+        self.stats.incr('misses')
+        return None
+
+    def set(self, key, value, tags=()):
+        pass
+
+    def invalidate_tags(self, tags):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+class MemoryCache:
+    """In-process LRU cache with a per-entry TTL and tag-based invalidation"""
+    name = 'memory'
+
+    def __init__(self, max_entries=1024, ttl=30):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries = OrderedDict()  # key -> (value, expires_at, tags)
+        self._tags = {}  # tag -> set of keys
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        value, expires_at, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(key)
+                self.stats.incr('expirations')
+                entry = None
+            if entry is None:
+                self.stats.incr('misses')
+                return None
+            self._entries.move_to_end(key)
+            self.stats.incr('hits')
+            return entry[0]
+
+    def set(self, key, value, tags=()):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats.incr('evictions')
+
+    def invalidate_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class SQLiteCache:
+    """
+    Cache stored in a SQLite file so every server worker process shares the same
+    entries and invalidations. Entries over max_entries are evicted soonest-expiring first.
+    """
+    name = 'sqlite'
+
+    def __init__(self, path, max_entries=10000, ttl=30):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_tags ('
+                'tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute('SELECT value, expires_at FROM cache_entries WHERE key = ?', (key,)).fetchone()
+        if row is not None and row[1] <= time.time():
+            conn.execute('DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?', (key, time.time()))
+            self.stats.incr('expirations')
+            row = None
+        if row is None:
+            self.stats.incr('misses')
+            return None
+        self.stats.incr('hits')
+        return row[0]
+
+    def set(self, key, value, tags=()):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, now + self.ttl)
+            )
+            conn.executemany('INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)',
+                             [(tag, key) for tag in tags])
+
+            # Drop expired entries, then the soonest-expiring ones over the size limit
+            expired = conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,)).rowcount
+            overflow = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE key IN '
+                    '(SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)', (overflow,)
+                )
+                self.stats.incr('evictions', overflow)
+            if expired or overflow > 0:
+                conn.execute('DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)')
+            self.stats.incr('expirations', expired)
+
+    def invalidate_tags(self, tags):
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            for tag in tags:
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_tags WHERE tag = ?)', (tag,)
+                )
+                conn.execute('DELETE FROM cache_tags WHERE tag = ?', (tag,))
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM cache_entries')
+            conn.execute('DELETE FROM cache_tags')
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+
+def create_cache(app):
+    """Build the response cache backend selected by RESPONSE_CACHE_BACKEND"""
+    backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+    ttl = app.config.get('RESPONSE_CACHE_TTL', 30)
+    max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024)
+
+    if backend == 'memory':
+        return MemoryCache(max_entries=max_entries, ttl=ttl)
+    if backend == 'sqlite':
+        path = app.config.get('RESPONSE_CACHE_PATH')
+        if not path:
+            os.makedirs(app.instance_path, exist_ok=True)
+            path = os.path.join(app.instance_path, 'response_cache.sqlite3')
+        return SQLiteCache(path, max_entries=max_entries, ttl=ttl)
+    if backend in (None, 'null', 'none'):
+        return NullCache()
+    raise ValueError(f'Unknown RESPONSE_CACHE_BACKEND: {backend}')
+
+def get_cache():
+    """The response cache of the current app"""
+    return current_app.extensions['response_cache']
+
+def get_cache_stats():
+    """Counters and size of the current app's response cache"""
+    cache = get_cache()
+    stats = cache.stats.to_dict()
+    stats.update({'backend': cache.name, 'entries': len(cache)})
+    return stats
+
+def cache_key():
+    """
+    Key a response by endpoint, view arguments, the sorted query string and the
+    negotiated representation (JSON or NDJSON)
+    """
+    view_args = sorted((request.view_args or {}).items())
+    query = sorted(request.args.items(multi=True))
+    return json.dumps([request.endpoint, view_args, query, wants_ndjson()], separators=(',', ':'))
+
+def _dump_response(response):
+    meta = {'status': response.status_code, 'headers': [
+        (name, value) for name, value in response.headers.items()
+        if name in ('Content-Type', 'Vary', 'X-Next-Cursor', 'ETag', 'Last-Modified')
+    ]}
+    return json.dumps(meta).encode('utf-8') + b'\n' + response.get_data()
+
+def _load_response(value):
+    meta, body = value.split(b'\n', 1)
+    meta = json.loads(meta)
+    response = make_response(body, meta['status'])
+    for name, value in meta['headers']:
+        response.headers[name] = value
+    response.headers['X-Cache'] = 'HIT'
+    return response
+
+def cached_response(tags):
+    """
+    Decorator caching successful anonymous GET responses.
+
+    tags is a callable receiving the view arguments and returning the tags the
+    response depends on; invalidate() with any of them evicts the entry.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            # Responses for authenticated users can depend on who they are
+            if request.method != 'GET' or request.headers.get('Authorization'):
+                return fn(*args, **kwargs)
+
+            cache = get_cache()
+            key = cache_key()
+            value = cache.get(key)
+            if value is not None:
+                # Revalidation requests still get a 304 from the cached validators
+                return _load_response(value).make_conditional(request)
+
+            response = make_response(fn(*args, **kwargs))
+            if response.status_code == 200:
+                cache.set(key, _dump_response(response), tags(**kwargs))
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return decorator
+    return wrapper
+
+def invalidate(*tags):
+    """Evict every cached response depending on any of the given tags"""
+    get_cache().invalidate_tags(tags)
+
+def invalidate_event(event_id):
+    """Evict the cached detail view of an event and all cached listings"""
+    invalidate(EVENT_LIST_TAG, event_tag(event_id))
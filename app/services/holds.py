@@ -0,0 +1,236 @@
+import heapq
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.event import Event, seat_holds
+from app.models.user import event_attendees
+from app.services.admission import get_gate
+from app.services.cache import invalidate_event
+from app.services.registration import (
+    RegistrationResult, claim_seat, diagnose_rejection, promote_waitlist, release_seat,
+    remove_from_waitlist
+)
+
+logger = logging.getLogger(__name__)
+
+def get_hold(event_id, user_id):
+    """The user's (id, expires_at) hold on the event, or None"""
+    return db.session.execute(
+        db.select(seat_holds.c.id, seat_holds.c.expires_at).where(
+            seat_holds.c.event_id == event_id,
+            seat_holds.c.user_id == user_id
+        )
+    ).first()
+
+def hold_seat(event_id, user_id):
+    """
+    Reserve a seat for the user until SEAT_HOLD_TTL seconds from now.
+
+    The seat is claimed with the same guarded UPDATE as a registration, on held_count
+    instead of attendee_count, so holds and registrations can never overbook together.
+    Returns (result, hold) where hold is the (id, expires_at) row when result is HELD.
+    """
+    if Event.is_registered(event_id, user_id):
+        return RegistrationResult.ALREADY_REGISTERED, None
+
+    if not claim_seat(event_id, Event.held_count):
+        # Keep any expired holds reclaimed on the way
+        db.session.commit()
+        return diagnose_rejection(event_id, user_id), None
+
+    expires_at = datetime.utcnow() + timedelta(seconds=current_app.config['SEAT_HOLD_TTL'])
+    try:
+        hold_id = db.session.execute(seat_holds.insert().values(
+            event_id=event_id, user_id=user_id, expires_at=expires_at
+        )).inserted_primary_key[0]
+        db.session.commit()
+    except IntegrityError:
+        # Already holding a seat: undo the seat claimed above
+        db.session.rollback()
+        return RegistrationResult.ALREADY_HELD, None
+
+    get_sweeper().schedule(hold_id, event_id, expires_at)
+    return RegistrationResult.HELD, (hold_id, expires_at)
+
+def _diagnose_missing_hold(event_id, user_id):
+    if db.session.get(Event, event_id) is None:
+        return RegistrationResult.EVENT_NOT_FOUND
+    if get_hold(event_id, user_id) is not None:
+        return RegistrationResult.HOLD_EXPIRED
+    return RegistrationResult.NO_HOLD
+
+def confirm_hold(event_id, user_id):
+    """
+    Turn the user's unexpired hold into a registration. The hold row is deleted and the
+    seat moved from held_count to attendee_count in one transaction, with no capacity
+    check: the seat was reserved when the hold was taken.
+    """
+    confirmed = db.session.execute(
+        seat_holds.delete().where(
+            seat_holds.c.event_id == event_id,
+            seat_holds.c.user_id == user_id,
+            seat_holds.c.expires_at > datetime.utcnow()
+        )
+    ).rowcount
+
+    if not confirmed:
+        db.session.rollback()
+        return _diagnose_missing_hold(event_id, user_id)
+
+    db.session.execute(
+        db.update(Event)
+        .where(Event.id == event_id)
+        .values(held_count=Event.held_count - 1, attendee_count=Event.attendee_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        db.session.execute(event_attendees.insert().values(user_id=user_id, event_id=event_id))
+        remove_from_waitlist(event_id, user_id)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return RegistrationResult.ALREADY_REGISTERED
+
+    return RegistrationResult.REGISTERED
+
+def release_hold(event_id, user_id):
+    """Give up the user's hold; the seat goes to the head of the waitlist"""
+    released = db.session.execute(
+        seat_holds.delete().where(
+            seat_holds.c.event_id == event_id,
+            seat_holds.c.user_id == user_id
+        )
+    ).rowcount
+
+    if not released:
+        db.session.rollback()
+        if db.session.get(Event, event_id) is None:
+            return RegistrationResult.EVENT_NOT_FOUND
+        return RegistrationResult.NO_HOLD
+
+    release_seat(event_id, Event.held_count)
+    promote_waitlist(event_id)
+    db.session.commit()
+    return RegistrationResult.HOLD_RELEASED
+
+def expire_hold(event_id, hold_id, now=None):
+    """Release one hold by key if its deadline has passed; returns whether it did"""
+    expired = db.session.execute(
+        seat_holds.delete().where(
+            seat_holds.c.id == hold_id,
+            seat_holds.c.expires_at <= (now or datetime.utcnow())
+        )
+    ).rowcount
+
+    if not expired:
+        # Confirmed or released in the meantime
+        db.session.rollback()
+        return False
+
+    release_seat(event_id, Event.held_count)
+    promote_waitlist(event_id)
+    db.session.commit()
+    return True
+
+class HoldSweeper:
+    """
+    Expire seat holds at their deadlines from a background thread.
+
+    Deadlines are kept in a min-heap, so the thread sleeps until the earliest one and
+    releases only the holds that are due, by primary key, instead of periodically
+    scanning the holds table. The thread starts with the first hold this process takes
+    and picks up the holds already in the database at that point.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.expired = 0
+        self._heap = []
+        self._condition = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+
+    def schedule(self, hold_id, event_id, expires_at):
+        """Expire the hold at expires_at (needs an app context)"""
+        with self._condition:
+            if self.app.config['SEAT_HOLD_SWEEPER'] and (self._thread is None or self._pid != os.getpid()):
+                self._start()
+            heapq.heappush(self._heap, (expires_at, hold_id, event_id))
+            self._condition.notify()
+
+    def _start(self):
+        # Holds left behind by an earlier process; expiring one twice is harmless
+        self._heap = [
+            (row.expires_at, row.id, row.event_id) for row in db.session.execute(
+                db.select(seat_holds.c.expires_at, seat_holds.c.id, seat_holds.c.event_id)
+                .order_by(seat_holds.c.expires_at)
+            )
+        ]
+        self._stopping = False
+        self._pid = os.getpid()
+        self._thread = threading.Thread(target=self._run, name='seat-hold-sweeper', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join()
+        self._thread = None
+
+    def _next_timeout(self):
+        """Seconds until the earliest deadline, 0 when one is due, None when there are none"""
+        if not self._heap:
+            return None
+        return max((self._heap[0][0] - datetime.utcnow()).total_seconds(), 0)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                timeout = self._next_timeout()
+                while not self._stopping and timeout != 0:
+                    self._condition.wait(timeout)
+                    timeout = self._next_timeout()
+                if self._stopping:
+                    return
+            self.run_pending()
+
+    def run_pending(self, now=None):
+        """Expire every scheduled hold whose deadline is at or before now; returns how many"""
+        now = now or datetime.utcnow()
+        due = []
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap))
+        if not due:
+            return 0
+
+        expired = 0
+        with self.app.app_context():
+            for _, hold_id, event_id in due:
+                try:
+                    if expire_hold(event_id, hold_id, now):
+                        expired += 1
+                        invalidate_event(event_id)
+                        get_gate(self.app).reopen(event_id)
+                except Exception:
+                    # Left to be reclaimed when the event next looks full
+                    db.session.rollback()
+                    logger.exception('Could not expire seat hold %s of event %s', hold_id, event_id)
+            db.session.remove()
+
+        self.expired += expired
+        return expired
+
+    def pending(self):
+        with self._condition:
+            return len(self._heap)
+
+def get_sweeper(app=None):
+    return (app or current_app).extensions['hold_sweeper']
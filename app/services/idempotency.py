@@ -0,0 +1,187 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import current_app, jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.idempotency import idempotency_keys
+from app.utils.auth import get_optional_user_id
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Response headers stored with the body and replayed with it
+REPLAYED_HEADERS = ('Content-Type', 'Location', 'ETag', 'Last-Modified')
+
+def _is_retryable(status_code):
+    """Responses worth running the request again for, so they are never stored"""
+    return status_code >= 500 or status_code == 429
+
+# Requests this process is running, so duplicates here wait on an event instead of polling
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# When this process last deleted expired rows
+_last_prune = 0.0
+
+def _key_filter(user_id, key, route):
+    return (
+        (idempotency_keys.c.user_id == user_id)
+        & (idempotency_keys.c.key == key)
+        & (idempotency_keys.c.route == route)
+    )
+
+def _claim(user_id, key, route, fingerprint):
+    """
+    Insert the in-flight row for the key; returns whether this request owns it. A row
+    past its expiry (a finished response past the TTL, or a request that never
+    finished) is replaced.
+    """
+    now = datetime.utcnow()
+    db.session.execute(
+        idempotency_keys.delete().where(_key_filter(user_id, key, route), idempotency_keys.c.expires_at <= now)
+    )
+    try:
+        db.session.execute(idempotency_keys.insert().values(
+            user_id=user_id, key=key, route=route, fingerprint=fingerprint, created_at=now,
+            expires_at=now + timedelta(seconds=current_app.config['IDEMPOTENCY_LOCK_TIMEOUT'])
+        ))
+        db.session.commit()
+        return True
+    except IntegrityError:
+        db.session.rollback()
+        return False
+
+def _load(user_id, key, route):
+    row = db.session.execute(
+        db.select(
+            idempotency_keys.c.fingerprint, idempotency_keys.c.status_code,
+            idempotency_keys.c.headers, idempotency_keys.c.body
+        ).where(_key_filter(user_id, key, route))
+    ).first()
+    # Read the row again on the next call rather than from this transaction's snapshot
+    db.session.rollback()
+    return row
+
+def _wait_for_result(user_id, key, route):
+    """
+    Wait for the request holding the key to finish; returns its row, or None when the
+    row went away (the request failed and released the key). Gives up with the row
+    still in flight after IDEMPOTENCY_WAIT_TIMEOUT seconds.
+    """
+    deadline = time.monotonic() + current_app.config['IDEMPOTENCY_WAIT_TIMEOUT']
+    delay = 0.01
+    while True:
+        row = _load(user_id, key, route)
+        if row is None or row.status_code is not None:
+            return row
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return row
+        with _in_flight_lock:
+            done = _in_flight.get((user_id, key, route))
+        if done is not None:
+            done.wait(remaining)
+        else:
+            # Held by another server process
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.25)
+
+def _store(user_id, key, route, response):
+    headers = [(name, value) for name, value in response.headers.items() if name in REPLAYED_HEADERS]
+    db.session.execute(
+        idempotency_keys.update().where(_key_filter(user_id, key, route)).values(
+            status_code=response.status_code,
+            headers=json.dumps(headers),
+            body=response.get_data(),
+            expires_at=datetime.utcnow() + timedelta(seconds=current_app.config['IDEMPOTENCY_TTL'])
+        )
+    )
+    db.session.commit()
+
+def _release(user_id, key, route):
+    db.session.rollback()
+    db.session.execute(idempotency_keys.delete().where(_key_filter(user_id, key, route)))
+    db.session.commit()
+
+def _replay(row):
+    response = current_app.response_class(row.body, status=row.status_code)
+    for name, value in json.loads(row.headers):
+        response.headers[name] = value
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def prune_idempotency_keys(now=None):
+    """Delete rows past their expiry through the expires_at index; returns how many"""
+    deleted = db.session.execute(
+        idempotency_keys.delete().where(idempotency_keys.c.expires_at <= (now or datetime.utcnow()))
+    ).rowcount
+    db.session.commit()
+    return deleted
+
+def _prune_if_due():
+    global _last_prune
+    interval = current_app.config['IDEMPOTENCY_PRUNE_INTERVAL']
+    now = time.monotonic()
+    if interval and now - _last_prune >= interval:
+        _last_prune = now
+        prune_idempotency_keys()
+
+def idempotent(fn):
+    """
+    Decorator making an authenticated mutating view safe to retry with an
+    Idempotency-Key header.
+
+    The first response for a (user, key, route) is stored and replayed verbatim, with an
+    Idempotent-Replayed header, without running the view again. A duplicate arriving
+    while the first request is still running waits for its response. Server errors and
+    429s are not stored, so retrying them runs the view again.
+    """
+    @wraps(fn)
+    def decorator(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        user_id = get_optional_user_id()
+        if key is None or user_id is None:
+            return fn(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({'message': f'{IDEMPOTENCY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters'}), 400
+
+        route = f'{request.method} {request.path}'
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+        _prune_if_due()
+
+        while not _claim(user_id, key, route, fingerprint):
+            row = _wait_for_result(user_id, key, route)
+            if row is None:
+                # The first request failed and released the key: run this one
+                continue
+            if row.fingerprint != fingerprint:
+                return jsonify({'message': f'{IDEMPOTENCY_HEADER} was already used for a different request'}), 422
+            if row.status_code is None:
+                response = jsonify({'message': 'A request with this Idempotency-Key is still in progress'})
+                response.headers['Retry-After'] = '1'
+                return response, 409
+            return _replay(row)
+
+        done = threading.Event()
+        with _in_flight_lock:
+            _in_flight[(user_id, key, route)] = done
+        try:
+            try:
+                response = make_response(fn(*args, **kwargs))
+            except Exception:
+                _release(user_id, key, route)
+                raise
+            if _is_retryable(response.status_code):
+                _release(user_id, key, route)
+            else:
+                _store(user_id, key, route, response)
+            return response
+        finally:
+            with _in_flight_lock:
+                _in_flight.pop((user_id, key, route), None)
+            done.set()
+    return decorator
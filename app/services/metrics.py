@@ -0,0 +1,111 @@
+import os
+import time
+from flask import Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event as sa_event
+from sqlalchemy.engine import Engine
+
+# With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py), every worker process writes
+# its samples to files in that directory and /metrics aggregates all of them
+REQUEST_DURATION = Histogram(
+    'event_manager_request_duration_seconds', 'Wall time spent handling a request',
+    ['endpoint', 'method', 'status'],
+    buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+)
+REQUEST_DB_QUERIES = Histogram(
+    'event_manager_request_db_queries', 'SQL statements executed per request',
+    ['endpoint', 'method'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+)
+REQUEST_DB_DURATION = Histogram(
+    'event_manager_request_db_duration_seconds', 'Time spent executing SQL per request',
+    ['endpoint', 'method'],
+    buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+)
+RESPONSE_SIZE = Histogram(
+    'event_manager_response_size_bytes', 'Size of response bodies',
+    ['endpoint', 'method'],
+    buckets=(100, 1000, 10000, 100000, 1000000, 10000000)
+)
+ADMISSION_DECISIONS = Counter(
+    'event_manager_admission_decisions', 'Seat claims accepted, rejected as full or shed by the admission gate',
+    ['decision']
+)
+
+class RequestMetrics:
+    """Counters collected while one request is handled"""
+    __slots__ = ('started', 'queries', 'db_time', 'size')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.size = 0
+
+def _current_metrics():
+    if has_request_context():
+        return g.get('_request_metrics')
+    return None
+
+@sa_event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+@sa_event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = _current_metrics()
+    started = getattr(context, '_metrics_started', None)
+    if metrics is not None and started is not None:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - started
+
+def _count_bytes(body, metrics):
+    # Streamed bodies are only sized once the server has sent them
+    for chunk in body:
+        metrics.size += len(chunk)
+        yield chunk
+
+def _observe(metrics, endpoint, method, status):
+    REQUEST_DURATION.labels(endpoint, method, status).observe(time.perf_counter() - metrics.started)
+    REQUEST_DB_QUERIES.labels(endpoint, method).observe(metrics.queries)
+    REQUEST_DB_DURATION.labels(endpoint, method).observe(metrics.db_time)
+    RESPONSE_SIZE.labels(endpoint, method).observe(metrics.size)
+
+def metrics_view():
+    """Prometheus exposition of the request metrics of every worker process"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+def init_metrics(app):
+    """Record per-endpoint latency, SQL and response size metrics and serve them on /metrics"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_request_metrics():
+        g._request_metrics = RequestMetrics()
+
+    @app.after_request
+    def record_request_metrics(response):
+        metrics = g.get('_request_metrics')
+        if metrics is None:
+            return response
+
+        # Unmatched URLs share one label so scanners cannot blow up the series count
+        labels = (request.endpoint or 'unmatched', request.method, str(response.status_code))
+        if response.is_streamed:
+            response.response = _count_bytes(response.response, metrics)
+        else:
+            metrics.size = response.calculate_content_length() or 0
+        # Runs once the body has been sent, so streamed responses are fully accounted for
+        response.call_on_close(lambda: _observe(metrics, *labels))
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
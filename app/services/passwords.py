@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+from flask import current_app
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool already has the maximum number of jobs in flight"""
+
+# Pools by name (request hashing, bulk imports), one per process, created lazily so
+# forked server workers never share them
+_pools = {}
+_pool_lock = threading.Lock()
+
+def _hash(password, log_rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(log_rounds)).decode('utf-8')
+
+def _check(password_hash, password):
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+def _get_pool(workers, name='requests'):
+    with _pool_lock:
+        pool, pid = _pools.get(name, (None, None))
+        if pool is None or pid != os.getpid():
+            # spawn rather than fork: the server process may be running other threads
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[name] = (pool, os.getpid())
+        return pool
+
+def _get_slots(app):
+    """Semaphore bounding the hashing jobs in flight for this app"""
+    slots = app.extensions.get('password_hash_slots')
+    if slots is None:
+        slots = app.extensions.setdefault(
+            'password_hash_slots',
+            threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_IN_FLIGHT'])
+        )
+    return slots
+
+def _run(fn, *args):
+    """
+    Run a bcrypt operation on the worker pool (or inline when PASSWORD_HASH_WORKERS is 0),
+    shedding load with PasswordHashingBusy once the in-flight limit is reached
+    """
+    app = current_app._get_current_object()
+    slots = _get_slots(app)
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    try:
+        workers = app.config['PASSWORD_HASH_WORKERS']
+        if not workers:
+            return fn(*args)
+        return _get_pool(workers).submit(fn, *args).result()
+    finally:
+        slots.release()
+
+def hash_password(password, log_rounds=None):
+    """Hash a password with the configured bcrypt cost"""
+    if log_rounds is None:
+        log_rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+    return _run(_hash, password, log_rounds)
+
+def hash_passwords(passwords, log_rounds=None):
+    """
+    Hash many passwords for a bulk import, in order, spread over USER_IMPORT_HASH_WORKERS
+    processes (inline when 0). The import pool is separate from the one serving
+    requests, so logins are not queued behind an import.
+    """
+    if log_rounds is None:
+        log_rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+    workers = current_app.config['USER_IMPORT_HASH_WORKERS']
+    if not workers or len(passwords) < 2:
+        return [_hash(password, log_rounds) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_get_pool(workers, 'imports').map(
+        _hash, passwords, [log_rounds] * len(passwords), chunksize=chunksize
+    ))
+
+def check_password(password_hash, password):
+    """Check a password against a stored bcrypt hash"""
+    return _run(_check, password_hash, password)
+
+def get_log_rounds(password_hash):
+    """Read the cost factor from a bcrypt hash ($2b$<rounds>$...)"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+def needs_rehash(password_hash):
+    """Check if a stored hash was made with a different cost than the configured one"""
+    return get_log_rounds(password_hash) != current_app.config['BCRYPT_LOG_ROUNDS']
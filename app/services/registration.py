@@ -0,0 +1,267 @@
+from datetime import datetime
+from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.event import Event, event_waitlist, seat_holds
+from app.models.user import event_attendees
+
+# Outcomes of a registration attempt as enum-like constants
+class RegistrationResult:
+    REGISTERED = 'registered'
+    UNREGISTERED = 'unregistered'
+    EVENT_NOT_FOUND = 'event_not_found'
+    NOT_PUBLISHED = 'not_published'
+    ALREADY_REGISTERED = 'already_registered'
+    NOT_REGISTERED = 'not_registered'
+    FULL = 'full'
+    WAITLISTED = 'waitlisted'
+    ALREADY_WAITLISTED = 'already_waitlisted'
+    NOT_WAITLISTED = 'not_waitlisted'
+    LEFT_WAITLIST = 'left_waitlist'
+    HELD = 'held'
+    ALREADY_HELD = 'already_held'
+    NO_HOLD = 'no_hold'
+    HOLD_EXPIRED = 'hold_expired'
+    HOLD_RELEASED = 'hold_released'
+
+# Attempts at taking the next waitlist position before giving up under contention
+WAITLIST_INSERT_ATTEMPTS = 5
+
+def has_seat_available():
+    """
+    SQL condition that is true while the event still has free capacity (see
+    Event.has_unlimited_capacity). Held seats count against the capacity like
+    registrations do.
+    """
+    return or_(
+        Event.unlimited_capacity(),
+        Event.attendee_count + Event.held_count < Event.capacity
+    )
+
+def increment_if_available(event_id, counter):
+    return db.session.execute(
+        db.update(Event)
+        .where(Event.id == event_id, Event.is_published == True, has_seat_available())
+        .values({counter: counter + 1})
+        .execution_options(synchronize_session=False)
+    ).rowcount > 0
+
+def claim_seat(event_id, counter=Event.attendee_count):
+    """
+    Take one seat (as a registration, or a hold with counter=Event.held_count) if the
+    event is published and under capacity; returns whether it did. When the event looks
+    full, holds past their deadline that the sweeper has not reached yet are reclaimed
+    first, with the freed seats going to the waitlist before this claim.
+    """
+    if increment_if_available(event_id, counter):
+        return True
+    if not release_expired_holds(event_id):
+        return False
+    promote_waitlist(event_id)
+    return increment_if_available(event_id, counter)
+
+def release_seat(event_id, counter=Event.attendee_count, amount=1):
+    db.session.execute(
+        db.update(Event)
+        .where(Event.id == event_id)
+        .values({counter: counter - amount})
+        .execution_options(synchronize_session=False)
+    )
+
+def release_expired_holds(event_id, now=None):
+    """Delete the event's expired holds and give back their seats; returns how many"""
+    expired = db.session.execute(
+        seat_holds.delete().where(
+            seat_holds.c.event_id == event_id,
+            seat_holds.c.expires_at <= (now or datetime.utcnow())
+        )
+    ).rowcount
+    if expired:
+        release_seat(event_id, Event.held_count, expired)
+    return expired
+
+def remove_from_waitlist(event_id, user_id):
+    return db.session.execute(
+        event_waitlist.delete().where(
+            event_waitlist.c.event_id == event_id,
+            event_waitlist.c.user_id == user_id
+        )
+    ).rowcount
+
+def diagnose_rejection(event_id, user_id):
+    """Work out why a guarded registration claimed no seat"""
+    event = db.session.execute(
+        db.select(Event.is_published).where(Event.id == event_id)
+    ).first()
+
+    if event is None:
+        return RegistrationResult.EVENT_NOT_FOUND
+    if not event.is_published:
+        return RegistrationResult.NOT_PUBLISHED
+    if Event.is_registered(event_id, user_id):
+        return RegistrationResult.ALREADY_REGISTERED
+    # The user's own hold may be what fills the event
+    if db.session.query(db.exists().where(
+        seat_holds.c.event_id == event_id,
+        seat_holds.c.user_id == user_id
+    )).scalar():
+        return RegistrationResult.ALREADY_HELD
+    return RegistrationResult.FULL
+
+def register_attendee(event_id, user_id):
+    """
+    Atomically register a user for an event.
+
+    A single guarded UPDATE claims a seat only while the event is published and under
+    capacity, and the association row is inserted in the same transaction; the primary
+    key on event_attendees rejects duplicates. Concurrent requests can therefore never
+    overbook, and the attendee list is never loaded. A registered user leaves the
+    event's waitlist in the same transaction.
+    """
+    if not claim_seat(event_id):
+        # Keep any expired holds reclaimed (and waitlist promotions made) on the way
+        db.session.commit()
+        return diagnose_rejection(event_id, user_id)
+
+    try:
+        db.session.execute(event_attendees.insert().values(user_id=user_id, event_id=event_id))
+        remove_from_waitlist(event_id, user_id)
+        db.session.commit()
+    except IntegrityError:
+        # Already registered: undo the seat claimed above
+        db.session.rollback()
+        return RegistrationResult.ALREADY_REGISTERED
+
+    return RegistrationResult.REGISTERED
+
+def unregister_attendee(event_id, user_id):
+    """
+    Atomically remove a registration and release its seat. The freed seat goes to the
+    head of the waitlist in the same transaction.
+    """
+    removed = db.session.execute(
+        event_attendees.delete().where(
+            event_attendees.c.event_id == event_id,
+            event_attendees.c.user_id == user_id
+        )
+    ).rowcount
+
+    if not removed:
+        db.session.rollback()
+        if db.session.get(Event, event_id) is None:
+            return RegistrationResult.EVENT_NOT_FOUND
+        return RegistrationResult.NOT_REGISTERED
+
+    release_seat(event_id)
+    promote_waitlist(event_id)
+    db.session.commit()
+
+    return RegistrationResult.UNREGISTERED
+
+def promote_waitlist(event_id):
+    """
+    Move waitlisted users into the event's free seats, in position order, within the
+    caller's transaction (the caller commits).
+
+    Each promotion reads the head through the (event_id, position) primary key, claims
+    a seat with the same guarded UPDATE as register_attendee and deletes the head by
+    its key, so the cost does not depend on the length of the waitlist. Returns the ids
+    of the promoted users.
+    """
+    promoted = []
+    while True:
+        head = db.session.execute(
+            db.select(event_waitlist.c.position, event_waitlist.c.user_id)
+            .where(event_waitlist.c.event_id == event_id)
+            .order_by(event_waitlist.c.position)
+            .limit(1)
+        ).first()
+        if head is None or not increment_if_available(event_id, Event.attendee_count):
+            return promoted
+
+        removed = db.session.execute(
+            event_waitlist.delete().where(
+                event_waitlist.c.event_id == event_id,
+                event_waitlist.c.position == head.position
+            )
+        ).rowcount
+        if not removed:
+            # A concurrent transaction promoted or removed this entry first
+            release_seat(event_id)
+            continue
+
+        try:
+            with db.session.begin_nested():
+                db.session.execute(event_attendees.insert().values(user_id=head.user_id, event_id=event_id))
+        except IntegrityError:
+            # Registered in the meantime: their waitlist entry is gone, the seat is not needed
+            release_seat(event_id)
+            continue
+        promoted.append(head.user_id)
+
+def join_waitlist(event_id, user_id):
+    """
+    Register the user if a seat is free, otherwise append them to the event's waitlist.
+
+    The new position is one past the current tail, read from the primary key index in
+    the INSERT itself. Waitlisting is followed by a promotion pass in the same
+    transaction, so a seat freed since the registration attempt is not left empty.
+    Returns REGISTERED or WAITLISTED on success.
+    """
+    result = register_attendee(event_id, user_id)
+    if result != RegistrationResult.FULL:
+        return result
+
+    next_position = db.select(
+        func.coalesce(func.max(event_waitlist.c.position), 0) + 1
+    ).where(event_waitlist.c.event_id == event_id).scalar_subquery()
+
+    for _ in range(WAITLIST_INSERT_ATTEMPTS):
+        try:
+            db.session.execute(event_waitlist.insert().values(
+                event_id=event_id, user_id=user_id, position=next_position
+            ))
+            promoted = promote_waitlist(event_id)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            if waitlist_position(event_id, user_id) is not None:
+                return RegistrationResult.ALREADY_WAITLISTED
+            # Another user took the same position concurrently: read the tail again
+            continue
+        return RegistrationResult.REGISTERED if user_id in promoted else RegistrationResult.WAITLISTED
+
+    raise RuntimeError(f'Could not join the waitlist of event {event_id} under contention')
+
+def leave_waitlist(event_id, user_id):
+    """Remove the user from the event's waitlist"""
+    removed = remove_from_waitlist(event_id, user_id)
+    if not removed:
+        db.session.rollback()
+        if db.session.get(Event, event_id) is None:
+            return RegistrationResult.EVENT_NOT_FOUND
+        return RegistrationResult.NOT_WAITLISTED
+
+    db.session.commit()
+    return RegistrationResult.LEFT_WAITLIST
+
+def waitlist_position(event_id, user_id):
+    """The user's 1-based place in the event's waitlist, or None when not waitlisted"""
+    own_position = db.select(event_waitlist.c.position).where(
+        event_waitlist.c.event_id == event_id,
+        event_waitlist.c.user_id == user_id
+    ).scalar_subquery()
+
+    place = db.session.execute(
+        db.select(func.count()).select_from(event_waitlist).where(
+            event_waitlist.c.event_id == event_id,
+            event_waitlist.c.position <= own_position
+        )
+    ).scalar()
+    return place or None
+
+def waitlist_length(event_id):
+    return db.session.execute(
+        db.select(func.count()).select_from(event_waitlist)
+        .where(event_waitlist.c.event_id == event_id)
+    ).scalar()
@@ -0,0 +1,101 @@
+import re
+from sqlalchemy import DDL, event as sa_event
+from app import db
+from app.models.event import Event
+
+# Relative weight of each indexed column when ranking matches
+TITLE_WEIGHT = 10.0
+LOCATION_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+# SQLite: an FTS5 index over the events table, kept in sync by triggers
+SQLITE_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "title, description, location, content='events', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN "
+    "INSERT INTO events_fts (rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN "
+    "INSERT INTO events_fts (events_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF title, description, location ON events BEGIN "
+    "INSERT INTO events_fts (events_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); "
+    "INSERT INTO events_fts (rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+]
+SQLITE_DROP_DDL = ["DROP TABLE IF EXISTS events_fts"]
+
+# Postgres: a generated, weighted tsvector column with a GIN index
+POSTGRES_INDEX_DDL = [
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+]
+
+# Build the index whenever db.create_all() creates the events table
+for statement in SQLITE_INDEX_DDL:
+    sa_event.listen(Event.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in SQLITE_DROP_DDL:
+    sa_event.listen(Event.__table__, 'before_drop', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRES_INDEX_DDL:
+    sa_event.listen(Event.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+def parse_terms(text):
+    """Split a user query into plain word terms (dropping any query syntax)"""
+    return TERM_PATTERN.findall(text.lower())
+
+def _sqlite_search(terms):
+    # Every term must match, as a prefix ("conf" finds "conference")
+    match = ' '.join(f'"{term}"*' for term in terms)
+    matches = db.text(
+        "SELECT rowid AS event_id, "
+        f"bm25(events_fts, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}, {LOCATION_WEIGHT}) AS rank "
+        "FROM events_fts WHERE events_fts MATCH :match"
+    ).bindparams(match=match).columns(
+        db.column('event_id', db.Integer), db.column('rank', db.Float)
+    ).subquery('matches')
+
+    # bm25 scores are negative: the lower, the better the match
+    return Event.query.join(matches, matches.c.event_id == Event.id).order_by(matches.c.rank, Event.id)
+
+def _postgres_search(terms):
+    tsquery = db.func.to_tsquery('english', ' & '.join(f'{term}:*' for term in terms))
+    search_vector = db.literal_column('events.search_vector')
+    rank = db.func.ts_rank(search_vector, tsquery)
+    return Event.query.filter(search_vector.op('@@')(tsquery)).order_by(rank.desc(), Event.id)
+
+def _fallback_search(terms):
+    # Unindexed substring match for other databases
+    query = Event.query
+    for term in terms:
+        pattern = f'%{term}%'
+        query = query.filter(
+            Event.title.ilike(pattern) | Event.description.ilike(pattern) | Event.location.ilike(pattern)
+        )
+    return query.order_by(Event.start_time, Event.id)
+
+def search_events(text):
+    """
+    Query of events matching every term of a free-text search over title, description
+    and location, best matches first. Returns None if the text contains no terms.
+    """
+    terms = parse_terms(text)
+    if not terms:
+        return None
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return _sqlite_search(terms)
+    if dialect == 'postgresql':
+        return _postgres_search(terms)
+    return _fallback_search(terms)
+
+def rebuild_search_index():
+    """Repopulate the SQLite full-text index from the events table"""
+    if db.engine.dialect.name == 'sqlite':
+        db.session.execute(db.text("INSERT INTO events_fts (events_fts) VALUES ('rebuild')"))
@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from flask import current_app
+from app.utils.json_provider import RawJSON, json_bytes
+
+class EncodedCache:
+    """Thread-safe LRU of encoded JSON documents"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self)}
+
+def create_event_json_cache(app):
+    return EncodedCache(app.config.get('EVENT_JSON_CACHE_SIZE', 4096))
+
+def event_json_key(event):
+    """
+    Anything that changes an event's JSON bumps updated_at or one of the seat
+    counters, so together with the id they identify one encoding
+    """
+    return (event.id, event.updated_at, event.get_attendee_count(), event.get_held_count())
+
+def encode_event(event):
+    """
+    The event's to_dict() as encoded JSON. Published events are encoded once per
+    version and then served from the cache.
+    """
+    if not event.is_published:
+        return RawJSON(json_bytes(event.to_dict()))
+
+    cache = current_app.extensions['event_json_cache']
+    key = event_json_key(event)
+    encoded = cache.get(key)
+    if encoded is None:
+        encoded = RawJSON(json_bytes(event.to_dict()))
+        cache.set(key, encoded)
+    return encoded
@@ -0,0 +1,168 @@
+from datetime import datetime
+from itertools import islice
+from email_validator import EmailNotValidError, validate_email
+from email_validator.deliverability import validate_email_deliverability
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.user import User, UserRole
+from app.services.passwords import hash_passwords
+from app.utils.bulk_input import in_batches
+
+# Attempts at committing a chunk when concurrent sign-ups take some of its names
+CHUNK_ATTEMPTS = 3
+
+# Column sizes of the users table
+USERNAME_MAX_LENGTH = User.__table__.c.username.type.length
+EMAIL_MAX_LENGTH = User.__table__.c.email.type.length
+
+class UserImportError(ValueError):
+    """Malformed input stopped an import; report covers the records imported before it"""
+
+    def __init__(self, message, report):
+        super().__init__(message)
+        self.report = report
+
+class EmailDomains:
+    """Deliverability of email domains, looked up once per domain for a whole import"""
+
+    def __init__(self, check_deliverability=False):
+        self.check_deliverability = check_deliverability
+        self._errors = {}
+
+    def validate(self, email):
+        """The normalized address; raises EmailNotValidError"""
+        valid = validate_email(email, check_deliverability=False)
+        if self.check_deliverability:
+            if valid.ascii_domain not in self._errors:
+                try:
+                    validate_email_deliverability(valid.ascii_domain, valid.domain)
+                    self._errors[valid.ascii_domain] = None
+                except EmailNotValidError as e:
+                    self._errors[valid.ascii_domain] = e
+            if self._errors[valid.ascii_domain] is not None:
+                raise self._errors[valid.ascii_domain]
+        return valid.email
+
+def _validate(chunk, domains):
+    """Split a chunk into (number, username, email, password) rows and rejected rows"""
+    rows, rejected = [], []
+    for number, record in chunk:
+        record = record if isinstance(record, dict) else {}
+        username = str(record.get('username') or '').strip()
+        email = str(record.get('email') or '').strip()
+        password = record.get('password')
+        reject = {'row': number, 'username': username, 'email': email}
+
+        if not username or not email or not password:
+            rejected.append({**reject, 'message': 'Missing required fields'})
+            continue
+        if len(username) > USERNAME_MAX_LENGTH:
+            rejected.append({**reject, 'message': 'Username is too long'})
+            continue
+        try:
+            email = domains.validate(email)
+        except EmailNotValidError as e:
+            rejected.append({**reject, 'message': str(e)})
+            continue
+        if len(email) > EMAIL_MAX_LENGTH:
+            rejected.append({**reject, 'message': 'Email is too long'})
+            continue
+        rows.append((number, username, email, str(password)))
+    return rows, rejected
+
+def _existing(column, values):
+    """The values already taken in a unique users column, with batched IN queries"""
+    taken = set()
+    for batch in in_batches(values):
+        taken.update(db.session.execute(db.select(column).where(column.in_(batch))).scalars())
+    return taken
+
+def _unique(rows):
+    """Rows whose username and email are free, in the database and earlier in the chunk"""
+    taken_usernames = _existing(User.username, {row[1] for row in rows})
+    taken_emails = _existing(User.email, {row[2] for row in rows})
+    accepted, rejected = [], []
+    for row in rows:
+        number, username, email, _ = row
+        if username in taken_usernames:
+            rejected.append({'row': number, 'username': username, 'email': email, 'message': 'Username already exists'})
+        elif email in taken_emails:
+            rejected.append({'row': number, 'username': username, 'email': email, 'message': 'Email already exists'})
+        else:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+            accepted.append(row)
+    return accepted, rejected
+
+def _import_chunk(chunk, domains):
+    """Create the users of one chunk in one transaction; returns (created, rejected rows)"""
+    rows, rejected = _validate(chunk, domains)
+    hashes = {}
+    for _ in range(CHUNK_ATTEMPTS):
+        accepted, duplicates = _unique(rows)
+        # Passwords are hashed once, even when a retry drops some of the rows
+        unhashed = [row for row in accepted if row[0] not in hashes]
+        hashes.update(zip((row[0] for row in unhashed), hash_passwords([row[3] for row in unhashed])))
+
+        now = datetime.utcnow()
+        try:
+            if accepted:
+                db.session.execute(User.__table__.insert(), [{
+                    'username': username, 'email': email, 'password_hash': hashes[number],
+                    'role': UserRole.USER, 'token_version': 0, 'created_at': now, 'updated_at': now
+                } for number, username, email, _ in accepted])
+            db.session.commit()
+        except IntegrityError:
+            # Some of the names were taken concurrently: check them again
+            db.session.rollback()
+            continue
+        return len(accepted), sorted(rejected + duplicates, key=lambda row: row['row'])
+    raise RuntimeError('Could not import users under contention')
+
+def _read_chunk(records, size):
+    """The next size records, and the error that stopped reading early if any"""
+    chunk = []
+    try:
+        for record in islice(records, size):
+            chunk.append(record)
+    except ValueError as e:
+        return chunk, e
+    return chunk, None
+
+def import_users(records, chunk_size=None, skip=0, on_chunk=None):
+    """
+    Create regular users from (row number, record) pairs with username, email and
+    password fields, committing every chunk_size (USER_IMPORT_CHUNK_SIZE) records.
+
+    Each chunk costs a few set-based queries however large it is: usernames and emails
+    are checked with batched IN queries, passwords are hashed on the import process
+    pool and the users inserted with one executemany. Emails are validated without
+    network access unless USER_IMPORT_CHECK_DELIVERABILITY is set, in which case each
+    distinct domain is looked up once.
+
+    The first skip records are passed over, to resume an import from the processed
+    count of an earlier run. on_chunk(report) is called after every commit. Returns
+    the report: processed and created counts and the rejected rows. Malformed input
+    raises UserImportError after the records read before it are imported.
+    """
+    chunk_size = chunk_size or current_app.config['USER_IMPORT_CHUNK_SIZE']
+    domains = EmailDomains(current_app.config['USER_IMPORT_CHECK_DELIVERABILITY'])
+    records = iter(records)
+    skipped, error = _read_chunk(records, skip)
+    report = {'processed': len(skipped), 'created': 0, 'rejected': []}
+
+    while error is None:
+        chunk, error = _read_chunk(records, chunk_size)
+        if not chunk:
+            break
+        created, rejected = _import_chunk(chunk, domains)
+        report['processed'] += len(chunk)
+        report['created'] += created
+        report['rejected'].extend(rejected)
+        if on_chunk is not None:
+            on_chunk(report)
+
+    if error is not None:
+        raise UserImportError(str(error), report)
+    return report
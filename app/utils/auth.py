@@ -1,7 +1,80 @@
+import logging
 from functools import wraps
-from flask import jsonify, request
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, jwt_required
-from app.models.user import User
+from flask import current_app, g, jsonify, request
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, get_jwt_identity, jwt_required
+from app.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+def role_claims_enabled():
+    """
+    Check if tokens carry the user's role so authorization can skip the database
+    """
+    return current_app.config.get('JWT_ROLE_CLAIMS', False)
+
+def token_claims(user):
+    """
+    Additional JWT claims for a user's tokens (empty unless role claims are enabled)
+    """
+    if not role_claims_enabled():
+        return {}
+    return {'role': user.role, 'tv': user.token_version}
+
+def _user_id(user_id):
+    # Convert string ID to integer if needed
+    if isinstance(user_id, str) and user_id.isdigit():
+        return int(user_id)
+    return user_id
+
+def _cached_user(user_id):
+    """
+    The (hit, user) cached for this request. flask.g lives as long as the app context,
+    which may span several requests (e.g. a test client used inside one app context),
+    so the entry is keyed to the request it was made for.
+    """
+    cached = g.get('_jwt_user')
+    if cached is not None and cached[0] is request._get_current_object() and cached[1] == user_id:
+        return True, cached[2]
+    return False, None
+
+def load_user(user_id):
+    """
+    Resolve a JWT identity to a User, caching it for the rest of the request
+    """
+    user_id = _user_id(user_id)
+    hit, user = _cached_user(user_id)
+    if hit:
+        return user
+    
+    user = User.query.filter_by(id=user_id).first()
+    g._jwt_user = (request._get_current_object(), user_id, user)
+    return user
+
+def get_optional_user_id():
+    """
+    Id of the user whose token the request carries, or None for anonymous requests
+    """
+    verify_jwt_in_request(optional=True)
+    return _user_id(get_jwt_identity())
+
+def get_current_role():
+    """
+    Role of the current user, from the token claims when available and still current
+    (checked against the user's token version), otherwise the database.
+    Returns None if the user does not exist.
+    
+    The token version is read from the user row cached for the request, so the
+    check costs no query beyond the one the view makes to load the current user.
+    """
+    user = load_user(get_jwt_identity())
+    if user is None:
+        return None
+    if role_claims_enabled():
+        claims = get_jwt()
+        # A role change bumps the token version: older tokens fall back to the database
+        if claims.get('role') is not None and claims.get('tv') == user.token_version:
+            return claims['role']
+    return user.role
 
 def admin_required():
     """
@@ -11,18 +84,12 @@ def admin_required():
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            
-            # Convert string ID to integer if needed
-            if isinstance(user_id, str) and user_id.isdigit():
-                user_id = int(user_id)
-                
-            user = User.query.filter_by(id=user_id).first()
+            role = get_current_role()
             
-            if not user:
+            if role is None:
                 return jsonify({"msg": "User not found"}), 404
                 
-            if not user.is_admin():
+            if role != UserRole.ADMIN:
                 return jsonify({"msg": "Admin privileges required"}), 403
                 
             return fn(*args, **kwargs)
@@ -37,18 +104,12 @@ def publisher_required():
         @wraps(fn)
         def decorator(*args, **kwargs):
             verify_jwt_in_request()
-            user_id = get_jwt_identity()
+            role = get_current_role()
             
-            # Convert string ID to integer if needed
-            if isinstance(user_id, str) and user_id.isdigit():
-                user_id = int(user_id)
-                
-            user = User.query.filter_by(id=user_id).first()
-            
-            if not user:
+            if role is None:
                 return jsonify({"msg": "User not found"}), 404
                 
-            if not user.is_publisher():
+            if role not in (UserRole.PUBLISHER, UserRole.ADMIN):
                 return jsonify({"msg": "Publisher privileges required"}), 403
                 
             return fn(*args, **kwargs)
@@ -66,24 +127,16 @@ def get_current_user():
         # Get user ID from token
         user_id = get_jwt_identity()
         if not user_id:
-            print(f"JWT token exists but identity is None or empty")
+            logger.debug('JWT token has no identity')
             return None
         
-        # Convert string ID to integer if needed
-        if isinstance(user_id, str) and user_id.isdigit():
-            user_id = int(user_id)
-        
-        # Get user from database
-        user = User.query.filter_by(id=user_id).first()
+        # Get user from the request cache or the database
+        user = load_user(user_id)
         if not user:
-            print(f"User with ID {user_id} not found in database")
-        else:
-            print(f"Successfully authenticated user: {user.username} (ID: {user.id}, Role: {user.role})")
+            logger.debug('User %s from token not found', user_id)
         return user
-    except Exception as e:
-        import traceback
-        print(f"Error in get_current_user: {str(e)}")
-        traceback.print_exc()
+    except Exception:
+        logger.exception('Error loading the current user')
         return None
 
 def custom_jwt_required():
@@ -97,23 +150,15 @@ def custom_jwt_required():
                 # Check for Authorization header
                 auth_header = request.headers.get('Authorization', '')
                 if not auth_header or not auth_header.startswith('Bearer '):
-                    print(f"Missing or invalid Authorization header: {auth_header}")
                     return jsonify({"message": "Missing or invalid Authorization header", "error_type": "no_token"}), 401
                 
-                # Extract the token manually
-                token = auth_header.replace('Bearer ', '')
-                print(f"Token extracted from header: {token[:10]}...")
-                
                 # Attempt to verify the JWT token
                 verify_jwt_in_request()
                 
                 # If we get here, token is valid
                 return fn(*args, **kwargs)
             except Exception as e:
-                # Print detailed error for debugging
-                import traceback
-                print(f"JWT Validation Error: {str(e)}")
-                print(traceback.format_exc())
+                logger.debug('JWT validation failed: %s', e)
                 
                 # Return more specific error response
                 if 'expired' in str(e).lower():
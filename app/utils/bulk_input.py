@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+import os
+
+# Bulk input formats by content type and by file extension
+CONTENT_TYPE_FORMATS = {
+    'application/json': 'json',
+    'text/csv': 'csv',
+    'application/x-ndjson': 'ndjson',
+    'application/ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'application/x-jsonlines': 'ndjson',
+}
+EXTENSION_FORMATS = {'.json': 'json', '.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+# Values per IN (...) list, well under SQLite's bound parameter limit
+IN_BATCH_SIZE = 500
+
+def in_batches(values, size=IN_BATCH_SIZE):
+    """Split values into lists small enough for one IN (...) query each"""
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def detect_format(content_type=None, filename=None):
+    """'json', 'csv' or 'ndjson' from a content type or file name; raises ValueError otherwise"""
+    if content_type in CONTENT_TYPE_FORMATS:
+        return CONTENT_TYPE_FORMATS[content_type]
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension in EXTENSION_FORMATS:
+        return EXTENSION_FORMATS[extension]
+    raise ValueError('Unsupported format: send a JSON array, CSV or NDJSON')
+
+def _readable(stream):
+    """Wrap a raw request stream so it can be decoded and read line by line"""
+    if isinstance(stream, io.BufferedIOBase):
+        return stream
+    return io.BufferedReader(_RawStream(stream))
+
+class _RawStream(io.RawIOBase):
+    """Adapter giving any object with read() the raw binary stream interface"""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+def iter_records(stream, fmt):
+    """
+    Yield (line_number, record) from a binary stream without reading it all first
+    (except for JSON arrays). CSV records are dicts keyed by the header row, JSON and
+    NDJSON records are the parsed values. Raises ValueError for malformed input.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(io.TextIOWrapper(_readable(stream), encoding='utf-8-sig', newline=''))
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == 'ndjson':
+        for number, line in enumerate(_readable(stream), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                raise ValueError(f'Invalid JSON on line {number}')
+    else:
+        try:
+            document = json.load(stream)
+        except ValueError:
+            raise ValueError('Invalid JSON')
+        if not isinstance(document, list):
+            raise ValueError('Expected a JSON array')
+        for number, record in enumerate(document, 1):
+            yield number, record
+
+def request_records(request):
+    """Records of the request body, or of its uploaded 'file' for multipart requests"""
+    upload = request.files.get('file') if request.mimetype == 'multipart/form-data' else None
+    if upload is not None:
+        return iter_records(upload.stream, detect_format(upload.mimetype, upload.filename))
+    return iter_records(request.stream, detect_format(request.mimetype))
@@ -0,0 +1,37 @@
+import hashlib
+from flask import make_response, request
+from werkzeug.http import is_resource_modified
+
+def make_etag(*parts):
+    """
+    Build a strong ETag value from the parts that identify a version of a resource
+    """
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+def set_validators(response, etag, last_modified=None):
+    """
+    Attach the ETag and Last-Modified headers to a response
+    """
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+def not_modified_response(etag, last_modified=None):
+    """
+    Return a 304 response if the request's If-None-Match / If-Modified-Since headers
+    match the given validators, otherwise None
+    """
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return set_validators(make_response('', 304), etag, last_modified)
+
+def conditional_json(payload_fn, etag, last_modified=None):
+    """
+    Answer with 304 when the client's copy is current, otherwise serialize payload_fn()
+    and attach the validators
+    """
+    not_modified = not_modified_response(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    return set_validators(make_response(payload_fn()), etag, last_modified)
@@ -0,0 +1,86 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from flask import current_app
+from flask.json.provider import JSONProvider
+
+# orjson (3.9+, pinned in requirements.txt) is several times faster than the json
+# module and splices cached encodings in with orjson.Fragment; older releases and a
+# missing install fall back to the json module
+try:
+    import orjson
+    orjson.Fragment
+except (ImportError, AttributeError):
+    orjson = None
+
+class RawJSON(bytes):
+    """An already encoded JSON document, written into responses as is"""
+
+def _default(obj):
+    """Encode the types the json module (or orjson) does not handle itself"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, RawJSON):
+        return json.loads(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def _orjson_default(obj):
+    # Encoded documents are spliced in without being parsed again
+    if isinstance(obj, RawJSON):
+        return orjson.Fragment(bytes(obj))
+    return _default(obj)
+
+class FastJSONProvider(JSONProvider):
+    """
+    JSON provider using orjson when installed (the json module otherwise). Datetimes
+    are encoded as ISO 8601 strings, like the models' to_dict() methods do.
+    """
+    mimetype = 'application/json'
+
+    def dumps_bytes(self, obj):
+        """Encode obj to compact UTF-8 JSON bytes"""
+        if isinstance(obj, RawJSON):
+            return bytes(obj)
+        if orjson is not None:
+            return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+def json_bytes(obj):
+    """Encode obj with the current app's JSON provider (RawJSON passes through)"""
+    if isinstance(obj, RawJSON):
+        return bytes(obj)
+    provider = current_app.json
+    if hasattr(provider, 'dumps_bytes'):
+        return provider.dumps_bytes(obj)
+    return provider.dumps(obj).encode('utf-8')
+
+def json_array(items):
+    """Encode a list whose items may be RawJSON without decoding them again"""
+    return RawJSON(b'[' + b','.join(json_bytes(item) for item in items) + b']')
+
+def raw_json_response(document, status=200):
+    """Response with an encoded JSON document as its body"""
+    return current_app.response_class(bytes(document), status=status, mimetype='application/json')
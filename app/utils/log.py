@@ -0,0 +1,130 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import has_request_context, request
+from flask.logging import default_handler
+
+# Root of the per-module loggers: logging.getLogger(__name__) anywhere under app/
+LOGGER_NAME = 'app'
+
+# Attributes every LogRecord has; anything else was passed through extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+# The listener draining the queue of the most recently configured app
+_listener = None
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including any extra fields"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records of high-volume levels, e.g. {'DEBUG': 0.1}.
+    Kept records carry sample_rate so counts can be scaled back up.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = {logging.getLevelName(level) if isinstance(level, str) else level: rate
+                      for level, rate in (rates or {}).items()}
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno)
+        if rate is None or rate >= 1:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+class RequestContextFilter(logging.Filter):
+    """Attach the method, path and endpoint of the current request to each record"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.method = request.method
+            record.path = request.path
+            record.endpoint = request.endpoint
+        return True
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hand records to the listener thread. Unlike the stock QueueHandler, the message
+    and traceback are rendered to strings here but extra fields stay separate for the
+    JSON formatter.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
+def configure_logging(app):
+    """
+    Send the app's log records through a queue to a background thread that writes
+    them as JSON, so request threads never wait on I/O
+    """
+    global _listener
+    level = logging.getLevelName(app.config.get('LOG_LEVEL', 'INFO'))
+    if not app.config.get('LOG_DEBUG_ENABLED', True):
+        level = max(level, logging.INFO)
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(level)
+    for handler in list(logger.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            logger.removeHandler(handler)
+    _stop_listener()
+
+    # Tests capture records through the root logger instead
+    if app.testing:
+        logger.propagate = True
+        return
+
+    # Replace Flask's synchronous stderr handler
+    logger.removeHandler(default_handler)
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JSONFormatter())
+
+    records = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(records)
+    # Filter before enqueueing so dropped records cost nothing more
+    handler.addFilter(SamplingFilter(app.config.get('LOG_SAMPLE_RATES')))
+    handler.addFilter(RequestContextFilter())
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    _listener = QueueListener(records, output)
+    _listener.start()
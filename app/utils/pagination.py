@@ -0,0 +1,78 @@
+import base64
+import json
+from datetime import datetime, timezone
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def parse_datetime(value):
+    """
+    Parse an ISO 8601 string into a naive UTC datetime (the format stored in the database)
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def encode_cursor(sort_value, tiebreaker):
+    """
+    Encode the (sort value, tiebreaker id) of the last row of a page into an opaque cursor
+    """
+    payload = json.dumps([sort_value.isoformat(), tiebreaker], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor, raising ValueError if it is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, tiebreaker = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(sort_value), int(tiebreaker)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+def get_page_args(args, default_limit=DEFAULT_PAGE_SIZE, max_limit=MAX_PAGE_SIZE):
+    """
+    Read the cursor and limit query parameters, raising ValueError for invalid values
+    """
+    cursor = args.get('cursor')
+    position = decode_cursor(cursor) if cursor else None
+
+    limit = args.get('limit', default_limit)
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid limit')
+    if limit < 1:
+        raise ValueError('Invalid limit')
+
+    return position, min(limit, max_limit)
+
+def keyset_paginate(query, sort_column, tiebreaker_column, position=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Return one page of rows ordered by (sort_column, tiebreaker_column) and the cursor
+    for the next page (None on the last page).
+
+    Rows are located with a range condition on the ordering columns rather than an
+    OFFSET, so every page costs the same no matter how deep the client scrolls.
+    """
+    if position is not None:
+        sort_value, tiebreaker = position
+        # The leading >= lets the database seek on an index over the sort column
+        query = query.filter(
+            sort_column >= sort_value,
+            or_(sort_column > sort_value,
+                and_(sort_column == sort_value, tiebreaker_column > tiebreaker))
+        )
+
+    rows = query.order_by(sort_column, tiebreaker_column).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, tiebreaker_column.key))
+
+    return rows, next_cursor
@@ -0,0 +1,157 @@
+from datetime import datetime
+from sqlalchemy.orm import load_only
+from app import db
+from app.models.event import Event, FIELD_COLUMNS
+from app.models.user import User, event_attendees
+
+# Attendee fields ?fields= can select, with the column each one reads
+ATTENDEE_COLUMNS = {
+    'id': User.id,
+    'username': User.username,
+    'email': User.email,
+    'role': User.role,
+    'created_at': User.created_at,
+    'updated_at': User.updated_at,
+    'registered_at': event_attendees.c.registered_at,
+}
+
+# Related data that ?include= can add to each serialized event
+EVENT_INCLUDES = ('publisher', 'registration_status')
+
+# Columns every projected query loads: the primary key and the listing sort key
+_ALWAYS_LOADED = ('id', 'start_time')
+
+# Columns each include reads from the events themselves
+INCLUDE_COLUMNS = {'publisher': ('publisher_id',), 'registration_status': ()}
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+def parse_fields(args):
+    """
+    The event fields requested with ?fields=a,b (None for all of them).
+    Raises ValueError for unknown fields.
+    """
+    value = args.get('fields')
+    if value is None:
+        return None
+    fields = _split(value)
+    unknown = [name for name in fields if name not in FIELD_COLUMNS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown field: {', '.join(unknown) or value!r}")
+    # The id is always returned so clients can link to the event
+    return {'id', *fields}
+
+def parse_attendee_fields(args):
+    """
+    The attendee fields requested with ?fields=a,b (all of them by default).
+    Raises ValueError for unknown fields.
+    """
+    value = args.get('fields')
+    if value is None:
+        return list(ATTENDEE_COLUMNS)
+    fields = _split(value)
+    unknown = [name for name in fields if name not in ATTENDEE_COLUMNS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown field: {', '.join(unknown) or value!r}")
+    return ['id', *(name for name in ATTENDEE_COLUMNS if name in fields and name != 'id')]
+
+def attendee_query(event_id, fields):
+    """
+    Query of column tuples, not User objects, for the attendees of an event: the
+    requested fields plus the (registered_at, user_id) keyset of the attendee list
+    """
+    columns = [ATTENDEE_COLUMNS[name].label(name) for name in fields if name != 'registered_at']
+    return db.session.query(
+        *columns, event_attendees.c.registered_at, event_attendees.c.user_id
+    ).select_from(event_attendees).join(
+        User, User.id == event_attendees.c.user_id
+    ).filter(event_attendees.c.event_id == event_id)
+
+def attendee_serializer(fields):
+    """Serializer for attendee rows from attendee_query"""
+    def serialize(row):
+        data = {}
+        for name in fields:
+            value = getattr(row, name)
+            data[name] = value.isoformat() if isinstance(value, datetime) else value
+        return data
+    return serialize
+
+def parse_includes(args):
+    """
+    The related data requested with ?include=a,b. Raises ValueError for unknown names.
+    """
+    includes = _split(args.get('include', ''))
+    unknown = [name for name in includes if name not in EVENT_INCLUDES]
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(unknown)}")
+    return set(includes)
+
+def load_fields(query, fields, includes=()):
+    """Restrict an event query to the columns the requested fields and includes read"""
+    if fields is None:
+        return query
+    columns = set(_ALWAYS_LOADED)
+    for name in fields:
+        columns.update(FIELD_COLUMNS[name])
+    for name in includes:
+        columns.update(INCLUDE_COLUMNS[name])
+    return query.options(load_only(*(getattr(Event, column) for column in sorted(columns))))
+
+def representation_etag_parts(fields, includes, user_id=None):
+    """ETag components telling apart the representations of the same events"""
+    parts = [','.join(sorted(fields)) if fields else '*', ','.join(sorted(includes))]
+    if 'registration_status' in includes:
+        parts.append(user_id)
+    return parts
+
+def _publishers(events):
+    """One query for the publishers of all the events"""
+    publisher_ids = {event.publisher_id for event in events}
+    if not publisher_ids:
+        return {}
+    rows = db.session.execute(
+        db.select(User.id, User.username).where(User.id.in_(publisher_ids))
+    )
+    return {row.id: {'id': row.id, 'username': row.username} for row in rows}
+
+def _registrations(events, user_id):
+    """One query for the user's registrations among the events"""
+    event_ids = [event.id for event in events]
+    if not event_ids:
+        return {}
+    rows = db.session.execute(
+        db.select(event_attendees.c.event_id, event_attendees.c.registered_at).where(
+            event_attendees.c.user_id == user_id,
+            event_attendees.c.event_id.in_(event_ids)
+        )
+    )
+    return {row.event_id: row.registered_at for row in rows}
+
+def event_serializer(events, fields, includes, user_id=None):
+    """
+    Serializer for a page of events honouring ?fields= and ?include=. Includes are
+    resolved up front with one batched query each. Anonymous requests get a null
+    registration_status.
+    """
+    publishers = _publishers(events) if 'publisher' in includes else None
+    registrations = None
+    if 'registration_status' in includes and user_id is not None:
+        registrations = _registrations(events, user_id)
+
+    def serialize(event):
+        data = event.to_dict(fields)
+        if publishers is not None:
+            data['publisher'] = publishers.get(event.publisher_id)
+        if 'registration_status' in includes:
+            if registrations is None:
+                data['registration_status'] = None
+            else:
+                registered_at = registrations.get(event.id)
+                data['registration_status'] = {
+                    'registered': event.id in registrations,
+                    'registered_at': registered_at.isoformat() if registered_at else None,
+                }
+        return data
+    return serialize
@@ -0,0 +1,100 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, has_request_context, request
+from sqlalchemy import event as sa_event
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# The same relationship lazy-loaded this many times in one request is treated as an N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+class QueryTracker:
+    """SQL statements and relationship lazy loads seen while tracking is active"""
+
+    def __init__(self):
+        self.statements = []
+        self.lazy_loads = Counter()  # 'Event.attendees' -> number of lazy loads
+
+    def __len__(self):
+        return len(self.statements)
+
+    def record_statement(self, statement):
+        self.statements.append(statement)
+
+    def record_orm_execute(self, orm_execute_state):
+        # Only lazy loads run once per parent object; eager loaders run once per query
+        if orm_execute_state.is_relationship_load and orm_execute_state.lazy_loaded_from is not None:
+            self.lazy_loads[str(orm_execute_state.loader_strategy_path[-1])] += 1
+
+    def n_plus_one(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """Relationships lazy-loaded at least threshold times, with their load counts"""
+        return {name: count for name, count in self.lazy_loads.items() if count >= threshold}
+
+    def report(self):
+        lines = [f'{len(self.statements)} SQL statements']
+        for name, count in self.lazy_loads.most_common():
+            lines.append(f'  {name} lazy-loaded {count} times')
+        lines.extend(f'  {statement}' for statement in self.statements)
+        return '\n'.join(lines)
+
+@contextmanager
+def track_queries(app):
+    """Record every statement and lazy load issued through the app's engine and session"""
+    tracker = QueryTracker()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        tracker.record_statement(statement)
+
+    with app.app_context():
+        engine = db.engine
+    sa_event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    sa_event.listen(db.session, 'do_orm_execute', tracker.record_orm_execute)
+    try:
+        yield tracker
+    finally:
+        sa_event.remove(db.session, 'do_orm_execute', tracker.record_orm_execute)
+        sa_event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+def _request_tracker():
+    if has_request_context():
+        return g.get('_query_tracker')
+    return None
+
+def _track_request_statement(conn, cursor, statement, parameters, context, executemany):
+    tracker = _request_tracker()
+    if tracker is not None:
+        tracker.record_statement(statement)
+
+def _track_request_orm_execute(orm_execute_state):
+    tracker = _request_tracker()
+    if tracker is not None:
+        tracker.record_orm_execute(orm_execute_state)
+
+def init_query_debugging(app):
+    """Log a warning for every request that lazy-loads a relationship N+1 style (QUERY_DEBUG)"""
+    if not app.config.get('QUERY_DEBUG'):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    if not sa_event.contains(engine, 'before_cursor_execute', _track_request_statement):
+        sa_event.listen(engine, 'before_cursor_execute', _track_request_statement)
+    if not sa_event.contains(db.session, 'do_orm_execute', _track_request_orm_execute):
+        sa_event.listen(db.session, 'do_orm_execute', _track_request_orm_execute)
+
+    @app.before_request
+    def start_query_tracking():
+        g._query_tracker = QueryTracker()
+
+    @app.teardown_request
+    def check_query_tracking(exc):
+        tracker = g.pop('_query_tracker', None)
+        if tracker is None:
+            return
+        for name, count in tracker.n_plus_one().items():
+            logger.warning(
+                'N+1 query: %s %s lazy-loaded %s %d times (%d SQL statements in total)',
+                request.method, request.path, name, count, len(tracker)
+            )
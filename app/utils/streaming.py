@@ -0,0 +1,117 @@
+import csv
+import io
+import zlib
+from flask import Response, request, stream_with_context
+from app.utils.json_provider import json_bytes
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Rows fetched from the database per round-trip while streaming
+STREAM_BATCH_SIZE = 1000
+
+# CSV rows encoded per chunk of the response body
+CSV_CHUNK_ROWS = 500
+
+# Leading characters that make spreadsheet applications evaluate a cell as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+def wants_ndjson():
+    """
+    Check if the client asked for newline-delimited JSON via the Accept header
+    """
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+def iterate_query(query, batch_size=STREAM_BATCH_SIZE):
+    """
+    Iterate a query in batches instead of loading every row up front
+    """
+    return query.yield_per(batch_size)
+
+def _json_array(rows, serialize, dumps):
+    yield b'['
+    first = True
+    for row in rows:
+        if first:
+            first = False
+            yield dumps(serialize(row))
+        else:
+            yield b',' + dumps(serialize(row))
+    yield b']'
+
+def _ndjson_lines(rows, serialize, dumps):
+    for row in rows:
+        yield dumps(serialize(row)) + b'\n'
+
+def stream_json(rows, serialize, envelope=None, key=None):
+    """
+    Stream rows as a JSON array, encoding one row at a time so memory use does not
+    grow with the number of rows. Clients accepting application/x-ndjson get one
+    JSON document per line instead.
+
+    With an envelope dict, the array is emitted as envelope[key] inside that object
+    (NDJSON responses contain only the rows). serialize may return RawJSON, which
+    is written out without being encoded again. The representation depends on the
+    Accept header, so responses carry Vary: Accept.
+    """
+    dumps = json_bytes
+
+    if wants_ndjson():
+        body = _ndjson_lines(rows, serialize, dumps)
+        mimetype = NDJSON_MIMETYPE
+    else:
+        body = _json_array(rows, serialize, dumps)
+        if envelope is not None:
+            body = _wrap(envelope, key, body, dumps)
+        mimetype = 'application/json'
+
+    return Response(stream_with_context(body), mimetype=mimetype, headers={'Vary': 'Accept'})
+
+def _wrap(envelope, key, array, dumps):
+    head = dumps(envelope)
+    yield head[:-1] + (b',' if envelope else b'') + dumps(key) + b':'
+    yield from array
+    yield b'}'
+
+def accepts_gzip():
+    """Check if the client accepts a gzip-encoded response"""
+    return request.accept_encodings['gzip'] > 0
+
+def _gzip(chunks):
+    """Compress a stream of byte chunks into one gzip member as it goes"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+def _csv_chunks(header, rows, serialize):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_csv_cell(value) for value in serialize(row)])
+        if count % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+def stream_csv(header, rows, serialize, filename):
+    """
+    Stream rows as a CSV attachment, a few hundred rows per chunk, so memory use does
+    not grow with the number of rows. serialize turns a row into a list of cells.
+    The body is gzip-compressed on the fly for clients accepting it.
+    """
+    body = _csv_chunks(header, rows, serialize)
+    headers = {'Content-Disposition': f'attachment; filename="{filename}"', 'Vary': 'Accept-Encoding'}
+    if accepts_gzip():
+        body = _gzip(body)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(body), mimetype='text/csv', headers=headers)
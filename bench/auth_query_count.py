@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Count the SQL statements and time spent on an authenticated request for a user
+with many registrations, with and without eager loading of User.events_attending.
+
+The "before" run restores the old behaviour (lazy='subquery') by adding a
+subqueryload option to every User query, so both runs use the same code paths.
+
+    python -m bench.auth_query_count --registrations 5000 --requests 200
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import subqueryload
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event, UserRole, event_attendees
+
+def seed(registrations):
+    """Create a publisher, one heavy attendee and the events they are registered for"""
+    publisher = User(username='bench_publisher', email='bench_publisher@example.com',
+                     password='password', role=UserRole.PUBLISHER)
+    attendee = User(username='bench_attendee', email='bench_attendee@example.com',
+                    password='password')
+    db.session.add_all([publisher, attendee])
+    db.session.commit()
+
+    start = datetime(2025, 1, 1, 9, 0)
+    db.session.execute(Event.__table__.insert(), [
+        {'title': f'Event {i}', 'description': 'Benchmark event', 'location': 'Bench Hall',
+         'start_time': start + timedelta(hours=i), 'end_time': start + timedelta(hours=i + 1),
+         'is_published': True, 'publisher_id': publisher.id, 'attendee_count': 1}
+        for i in range(registrations)
+    ])
+    event_ids = [event_id for (event_id,) in db.session.query(Event.id)]
+    db.session.execute(event_attendees.insert(), [
+        {'user_id': attendee.id, 'event_id': event_id} for event_id in event_ids
+    ])
+    db.session.commit()
+    return attendee.id
+
+def eager_load_attendance(orm_execute_state):
+    """Reproduce the old lazy='subquery' loader on every User query"""
+    if (orm_execute_state.is_select and not orm_execute_state.is_relationship_load
+            and orm_execute_state.bind_mapper is User.__mapper__):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            subqueryload(User.events_attending)
+        )
+
+def measure(app, token, requests):
+    """Return (queries per request, mean milliseconds per request) for GET /api/auth/me"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    with app.app_context():
+        sa_event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            started = time.perf_counter()
+            for _ in range(requests):
+                response = client.get('/api/auth/me', headers=headers)
+                assert response.status_code == 200, response.data
+            elapsed = time.perf_counter() - started
+        finally:
+            sa_event.remove(db.engine, 'before_cursor_execute', count)
+
+    return len(statements) / requests, elapsed * 1000 / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--registrations', type=int, default=5000, help='events the benchmark user attends')
+    parser.add_argument('--requests', type=int, default=200, help='authenticated requests per run')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}"})
+        with app.app_context():
+            db.create_all()
+            user_id = seed(args.registrations)
+            token = create_access_token(identity=str(user_id))
+
+        after = measure(app, token, args.requests)
+
+        sa_event.listen(db.session, 'do_orm_execute', eager_load_attendance)
+        try:
+            before = measure(app, token, args.requests)
+        finally:
+            sa_event.remove(db.session, 'do_orm_execute', eager_load_attendance)
+
+    print(f"GET /api/auth/me for a user with {args.registrations} registrations ({args.requests} requests)")
+    print(f"  before (lazy='subquery'): {before[0]:.1f} queries/request, {before[1]:.2f} ms/request")
+    print(f"  after  (lazy='select'):   {after[0]:.1f} queries/request, {after[1]:.2f} ms/request")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Drive mixed HTTP traffic at a local gunicorn serving a seeded database (see bench.seed)
+and report latency percentiles and throughput per endpoint.
+
+    python -m bench.seed --users 100000 --events 50000 --registrations 2000000
+    python -m bench.load --duration 60 --concurrency 32 --output run.json
+    python -m bench.load --duration 60 --concurrency 32 --baseline run.json
+
+The server is started with --workers/--threads (gthread workers) unless --url points
+at one that is already running. Results are written as JSON; with --baseline the run
+is compared against an earlier result and the exit status is 1 if any endpoint's p95
+got worse by more than --max-regression percent.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from urllib.parse import urlencode, urlsplit
+from bench.search import CITIES, WORDS
+from bench.seed import DEFAULT_DATABASE, DEFAULT_PASSWORD, publisher_count, user_email
+
+# Relative frequency of each kind of request
+DEFAULT_MIX = {
+    'list_events': 40,
+    'list_events_filtered': 10,
+    'get_event': 20,
+    'search_events': 8,
+    'my_registrations': 5,
+    'register': 10,
+    'login': 3,
+    'update_event': 4,
+}
+
+class Client:
+    """Keep-alive HTTP connection for one load thread"""
+
+    def __init__(self, host, port, timeout=30):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {}
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            return response.status, response.read(), response.getheader('X-Next-Cursor')
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            self.conn = None
+            raise
+
+class Recorder:
+    """Latencies and status codes per endpoint, shared by all load threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.recording = False
+
+    def record(self, name, seconds, status):
+        if not self.recording:
+            return
+        with self.lock:
+            self.latencies[name].append(seconds)
+            self.statuses[name][str(status)] += 1
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of a sorted list"""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def summarize(latencies, statuses, elapsed):
+    ordered = sorted(latencies)
+    errors = sum(count for status, count in statuses.items() if status == 'error' or status.startswith('5'))
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput': round(len(ordered) / elapsed, 2),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 2),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 2),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 2),
+        'statuses': dict(statuses),
+    }
+
+class Workload:
+    """The requests a simulated user can make, against ids and tokens gathered at setup"""
+
+    def __init__(self, event_ids, user_sessions, publisher_sessions, users, password):
+        self.event_ids = event_ids
+        self.user_sessions = user_sessions  # [(user_id, token)]
+        self.publisher_sessions = publisher_sessions  # [(token, [event ids])]
+        self.users = users
+        self.password = password
+
+    def list_events(self, client, rng):
+        return client.request('GET', '/api/events/?limit=50')
+
+    def list_events_filtered(self, client, rng):
+        query = urlencode({'location': rng.choice(CITIES), 'from': '2025-06-01T00:00:00Z', 'limit': 50})
+        return client.request('GET', f'/api/events/?{query}')
+
+    def get_event(self, client, rng):
+        return client.request('GET', f'/api/events/{rng.choice(self.event_ids)}')
+
+    def search_events(self, client, rng):
+        return client.request('GET', '/api/events/search?' + urlencode({'q': rng.choice(WORDS)[:4]}))
+
+    def my_registrations(self, client, rng):
+        user_id, token = rng.choice(self.user_sessions)
+        return client.request('GET', '/api/events/my-registrations?limit=50', token=token)
+
+    def register(self, client, rng):
+        # Register, or unregister when already registered, so seats keep turning over
+        user_id, token = rng.choice(self.user_sessions)
+        event_id = rng.choice(self.event_ids)
+        result = client.request('POST', f'/api/events/{event_id}/register', token=token)
+        if result[0] == 400 and b'Already registered' in result[1]:
+            return client.request('DELETE', f'/api/events/{event_id}/unregister', token=token)
+        return result
+
+    def login(self, client, rng):
+        user_id = rng.randint(1, self.users)
+        return client.request('POST', '/api/auth/login', {'email': user_email(user_id), 'password': self.password})
+
+    def update_event(self, client, rng):
+        token, event_ids = rng.choice(self.publisher_sessions)
+        title = ' '.join(rng.sample(WORDS, 3)).title()
+        return client.request('PUT', f'/api/events/{rng.choice(event_ids)}', {'title': title}, token=token)
+
+def login(client, user_id, password):
+    status, body, _ = client.request('POST', '/api/auth/login', {'email': user_email(user_id), 'password': password})
+    if status != 200:
+        raise SystemExit(f'Could not log in as {user_email(user_id)}: {status} {body[:200]!r}')
+    return json.loads(body)['access_token']
+
+def collect_ids(client, path, limit, token=None):
+    """Walk a cursor-paginated event listing and return up to limit event ids"""
+    ids, cursor = [], None
+    while len(ids) < limit:
+        page_path = f'{path}?limit=200' + (f'&cursor={cursor}' if cursor else '')
+        status, body, cursor = client.request('GET', page_path, token=token)
+        if status != 200:
+            raise SystemExit(f'GET {page_path} failed: {status}')
+        ids.extend(event['id'] for event in json.loads(body))
+        if not cursor:
+            break
+    return ids[:limit]
+
+def prepare(client, args):
+    """Log in the simulated users and publishers and pick the events they will use"""
+    rng = random.Random(args.seed)
+    event_ids = collect_ids(client, '/api/events/', args.events_sample)
+    if not event_ids:
+        raise SystemExit('No published events: seed the database with bench.seed first')
+
+    user_ids = rng.sample(range(publisher_count(args.users) + 1, args.users + 1), args.sessions)
+    user_sessions = [(user_id, login(client, user_id, args.password)) for user_id in user_ids]
+
+    publisher_sessions = []
+    for publisher_id in range(1, min(args.publishers, publisher_count(args.users)) + 1):
+        token = login(client, publisher_id, args.password)
+        publisher_sessions.append((token, collect_ids(client, '/api/events/my-events', 200, token=token)))
+    return Workload(event_ids, user_sessions, publisher_sessions, args.users, args.password)
+
+def run_load(host, port, workload, mix, args, recorder):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    deadline = time.monotonic() + args.warmup + args.duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        client = Client(host, port)
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                status = getattr(workload, name)(client, rng)[0]
+            except (http.client.HTTPException, OSError):
+                status = 'error'
+            recorder.record(name, time.perf_counter() - started, status)
+
+    threads = [threading.Thread(target=worker, args=(args.seed + i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.warmup)
+    recorder.recording = True
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    recorder.recording = False
+    return time.perf_counter() - started
+
+def start_server(args, port):
+    """Start gunicorn on the seeded database and wait until it answers"""
+    env = dict(os.environ, FLASK_ENV=args.env, DATABASE_URL=args.database)
+    command = [
+        sys.executable, '-m', 'gunicorn', '--worker-class', 'gthread',
+        '--workers', str(args.workers), '--threads', str(args.threads),
+        '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'run:app',
+    ]
+    server = subprocess.Popen(command, env=env)
+    client = Client('127.0.0.1', port, timeout=5)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f'gunicorn exited with status {server.returncode}')
+        try:
+            if client.request('GET', '/api/events/?limit=1')[0] == 200:
+                return server
+        except (http.client.HTTPException, OSError):
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit('gunicorn did not start within 30 seconds')
+
+def parse_mix(text):
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, text.split(',')):
+        name, _, weight = item.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'unknown request type {name!r}')
+        mix[name] = float(weight)
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+def compare(result, baseline, max_regression):
+    """Print the change from a baseline run; return the endpoints whose p95 regressed too much"""
+    regressions = []
+    print(f"\nCompared with baseline from {baseline['started_at']}:")
+    print(f"{'endpoint':24} {'p50':>16} {'p95':>16} {'p99':>16} {'req/s':>16}")
+    for name, now in result['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput'):
+            change = (now[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            cells.append(f'{now[key]:8.1f} {change:+6.1f}%')
+        print(f'{name:24} ' + ' '.join(cells))
+        if before['p95_ms'] and (now['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 > max_regression:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='benchmark an already running server instead of starting gunicorn')
+    parser.add_argument('--database', default=DEFAULT_DATABASE, help='database URL for the started server')
+    parser.add_argument('--env', default='production', help='FLASK_ENV of the started server')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--workers', type=int, default=3, help='gunicorn worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads sending requests')
+    parser.add_argument('--duration', type=float, default=30, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=5, help='unmeasured seconds before measuring')
+    parser.add_argument('--mix', type=parse_mix, default=dict(DEFAULT_MIX),
+                        help='request weights, e.g. "login=0,register=20" (others keep their defaults)')
+    parser.add_argument('--users', type=int, default=100000, help='number of seeded users')
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='password of the seeded users')
+    parser.add_argument('--sessions', type=int, default=50, help='users logged in before the run')
+    parser.add_argument('--publishers', type=int, default=5, help='publishers logged in before the run')
+    parser.add_argument('--events-sample', type=int, default=2000, help='published events to request')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=10.0, help='allowed p95 increase in percent')
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        host, port = '127.0.0.1', args.port
+        server = start_server(args, port)
+
+    try:
+        workload = prepare(Client(host, port), args)
+        recorder = Recorder()
+        elapsed = run_load(host, port, workload, args.mix, args, recorder)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    all_latencies = [seconds for latencies in recorder.latencies.values() for seconds in latencies]
+    all_statuses = sum(recorder.statuses.values(), Counter())
+    if not all_latencies:
+        raise SystemExit('No requests completed')
+    result = {
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'config': {key: getattr(args, key) for key in (
+            'url', 'database', 'env', 'workers', 'threads', 'concurrency', 'duration', 'warmup', 'mix', 'sessions'
+        )},
+        'elapsed': round(elapsed, 2),
+        'total': summarize(all_latencies, all_statuses, elapsed),
+        'endpoints': {
+            name: summarize(recorder.latencies[name], recorder.statuses[name], elapsed)
+            for name in sorted(recorder.latencies)
+        },
+    }
+
+    print(f"{'endpoint':24} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in list(result['endpoints'].items()) + [('total', result['total'])]:
+        print(f"{name:24} {stats['requests']:9} {stats['errors']:7} {stats['throughput']:9.1f} "
+              f"{stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} {stats['p99_ms']:9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.max_regression)
+        if regressions:
+            print(f"\np95 regressed by more than {args.max_regression}%: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
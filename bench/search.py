@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Compare the indexed full-text search against an unindexed LIKE scan on a large
+SQLite events table.
+
+    python -m bench.search --events 100000 --queries 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models import User, Event, UserRole
+from app.services.search import _fallback_search, search_events
+
+# Vocabulary of ~8000 made-up words so terms are about as selective as real text
+SYLLABLES = ('ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'ze', 'pa', 'do', 'fi', 'gu', 'he', 'ja', 'ba',
+             'co', 'de', 'xu', 'yo')
+WORDS = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+CITIES = ('Berlin', 'Istanbul', 'Lisbon', 'Toronto', 'Nairobi', 'Osaka', 'Lima', 'Oslo')
+
+def seed(events, batch_size=10000):
+    """Bulk insert published events with random titles and descriptions"""
+    publisher = User(username='bench_publisher', email='bench_publisher@example.com',
+                     password='password', role=UserRole.PUBLISHER)
+    db.session.add(publisher)
+    db.session.commit()
+
+    rng = random.Random(42)
+    start = datetime(2025, 1, 1, 9, 0)
+    for offset in range(0, events, batch_size):
+        db.session.execute(Event.__table__.insert(), [
+            {'title': ' '.join(rng.sample(WORDS, 3)).title(),
+             'description': ' '.join(rng.choices(WORDS, k=40)),
+             'location': rng.choice(CITIES),
+             'start_time': start + timedelta(minutes=i), 'end_time': start + timedelta(minutes=i + 90),
+             'is_published': True, 'publisher_id': publisher.id}
+            for i in range(offset, min(offset + batch_size, events))
+        ])
+        db.session.commit()
+
+def timed(build_query, queries, limit):
+    """Mean milliseconds to fetch the first page of results for each query"""
+    started = time.perf_counter()
+    for text in queries:
+        build_query(text).filter(Event.is_published == True).limit(limit).all()
+    return (time.perf_counter() - started) * 1000 / len(queries)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50, help='search requests per strategy')
+    parser.add_argument('--limit', type=int, default=50, help='results per page')
+    args = parser.parse_args()
+
+    # Mix single words, prefixes and two-word queries
+    rng = random.Random(7)
+    queries = []
+    for i in range(args.queries):
+        word = rng.choice(WORDS)
+        queries.append([word, word[:4], f'{word} {rng.choice(WORDS)[:3]}'][i % 3])
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'BCRYPT_LOG_ROUNDS': 4,
+            'PASSWORD_HASH_WORKERS': 0,
+        })
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            seed(args.events)
+            print(f"Seeded {args.events} events (indexed by triggers) in {time.perf_counter() - started:.1f}s")
+
+            fts = timed(search_events, queries, args.limit)
+            scan = timed(lambda text: _fallback_search(text.split()), queries, args.limit)
+
+    print(f"Full-text index (FTS5, ranked): {fts:8.2f} ms/query")
+    print(f"LIKE scan (unranked):           {scan:8.2f} ms/query")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Fill a database with synthetic users, events and registrations for benchmarks.
+
+Rows are bulk inserted in batches with explicit ids. Every user shares one password
+that is hashed once up front, so seeding does not spend its time in bcrypt:
+
+    python -m bench.seed --users 100000 --events 50000 --registrations 2000000
+
+Users are bench_user<N>@example.com (N from 1); the first 1% are publishers. The
+database defaults to instance/bench.db, the one bench.load serves.
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models import User, Event, UserRole, event_attendees
+from app.services.passwords import hash_password
+from bench.search import CITIES, WORDS
+
+DEFAULT_DATABASE = 'sqlite:///' + os.path.abspath(os.path.join('instance', 'bench.db'))
+DEFAULT_PASSWORD = 'bench-password'
+
+def user_email(user_id):
+    return f'bench_user{user_id}@example.com'
+
+def publisher_count(users):
+    return max(1, users // 100)
+
+def batched(rows, batch_size):
+    """Group an iterable of rows into lists of at most batch_size"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def insert_rows(table, rows, batch_size):
+    """Insert rows with executemany, committing batch by batch, and report the rate"""
+    started = time.perf_counter()
+    total = 0
+    for batch in batched(rows, batch_size):
+        db.session.execute(table.insert(), batch)
+        db.session.commit()
+        total += len(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  {table.name}: {total} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} rows/s)")
+
+def user_rows(users, password_hash):
+    publishers = publisher_count(users)
+    for user_id in range(1, users + 1):
+        yield {
+            'id': user_id,
+            'username': f'bench_user{user_id}',
+            'email': user_email(user_id),
+            'password_hash': password_hash,
+            'role': UserRole.PUBLISHER if user_id <= publishers else UserRole.USER,
+        }
+
+def registration_counts(events, published, registrations):
+    """Spread the registrations evenly over the published events"""
+    counts = [0] * events
+    if published:
+        base, extra = divmod(registrations, len(published))
+        for position, index in enumerate(published):
+            counts[index] = base + (1 if position < extra else 0)
+    return counts
+
+def event_rows(events, users, counts, rng):
+    publishers = publisher_count(users)
+    start = datetime(2025, 1, 1, 9, 0)
+    for index in range(events):
+        starts_at = start + timedelta(minutes=30 * index)
+        # A mix of unlimited, exactly full and partly full events
+        spare = rng.choice((None, 0, 10, 50, 200))
+        yield {
+            'id': index + 1,
+            'title': ' '.join(rng.sample(WORDS, 3)).title(),
+            'description': ' '.join(rng.choices(WORDS, k=40)),
+            'location': rng.choice(CITIES),
+            'start_time': starts_at,
+            'end_time': starts_at + timedelta(hours=2),
+            'capacity': None if spare is None else counts[index] + spare,
+            'is_published': index % 10 != 9,
+            'attendee_count': counts[index],
+            'publisher_id': index % publishers + 1,
+        }
+
+def registration_rows(users, counts, rng):
+    registered = datetime(2024, 6, 1)
+    for index, count in enumerate(counts):
+        # Consecutive user ids from a per-event offset: distinct within each event
+        offset = index * 7919
+        for j in range(count):
+            yield {
+                'user_id': (offset + j) % users + 1,
+                'event_id': index + 1,
+                'registered_at': registered + timedelta(seconds=rng.randrange(180 * 24 * 3600)),
+            }
+
+def reset_sequences():
+    """Move Postgres id sequences past the explicit ids inserted above"""
+    if db.engine.dialect.name == 'postgresql':
+        for table in ('users', 'events'):
+            db.session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+            ))
+        db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=DEFAULT_DATABASE, help='SQLAlchemy database URL')
+    parser.add_argument('--env', default='production', help='FLASK_ENV whose settings (bcrypt cost) to use')
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--events', type=int, default=50000)
+    parser.add_argument('--registrations', type=int, default=2000000)
+    parser.add_argument('--password', default=DEFAULT_PASSWORD, help='password of every seeded user')
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=42, help='random seed')
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables first')
+    args = parser.parse_args()
+
+    published = [index for index in range(args.events) if index % 10 != 9]
+    if published and -(-args.registrations // len(published)) > args.users:
+        parser.error('not enough users for that many registrations per event')
+
+    if args.database.startswith('sqlite:///'):
+        os.makedirs(os.path.dirname(os.path.abspath(args.database[len('sqlite:///'):])), exist_ok=True)
+    os.environ['FLASK_ENV'] = args.env
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database, 'PASSWORD_HASH_WORKERS': 0})
+
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+        db.create_all()
+        if db.session.query(User.query.exists()).scalar():
+            parser.error('the database already has users, pass --reset to start over')
+
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        password_hash = hash_password(args.password)
+        counts = registration_counts(args.events, published, args.registrations)
+
+        print(f"Seeding {args.database}")
+        insert_rows(User.__table__, user_rows(args.users, password_hash), args.batch_size)
+        insert_rows(Event.__table__, event_rows(args.events, args.users, counts, rng), args.batch_size)
+        insert_rows(event_attendees, registration_rows(args.users, counts, rng), args.batch_size)
+        reset_sequences()
+        print(f"Done in {time.perf_counter() - started:.1f}s; every user's password is {args.password!r}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Serialization throughput for event listings: Flask's default JSON provider against
+the orjson-backed provider, cold and with every event's encoding already cached.
+
+    python -m bench.serialization --events 10000 --rounds 20
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from app.models import Event
+from app.services.serialization import encode_event
+from app.utils import json_provider
+from app.utils.json_provider import json_array
+
+def build_events(count):
+    """Published events in memory only; serializing them runs no queries"""
+    start = datetime(2025, 1, 1, 9, 0)
+    events = []
+    for i in range(count):
+        event = Event(id=i + 1, title=f'Benchmark Event {i}', description='Serialization benchmark ' * 8,
+                      location='Bench Hall', start_time=start + timedelta(hours=i),
+                      end_time=start + timedelta(hours=i + 2), capacity=500, is_published=True,
+                      ticket_price=12.5, publisher_id=1, attendee_count=i % 500,
+                      created_at=start, updated_at=start + timedelta(seconds=i))
+        events.append(event)
+    return events
+
+def measure(encode, events, rounds):
+    """Best events/second over the rounds, and the size of one encoding"""
+    size = len(encode(events))
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        encode(events)
+        best = min(best, time.perf_counter() - started)
+    return len(events) / best, best * 1000, size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+                      'EVENT_JSON_CACHE_SIZE': args.events})
+    events = build_events(args.events)
+    default_provider = DefaultJSONProvider(app)
+
+    with app.app_context():
+        strategies = [
+            ('Flask default provider', lambda items: default_provider.dumps([e.to_dict() for e in items])),
+            ('orjson provider' if json_provider.orjson else 'json module provider',
+             lambda items: app.json.dumps_bytes([e.to_dict() for e in items])),
+            ('cached encodings (warm)', lambda items: json_array(encode_event(e) for e in items)),
+        ]
+        print(f"Serializing {args.events} events, best of {args.rounds} rounds:")
+        for name, encode in strategies:
+            rate, elapsed, size = measure(encode, events, args.rounds)
+            print(f"  {name:26} {elapsed:8.2f} ms  {rate:12,.0f} events/s  ({size / 1024:.0f} KiB)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Measure peak Python memory while reading every attendee of events of increasing size,
+from the GET /api/events/<id>/attendees.csv export and by following X-Next-Cursor
+through the pages of GET /api/events/<id>/attendees. With the streaming serializers
+the peak should stay roughly flat.
+
+    python -m bench.streaming_memory --sizes 100 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event, UserRole, event_attendees
+from app.utils.pagination import MAX_PAGE_SIZE
+
+def seed_event(publisher_id, attendees, first_user_id):
+    """Create an event with the given number of attendees (users inserted in bulk)"""
+    event = Event(title=f'Event with {attendees} attendees', description='Streaming benchmark',
+                  location='Bench Hall', start_time=datetime(2025, 1, 1, 9), end_time=datetime(2025, 1, 1, 17),
+                  is_published=True, publisher_id=publisher_id, attendee_count=attendees)
+    db.session.add(event)
+    db.session.flush()
+
+    user_ids = range(first_user_id, first_user_id + attendees)
+    db.session.execute(User.__table__.insert(), [
+        {'id': user_id, 'username': f'attendee{user_id}', 'email': f'attendee{user_id}@example.com',
+         'password_hash': 'unused', 'role': UserRole.USER}
+        for user_id in user_ids
+    ])
+    db.session.execute(event_attendees.insert(), [
+        {'user_id': user_id, 'event_id': event.id} for user_id in user_ids
+    ])
+    db.session.commit()
+    return event.id
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 10000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            'BCRYPT_LOG_ROUNDS': 4,
+            'PASSWORD_HASH_WORKERS': 0,
+        })
+        with app.app_context():
+            db.create_all()
+            publisher = User(username='bench_publisher', email='bench_publisher@example.com',
+                             password='password', role=UserRole.PUBLISHER)
+            db.session.add(publisher)
+            db.session.commit()
+            token = create_access_token(identity=str(publisher.id))
+
+            events = []
+            next_user_id = publisher.id + 1
+            for size in args.sizes:
+                events.append((size, seed_event(publisher.id, size, next_user_id)))
+                next_user_id += size
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        for size, event_id in events:
+            for label, read in (('csv', read_csv), ('pages', read_pages)):
+                tracemalloc.start()
+                started = time.perf_counter()
+                body_bytes, requests = read(client, event_id, headers)
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print(f"{size:>8} attendees, {label:>5}: {body_bytes / 1e6:8.2f} MB in {requests:>4} requests, "
+                      f"{elapsed:6.2f}s, peak Python memory {peak / 1e6:6.2f} MB")
+
+def read_csv(client, event_id, headers):
+    """Stream the whole CSV export; returns (bytes, requests)"""
+    response = client.get(f'/api/events/{event_id}/attendees.csv', headers=headers, buffered=False)
+    return sum(len(chunk) for chunk in response.response), 1
+
+def read_pages(client, event_id, headers):
+    """Follow X-Next-Cursor through every page of the attendee list; returns (bytes, requests)"""
+    body_bytes, requests, params = 0, 0, {'limit': MAX_PAGE_SIZE}
+    while True:
+        response = client.get(f'/api/events/{event_id}/attendees', headers=headers,
+                              query_string=params, buffered=False)
+        body_bytes += sum(len(chunk) for chunk in response.response)
+        requests += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return body_bytes, requests
+        params['cursor'] = cursor
+
+if __name__ == '__main__':
+    main()
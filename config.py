@@ -8,13 +8,70 @@ class Config:
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Embed the user's role in tokens so role checks need no database lookup
+    JWT_ROLE_CLAIMS = os.environ.get('JWT_ROLE_CLAIMS', 'false').lower() == 'true'
+    # Password hashing: bcrypt cost, worker processes (0 = hash on the request thread)
+    # and the number of hashing jobs allowed in flight before requests get a 503
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_IN_FLIGHT = int(os.environ.get('PASSWORD_HASH_MAX_IN_FLIGHT', 8))
+    # Cache for anonymous event reads: 'memory' (per process), 'sqlite' (shared by all
+    # workers, stored at RESPONSE_CACHE_PATH or in the instance folder) or 'null'
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    # Encoded JSON of this many published events is kept in memory per process
+    EVENT_JSON_CACHE_SIZE = int(os.environ.get('EVENT_JSON_CACHE_SIZE', 4096))
+    # Seat holds: seconds a held seat stays reserved before it is released unless
+    # confirmed, and whether a background thread releases them at their deadline
+    SEAT_HOLD_TTL = int(os.environ.get('SEAT_HOLD_TTL', 120))
+    SEAT_HOLD_SWEEPER = os.environ.get('SEAT_HOLD_SWEEPER', 'true').lower() == 'true'
+    # Admission gate in front of registration and seat holds: ADMISSION_BACKEND keeps which
+    # events are known to be full in 'memory' (per process), 'sqlite' (shared by all
+    # workers, stored at ADMISSION_PATH or in the instance folder) or 'null' (gate off).
+    # At most ADMISSION_MAX_IN_FLIGHT attempts per event run at once; the rest get a 429
+    ADMISSION_BACKEND = os.environ.get('ADMISSION_BACKEND', 'memory')
+    ADMISSION_PATH = os.environ.get('ADMISSION_PATH')
+    ADMISSION_STATE_TTL = int(os.environ.get('ADMISSION_STATE_TTL', 5))
+    ADMISSION_MAX_IN_FLIGHT = int(os.environ.get('ADMISSION_MAX_IN_FLIGHT', 16))
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 1))
+    # Idempotency-Key support: responses are replayed for IDEMPOTENCY_TTL seconds; an
+    # unfinished request holds its key for at most IDEMPOTENCY_LOCK_TIMEOUT seconds and
+    # duplicates wait up to IDEMPOTENCY_WAIT_TIMEOUT seconds for its response
+    IDEMPOTENCY_TTL = int(os.environ.get('IDEMPOTENCY_TTL', 24 * 3600))
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.environ.get('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+    IDEMPOTENCY_WAIT_TIMEOUT = int(os.environ.get('IDEMPOTENCY_WAIT_TIMEOUT', 10))
+    IDEMPOTENCY_PRUNE_INTERVAL = int(os.environ.get('IDEMPOTENCY_PRUNE_INTERVAL', 300))
+    # Bulk user imports (`flask users import`, /api/users/bulk): rows committed per chunk,
+    # processes hashing their passwords (0 = inline) and whether each email domain is
+    # checked for deliverability (one DNS lookup per distinct domain)
+    USER_IMPORT_CHUNK_SIZE = int(os.environ.get('USER_IMPORT_CHUNK_SIZE', 1000))
+    USER_IMPORT_HASH_WORKERS = int(os.environ.get('USER_IMPORT_HASH_WORKERS', os.cpu_count() or 1))
+    USER_IMPORT_CHECK_DELIVERABILITY = os.environ.get('USER_IMPORT_CHECK_DELIVERABILITY', 'false').lower() == 'true'
+    # Most rows accepted by one bulk attendee import
+    BULK_ATTENDEES_MAX_ROWS = int(os.environ.get('BULK_ATTENDEES_MAX_ROWS', 10000))
+    # Request metrics served on /metrics (set PROMETHEUS_MULTIPROC_DIR under gunicorn)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    # JSON logs written by a background thread. LOG_SAMPLE_RATES keeps only a fraction of
+    # the records of noisy levels; LOG_DEBUG_ENABLED = False drops debug records outright
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_DEBUG_ENABLED = os.environ.get('LOG_DEBUG_ENABLED', 'true').lower() == 'true'
+    LOG_SAMPLE_RATES = {'DEBUG': float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 0.1))}
 
 class DevelopmentConfig(Config):
     DEBUG = True
+    # Log a warning when a request lazy-loads a relationship once per row (N+1)
+    QUERY_DEBUG = os.environ.get('QUERY_DEBUG', 'true').lower() == 'true'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'DEBUG')
+    LOG_SAMPLE_RATES = {'DEBUG': float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 1.0))}
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 10))
 
 class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -22,6 +79,11 @@ class ProductionConfig(Config):
     # Use the values from Config class - don't override to None if not set
     # Additional production settings
     PREFERRED_URL_SCHEME = 'https'
+    # gunicorn runs several workers, so share one cache and admission state between them
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'sqlite')
+    ADMISSION_BACKEND = os.environ.get('ADMISSION_BACKEND', 'sqlite')
+    # Debug logging is never enabled in production
+    LOG_DEBUG_ENABLED = False
     SESSION_COOKIE_SECURE = True
     REMEMBER_COOKIE_SECURE = True
 
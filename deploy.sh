@@ -42,7 +42,7 @@ After=network.target
 User=$USER
 WorkingDirectory=$(pwd)
 Environment="FLASK_ENV=production"
-ExecStart=$(which gunicorn) --workers 3 --bind 0.0.0.0:5001 --timeout 120 'run:app'
+ExecStart=$(which gunicorn) --config gunicorn.conf.py 'run:app'
 Restart=always
 
 [Install]
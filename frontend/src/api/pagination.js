@@ -0,0 +1,32 @@
+import API from './axios';
+
+// Largest page the API serves, so whole lists take as few requests as possible
+export const MAX_PAGE_SIZE = 200;
+
+/**
+ * Fetch one page of a cursor-paginated list
+ * @param {string} url - The list endpoint
+ * @param {string|null} cursor - The cursor of the page, or null for the first page
+ * @param {Object} params - Extra query parameters
+ * @returns {Promise<{items: Array, nextCursor: string|null}>} - The page and the cursor of the next one
+ */
+export const fetchPage = async (url, cursor = null, params = {}) => {
+  const response = await API.get(url, { params: cursor ? { ...params, cursor } : params });
+  return { items: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+};
+
+/**
+ * Fetch every page of a cursor-paginated list by following X-Next-Cursor
+ * @param {string} url - The list endpoint
+ * @returns {Promise<Array>} - All the items of the list
+ */
+export const fetchAllPages = async (url) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const page = await fetchPage(url, cursor, { limit: MAX_PAGE_SIZE });
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+};
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useContext } from 'react';
 import { Link } from 'react-router-dom';
 import API from '../api/axios';
+import { fetchAllPages } from '../api/pagination';
 import { AuthContext } from '../context/AuthContext';
 
 const AdminDashboard = () => {
@@ -27,12 +28,12 @@ const AdminDashboard = () => {
         setError(null);
 
         // Fetch all data in parallel
-        const [eventsResponse, usersResponse] = await Promise.all([
-          API.get('/api/events/all/'),
+        const [allEvents, usersResponse] = await Promise.all([
+          fetchAllPages('/api/events/all/'),
           API.get('/api/users/'),
         ]);
 
-        setEvents(eventsResponse.data);
+        setEvents(allEvents);
         setUsers(usersResponse.data);
       } catch (err) {
         console.error('Error fetching admin data:', err);
@@ -23,20 +23,16 @@ const EventDetails = () => {
         const token = localStorage.getItem('token');
         const headers = token ? { Authorization: `Bearer ${token}` } : {};
         
-        // Fetch the event details
-        const response = await API.get(`/api/events/${eventId}`, { headers });
+        // Fetch the event details, with the user's registration status in the same request
+        const response = await API.get(`/api/events/${eventId}`, {
+          headers,
+          params: { include: 'registration_status' }
+        });
         setEvent(response.data);
         
-        // If user is authenticated, check if they're registered for this event
+        // registration_status is null for anonymous visitors
         if (currentUser && !isPublisher(currentUser) && !isAdmin(currentUser)) {
-          try {
-            const registrationsResponse = await API.get('/api/events/my-registrations/', { headers });
-            const userRegistrations = registrationsResponse.data;
-            const isRegistered = userRegistrations.some(reg => reg.id === parseInt(eventId));
-            setIsRegistered(isRegistered);
-          } catch (err) {
-            console.error("Failed to check registration status:", err);
-          }
+          setIsRegistered(Boolean(response.data.registration_status?.registered));
         }
       } catch (err) {
         setError(err.response?.data?.message || 'Failed to load event details');
@@ -1,17 +1,20 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import API from '../api/axios';
+import { fetchPage } from '../api/pagination';
 
 const EventsPage = () => {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     const fetchEvents = async () => {
       try {
-        const response = await API.get('/api/events/');
-        setEvents(response.data);
+        const page = await fetchPage('/api/events/');
+        setEvents(page.items);
+        setNextCursor(page.nextCursor);
       } catch (err) {
         setError('Failed to load events. Please try again later.');
         console.error(err);
@@ -23,6 +26,20 @@ const EventsPage = () => {
     fetchEvents();
   }, []);
 
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const page = await fetchPage('/api/events/', nextCursor);
+      setEvents([...events, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError('Failed to load more events. Please try again later.');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const formatDateTime = (dateTimeStr) => {
     const date = new Date(dateTimeStr);
     return date.toLocaleString();
@@ -82,6 +99,14 @@ const EventsPage = () => {
           ))}
         </div>
       )}
+
+      {nextCursor && (
+        <div className="text-center mb-4">
+          <button className="btn btn-outline-primary" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load More Events'}
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import API from '../api/axios';
+import { fetchAllPages } from '../api/pagination';
 
 const MyEvents = () => {
   const [events, setEvents] = useState([]);
@@ -10,8 +10,7 @@ const MyEvents = () => {
   useEffect(() => {
     const fetchMyEvents = async () => {
       try {
-        const response = await API.get('/api/events/my-events/');
-        setEvents(response.data);
+        setEvents(await fetchAllPages('/api/events/my-events/'));
       } catch (err) {
         setError('Failed to load your events. Please try again later.');
         console.error(err);
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import API from '../api/axios';
+import { fetchAllPages } from '../api/pagination';
 
 const MyRegistrations = () => {
   const [events, setEvents] = useState([]);
@@ -11,8 +12,7 @@ const MyRegistrations = () => {
   useEffect(() => {
     const fetchMyRegistrations = async () => {
       try {
-        const response = await API.get('/api/events/my-registrations/');
-        setEvents(response.data);
+        setEvents(await fetchAllPages('/api/events/my-registrations/'));
       } catch (err) {
         setError('Failed to load your registrations. Please try again later.');
         console.error(err);
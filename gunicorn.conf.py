@@ -0,0 +1,21 @@
+import os
+import shutil
+
+# Gunicorn settings for the event manager service (used by deploy.sh)
+bind = '0.0.0.0:5001'
+workers = 3
+timeout = 120
+
+# Workers write their metrics to files in this directory and /metrics merges them
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'prometheus'))
+
+def on_starting(server):
+    # Start from empty files so samples of a previous run are not reported again
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+def child_exit(server, worker):
+    # Drop the live gauges of the dead worker; its counters and histograms are kept
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,32 @@
+"""Add denormalized attendee_count to events
+
+Revision ID: 3c9d1f6b2e47
+Revises: a5e4eb892a53
+Create Date: 2026-10-18 09:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9d1f6b2e47'
+down_revision = 'a5e4eb892a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attendee_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill the counter from the existing registrations
+    op.execute(
+        'UPDATE events SET attendee_count = '
+        '(SELECT COUNT(*) FROM event_attendees WHERE event_attendees.event_id = events.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('attendee_count')
@@ -0,0 +1,33 @@
+"""Add event waitlist
+
+Revision ID: 5d7c2b9e4f18
+Revises: e8a3d6f0b214
+Create Date: 2026-10-18 15:02:37.418265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d7c2b9e4f18'
+down_revision = 'e8a3d6f0b214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('event_waitlist',
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('joined_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('event_id', 'position'),
+    sa.UniqueConstraint('event_id', 'user_id', name='uq_event_waitlist_event_user')
+    )
+
+
+def downgrade():
+    op.drop_table('event_waitlist')
@@ -0,0 +1,26 @@
+"""Add token_version to users
+
+Revision ID: 7b2e4a9c1d05
+Revises: 3c9d1f6b2e47
+Create Date: 2026-10-18 10:04:52.117630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4a9c1d05'
+down_revision = '3c9d1f6b2e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('token_version')
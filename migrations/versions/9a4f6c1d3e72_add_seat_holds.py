@@ -0,0 +1,47 @@
+"""Add seat holds and held_count to events
+
+Revision ID: 9a4f6c1d3e72
+Revises: 5d7c2b9e4f18
+Create Date: 2026-10-18 16:40:12.905137
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4f6c1d3e72'
+down_revision = '5d7c2b9e4f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('held_count', sa.Integer(), server_default='0', nullable=False))
+
+    op.create_table('seat_holds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'user_id', name='uq_seat_holds_event_user')
+    )
+    with op.batch_alter_table('seat_holds', schema=None) as batch_op:
+        batch_op.create_index('ix_seat_holds_event_expires_at', ['event_id', 'expires_at'], unique=False)
+        batch_op.create_index('ix_seat_holds_expires_at', ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('seat_holds', schema=None) as batch_op:
+        batch_op.drop_index('ix_seat_holds_expires_at')
+        batch_op.drop_index('ix_seat_holds_event_expires_at')
+
+    op.drop_table('seat_holds')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('held_count')
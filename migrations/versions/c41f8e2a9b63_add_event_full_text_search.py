@@ -0,0 +1,66 @@
+"""Add full-text search index over events
+
+Revision ID: c41f8e2a9b63
+Revises: 7b2e4a9c1d05
+Create Date: 2026-10-18 11:37:05.283941
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f8e2a9b63'
+down_revision = '7b2e4a9c1d05'
+branch_labels = None
+depends_on = None
+
+
+# The DDL as of this revision, kept here so later changes to app.services.search
+# cannot alter what this migration does
+SQLITE_INDEX_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5("
+    "title, description, location, content='events', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN "
+    "INSERT INTO events_fts (rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN "
+    "INSERT INTO events_fts (events_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); END",
+    "CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF title, description, location ON events BEGIN "
+    "INSERT INTO events_fts (events_fts, rowid, title, description, location) "
+    "VALUES ('delete', old.id, old.title, old.description, old.location); "
+    "INSERT INTO events_fts (rowid, title, description, location) "
+    "VALUES (new.id, new.title, new.description, new.location); END",
+]
+
+POSTGRES_INDEX_DDL = [
+    "ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_INDEX_DDL:
+            op.execute(statement)
+        # Index the events that already exist
+        op.execute("INSERT INTO events_fts (events_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_INDEX_DDL:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS events_fts_update')
+        op.execute('DROP TRIGGER IF EXISTS events_fts_delete')
+        op.execute('DROP TRIGGER IF EXISTS events_fts_insert')
+        op.execute('DROP TABLE IF EXISTS events_fts')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_events_search_vector')
+        op.execute('ALTER TABLE events DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,33 @@
+"""Backfill event_attendees.registered_at and make it NOT NULL
+
+Revision ID: d2f6a8c4b519
+Revises: b7e1f0a92c35
+Create Date: 2026-10-18 16:21:07.584301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6a8c4b519'
+down_revision = 'b7e1f0a92c35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Registrations from before the timestamp was recorded sort first, as NULLs did;
+    # the attendee pagination cursor needs a value for every row
+    op.execute(
+        "UPDATE event_attendees SET registered_at = '1970-01-01 00:00:00.000000' "
+        "WHERE registered_at IS NULL"
+    )
+
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.alter_column('registered_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.alter_column('registered_at', existing_type=sa.DateTime(), nullable=True)
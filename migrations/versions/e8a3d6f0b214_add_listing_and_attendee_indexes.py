@@ -0,0 +1,45 @@
+"""Add indexes for event listings, attendee and publisher lookups
+
+Revision ID: e8a3d6f0b214
+Revises: c41f8e2a9b63
+Create Date: 2026-10-18 12:21:48.660372
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a3d6f0b214'
+down_revision = 'c41f8e2a9b63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.create_index('ix_events_published_start_time', ['is_published', 'start_time', 'id'], unique=False)
+        batch_op.create_index('ix_events_published_updated_at', ['is_published', 'updated_at'], unique=False)
+        batch_op.create_index('ix_events_publisher_start_time', ['publisher_id', 'start_time', 'id'], unique=False)
+        batch_op.create_index('ix_events_start_time', ['start_time', 'id'], unique=False)
+
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.create_index('ix_event_attendees_event_registered_at', ['event_id', 'registered_at', 'user_id'], unique=False)
+        batch_op.create_index('ix_event_attendees_user_registered_at', ['user_id', 'registered_at', 'event_id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_role'), ['role'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_role'))
+
+    with op.batch_alter_table('event_attendees', schema=None) as batch_op:
+        batch_op.drop_index('ix_event_attendees_user_registered_at')
+        batch_op.drop_index('ix_event_attendees_event_registered_at')
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_index('ix_events_start_time')
+        batch_op.drop_index('ix_events_publisher_start_time')
+        batch_op.drop_index('ix_events_published_updated_at')
+        batch_op.drop_index('ix_events_published_start_time')
@@ -1,14 +1,21 @@
 import pytest
+from contextlib import contextmanager
+from datetime import datetime
 from app import create_app, db
 from app.models import User, Event, UserRole
+from app.utils.query_tracking import track_queries
 
 @pytest.fixture
 def app():
     """Create and configure a Flask app for testing."""
-    app = create_app()
-    app.config.update({
+    app = create_app({
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'BCRYPT_LOG_ROUNDS': 4,
+        'PASSWORD_HASH_WORKERS': 0,
+        'USER_IMPORT_HASH_WORKERS': 0,
+        # The in-memory database has a single connection; tests run the sweeper by hand
+        'SEAT_HOLD_SWEEPER': False,
     })
 
     # Create the database and load test data
@@ -28,8 +35,8 @@ def app():
             title='Test Event 1',
             description='Description for test event 1',
             location='Test Location 1',
-            start_time='2023-12-01T12:00:00',
-            end_time='2023-12-01T15:00:00',
+            start_time=datetime.fromisoformat('2023-12-01T12:00:00'),
+            end_time=datetime.fromisoformat('2023-12-01T15:00:00'),
             capacity=100,
             is_published=True,
             publisher_id=publisher.id
@@ -39,8 +46,8 @@ def app():
             title='Test Event 2',
             description='Description for test event 2',
             location='Test Location 2',
-            start_time='2023-12-15T12:00:00',
-            end_time='2023-12-15T15:00:00',
+            start_time=datetime.fromisoformat('2023-12-15T12:00:00'),
+            end_time=datetime.fromisoformat('2023-12-15T15:00:00'),
             capacity=50,
             is_published=False,
             publisher_id=publisher.id
@@ -50,7 +57,7 @@ def app():
         db.session.commit()
         
         # Register user for event1
-        event1.attendees.append(user)
+        event1.register_user(user)
         db.session.commit()
 
     yield app
@@ -90,4 +97,18 @@ def user_token(client):
         'email': 'user@test.com',
         'password': 'password'
     })
-    return response.json['access_token'] 
\ No newline at end of file
+    return response.json['access_token'] 
+
+@pytest.fixture
+def query_budget(app):
+    """
+    Context manager failing the test if the block runs more than max_queries SQL
+    statements or lazy-loads a relationship once per row (N+1).
+    """
+    @contextmanager
+    def budget(max_queries):
+        with track_queries(app) as tracker:
+            yield tracker
+        assert len(tracker) <= max_queries, tracker.report()
+        assert not tracker.n_plus_one(), tracker.report()
+    return budget
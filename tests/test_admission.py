@@ -0,0 +1,90 @@
+import json
+from app import db
+from app.models import Event
+from app.services.admission import AdmissionDecision, SQLiteAdmissionState, get_gate
+
+def _auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+def _fill_event(app, event_id=1):
+    """Cut the event's capacity to the one seat the fixture user holds."""
+    with app.app_context():
+        db.session.execute(db.update(Event).where(Event.id == event_id).values(capacity=1))
+        db.session.commit()
+
+def test_known_full_event_rejected_by_gate(client, app, user_token, admin_token):
+    """Test that once an event is known to be full, attempts skip the database."""
+    _fill_event(app)
+    gate = get_gate(app)
+
+    # Taking the last seat tells the gate the event is full
+    client.delete('/api/events/1/unregister', headers=_auth(user_token))
+    response = client.post('/api/events/1/register', headers=_auth(user_token))
+    assert response.status_code == 200
+    assert gate.state.get(1) == (True, 0)
+
+    response = client.post('/api/events/1/hold', headers=_auth(user_token))
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Event is at full capacity'
+
+    response = client.get('/api/events/admission-stats', headers=_auth(admin_token))
+    stats = json.loads(response.data)
+    assert stats['backend'] == 'memory'
+    assert stats['rejected'] == 1
+    assert stats['accepted'] == 1
+    assert stats['in_flight'] == 0
+
+    response = client.get('/api/events/admission-stats', headers=_auth(user_token))
+    assert response.status_code == 403
+
+    metrics = client.get('/metrics').data.decode()
+    assert 'event_manager_admission_decisions_total{decision="rejected"}' in metrics
+
+def test_freed_seat_reopens_event(client, app, user_token, publisher_token):
+    """Test that unregistering or raising the capacity clears the known-full flag."""
+    _fill_event(app)
+    gate = get_gate(app)
+    gate.state.set(1, True, 0)
+
+    client.delete('/api/events/1/unregister', headers=_auth(user_token))
+    assert gate.state.get(1) is None
+
+    response = client.post('/api/events/1/register', headers=_auth(user_token))
+    assert response.status_code == 200
+    assert gate.state.get(1) == (True, 0)
+
+    client.put('/api/events/1', headers=_auth(publisher_token), json={'capacity': 10})
+    assert gate.state.get(1) is None
+
+def test_excess_attempts_are_shed(client, app, user_token):
+    """Test that attempts over the in-flight limit get a 429 with Retry-After."""
+    gate = get_gate(app)
+    for _ in range(app.config['ADMISSION_MAX_IN_FLIGHT']):
+        assert gate.enter(1) == AdmissionDecision.ACCEPTED
+
+    response = client.post('/api/events/1/register', headers=_auth(user_token))
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '1'
+    assert gate.stats.to_dict()['shed'] == 1
+
+    # The remaining-seat hint lowers the limit: two attempts cannot share one seat
+    for _ in range(app.config['ADMISSION_MAX_IN_FLIGHT']):
+        gate.leave(1)
+    gate.state.set(1, False, 1)
+    assert gate.enter(1) == AdmissionDecision.ACCEPTED
+    assert gate.enter(1) == AdmissionDecision.SHED
+    gate.leave(1)
+
+def test_sqlite_admission_state_is_shared(tmp_path):
+    """Test that workers using the SQLite backend see each other's flags."""
+    path = str(tmp_path / 'admission.sqlite3')
+    first, second = SQLiteAdmissionState(path), SQLiteAdmissionState(path)
+
+    first.set(7, True, 0)
+    assert second.get(7) == (True, 0)
+    second.clear(7)
+    assert first.get(7) is None
+
+    expired = SQLiteAdmissionState(path, ttl=0)
+    expired.set(8, True, 0)
+    assert first.get(8) is None
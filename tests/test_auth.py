@@ -118,4 +118,198 @@ def test_refresh_token(client, user_token):
     
     assert response.status_code == 200
     data = json.loads(response.data)
-    assert 'access_token' in data 
\ No newline at end of file
+    assert 'access_token' in data
+
+
+def test_current_user_resolved_once_per_request(client, app, publisher_token):
+    """Test that the decorators and handler share one user lookup per request."""
+    from sqlalchemy import event
+    from app import db
+    
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        response = client.post('/api/events/', headers={
+            'Authorization': f'Bearer {publisher_token}'
+        }, json={
+            'title': 'Cached User Event',
+            'description': 'Created with a single user lookup',
+            'location': 'Test Location',
+            'start_time': '2030-01-01T10:00:00',
+            'end_time': '2030-01-01T12:00:00'
+        })
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', count)
+    
+    assert response.status_code == 201
+    user_selects = [s for s in statements if s.lstrip().startswith('SELECT') and 'FROM users' in s]
+    assert len(user_selects) == 1
+
+def test_current_user_resolved_once_per_request_with_role_claims(client, app):
+    """Test that checking a role claim's token version reuses the request's user lookup."""
+    from sqlalchemy import event
+    from app import db
+    
+    app.config['JWT_ROLE_CLAIMS'] = True
+    response = client.post('/api/auth/login', json={
+        'email': 'publisher@test.com',
+        'password': 'password'
+    })
+    token = json.loads(response.data)['access_token']
+    
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        response = client.post('/api/events/', headers={
+            'Authorization': f'Bearer {token}'
+        }, json={
+            'title': 'Role Claims Event',
+            'description': 'Created with a single user lookup',
+            'location': 'Test Location',
+            'start_time': '2030-01-01T10:00:00',
+            'end_time': '2030-01-01T12:00:00'
+        })
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', count)
+    
+    assert response.status_code == 201
+    user_selects = [s for s in statements if s.lstrip().startswith('SELECT') and 'FROM users' in s]
+    assert len(user_selects) == 1
+
+def test_current_user_not_shared_across_requests(client, app, publisher_token):
+    """Test that requests sent inside one app context each look the user up again."""
+    from sqlalchemy import event
+    from app import db
+    
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            for _ in range(2):
+                assert client.get('/api/auth/me', headers=headers).status_code == 200
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+    
+    user_selects = [s for s in statements if s.lstrip().startswith('SELECT') and 'FROM users' in s]
+    assert len(user_selects) == 2
+
+def test_role_claims(client, app):
+    """Test that role claims are embedded and honoured when enabled."""
+    from flask_jwt_extended import decode_token
+    
+    app.config['JWT_ROLE_CLAIMS'] = True
+    response = client.post('/api/auth/login', json={
+        'email': 'publisher@test.com',
+        'password': 'password'
+    })
+    tokens = json.loads(response.data)
+    
+    with app.app_context():
+        claims = decode_token(tokens['access_token'])
+    assert claims['role'] == UserRole.PUBLISHER
+    assert claims['tv'] == 0
+    
+    response = client.get('/api/events/all', headers={
+        'Authorization': f"Bearer {tokens['access_token']}"
+    })
+    assert response.status_code == 200
+    
+    response = client.post('/api/auth/refresh', headers={
+        'Authorization': f"Bearer {tokens['refresh_token']}"
+    })
+    assert response.status_code == 200
+
+def test_role_change_revokes_refresh_token(client, app):
+    """Test that a role change forces tokens with the old role claim to be reissued."""
+    app.config['JWT_ROLE_CLAIMS'] = True
+    response = client.post('/api/auth/login', json={
+        'email': 'publisher@test.com',
+        'password': 'password'
+    })
+    publisher = json.loads(response.data)
+    response = client.post('/api/auth/login', json={
+        'email': 'admin@test.com',
+        'password': 'password'
+    })
+    admin_token = json.loads(response.data)['access_token']
+    
+    response = client.put(f"/api/users/revoke-privileges/{publisher['user']['id']}", headers={
+        'Authorization': f'Bearer {admin_token}'
+    })
+    assert response.status_code == 200
+    
+    response = client.post('/api/auth/refresh', headers={
+        'Authorization': f"Bearer {publisher['refresh_token']}"
+    })
+    assert response.status_code == 401
+    assert json.loads(response.data)['error_type'] == 'token_revoked'
+    
+    # The access token still claims the publisher role, but its version is outdated
+    response = client.get('/api/events/all', headers={
+        'Authorization': f"Bearer {publisher['access_token']}"
+    })
+    assert response.status_code == 403
+
+def test_login_rehashes_outdated_password_hash(client, app):
+    """Test that logging in upgrades a hash made with a different bcrypt cost."""
+    from app import db
+    from app.services.passwords import get_log_rounds, hash_password
+    
+    with app.app_context():
+        user = User.query.filter_by(email='user@test.com').first()
+        user.password_hash = hash_password('password', log_rounds=5)
+        db.session.commit()
+    
+    response = client.post('/api/auth/login', json={
+        'email': 'user@test.com',
+        'password': 'password'
+    })
+    assert response.status_code == 200
+    
+    with app.app_context():
+        user = User.query.filter_by(email='user@test.com').first()
+        assert get_log_rounds(user.password_hash) == app.config['BCRYPT_LOG_ROUNDS']
+        assert user.check_password('password')
+
+def test_login_sheds_load_when_hashing_saturated(client, app):
+    """Test that logins get a 503 instead of queueing when the hashing pool is full."""
+    slots = app.extensions['password_hash_slots']
+    limit = app.config['PASSWORD_HASH_MAX_IN_FLIGHT']
+    for _ in range(limit):
+        slots.acquire()
+    try:
+        response = client.post('/api/auth/login', json={
+            'email': 'user@test.com',
+            'password': 'password'
+        })
+    finally:
+        for _ in range(limit):
+            slots.release()
+    
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+def test_password_hashing_on_worker_pool(app):
+    """Test hashing and checking passwords on the process pool."""
+    from app.services.passwords import check_password, get_log_rounds, hash_password
+    
+    app.config['PASSWORD_HASH_WORKERS'] = 1
+    with app.app_context():
+        password_hash = hash_password('s3cret')
+        assert get_log_rounds(password_hash) == app.config['BCRYPT_LOG_ROUNDS']
+        assert check_password(password_hash, 's3cret')
+        assert not check_password(password_hash, 'wrong')
@@ -0,0 +1,160 @@
+import io
+import json
+from datetime import datetime
+import pytest
+from app import db
+from app.models import User, Event, event_attendees, event_waitlist, seat_holds
+
+@pytest.fixture
+def import_event(app):
+    """An unpublished event with three seats and no registrations."""
+    with app.app_context():
+        event = Event(
+            title='Migrated Event',
+            description='Tickets sold elsewhere',
+            location='Main Hall',
+            start_time=datetime(2024, 9, 1, 18, 0),
+            end_time=datetime(2024, 9, 1, 22, 0),
+            capacity=3,
+            is_published=False,
+            publisher_id=User.query.filter_by(email='publisher@test.com').first().id
+        )
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+def _create_users(app, count, prefix='bulk'):
+    """Create regular users and return their ids."""
+    with app.app_context():
+        users = [
+            User(username=f'{prefix}{i}', email=f'{prefix}{i}@test.com', password='password')
+            for i in range(count)
+        ]
+        db.session.add_all(users)
+        db.session.commit()
+        return [user.id for user in users]
+
+def _attendee_ids(app, event_id):
+    with app.app_context():
+        return set(db.session.execute(
+            db.select(event_attendees.c.user_id).where(event_attendees.c.event_id == event_id)
+        ).scalars())
+
+def test_bulk_add_json(client, app, publisher_token, import_event):
+    """Test importing ids and emails from a JSON array, with every outcome reported."""
+    ids = _create_users(app, 5)
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+
+    response = client.post(f'/api/events/{import_event}/attendees/bulk', headers=headers, json=[
+        ids[0], 'bulk1@test.com', {'user_id': ids[0]}, 'nobody@test.com', 'publisher@test.com',
+        'not a user', str(ids[2]), {'email': 'bulk3@test.com'}, ids[4]
+    ])
+    assert response.status_code == 200
+    data = json.loads(response.data)
+
+    assert data['counts'] == {'added': 3, 'duplicate': 1, 'unknown': 3, 'over_capacity': 2}
+    assert [row['user_id'] for row in data['added']] == [ids[0], ids[1], ids[2]]
+    assert data['added'][1]['email'] == 'bulk1@test.com'
+    assert data['duplicate'] == [{'row': 3, 'user_id': ids[0]}]
+    assert [row['row'] for row in data['unknown']] == [4, 5, 6]
+    assert [row['user_id'] for row in data['over_capacity']] == [ids[3], ids[4]]
+    assert data['event']['attendee_count'] == 3
+    assert _attendee_ids(app, import_event) == set(ids[:3])
+
+    # Importing the same users again reports them as duplicates
+    response = client.post(f'/api/events/{import_event}/attendees/bulk', headers=headers, json=ids[:2])
+    data = json.loads(response.data)
+    assert data['counts']['duplicate'] == 2
+    assert data['event']['attendee_count'] == 3
+
+def test_bulk_add_csv_and_ndjson(client, app, publisher_token, import_event):
+    """Test importing an uploaded CSV file and an NDJSON request body."""
+    ids = _create_users(app, 3)
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+
+    csv_file = io.BytesIO(f'email,name\nbulk0@test.com,First\n,Nobody\n'.encode())
+    response = client.post(
+        f'/api/events/{import_event}/attendees/bulk', headers=headers,
+        data={'file': (csv_file, 'attendees.csv')}, content_type='multipart/form-data'
+    )
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['added'] == [{'row': 2, 'user_id': ids[0], 'email': 'bulk0@test.com'}]
+    assert data['unknown'] == [{'row': 3, 'user_id': None}]
+
+    body = f'{{"user_id": {ids[1]}}}\n\n"bulk2@test.com"\n'
+    response = client.post(
+        f'/api/events/{import_event}/attendees/bulk', headers=headers,
+        data=body, content_type='application/x-ndjson'
+    )
+    assert response.status_code == 200
+    assert json.loads(response.data)['counts']['added'] == 2
+    assert _attendee_ids(app, import_event) == set(ids)
+
+    response = client.post(
+        f'/api/events/{import_event}/attendees/bulk', headers=headers,
+        data='{"user_id": 1}\nnot json\n', content_type='application/x-ndjson'
+    )
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Invalid JSON on line 2'
+
+    response = client.post(
+        f'/api/events/{import_event}/attendees/bulk', headers=headers,
+        data='ids', content_type='text/plain'
+    )
+    assert response.status_code == 400
+
+def test_bulk_add_takes_over_waitlist_and_holds(client, app, publisher_token, import_event):
+    """Test that imported users leave the waitlist and give back the seats they held."""
+    ids = _create_users(app, 2)
+    with app.app_context():
+        db.session.execute(event_waitlist.insert().values(event_id=import_event, user_id=ids[0], position=1))
+        db.session.execute(db.update(Event).where(Event.id == import_event).values(held_count=1))
+        db.session.execute(seat_holds.insert().values(
+            event_id=import_event, user_id=ids[1], expires_at=datetime(2100, 1, 1)
+        ))
+        db.session.commit()
+
+    response = client.post(
+        f'/api/events/{import_event}/attendees/bulk',
+        headers={'Authorization': f'Bearer {publisher_token}'}, json=ids
+    )
+    data = json.loads(response.data)
+    assert data['counts']['added'] == 2
+    assert data['event']['attendee_count'] == 2
+    assert data['event']['held_count'] == 0
+
+    with app.app_context():
+        assert db.session.query(event_waitlist).count() == 0
+
+def test_bulk_add_permissions_and_limits(client, app, user_token, admin_token, import_event):
+    """Test that only the publisher or an admin can import, within the row limit."""
+    ids = _create_users(app, 2)
+    url = f'/api/events/{import_event}/attendees/bulk'
+
+    response = client.post(url, headers={'Authorization': f'Bearer {user_token}'}, json=ids)
+    assert response.status_code == 403
+
+    response = client.post('/api/events/9999/attendees/bulk', headers={'Authorization': f'Bearer {admin_token}'}, json=ids)
+    assert response.status_code == 404
+
+    app.config['BULK_ATTENDEES_MAX_ROWS'] = 1
+    response = client.post(url, headers={'Authorization': f'Bearer {admin_token}'}, json=ids)
+    assert response.status_code == 413
+    assert _attendee_ids(app, import_event) == set()
+
+def test_bulk_add_query_budget(client, app, publisher_token, query_budget):
+    """Test that an import runs a fixed number of queries however many rows it has."""
+    ids = _create_users(app, 300)
+    with app.app_context():
+        event_id = Event.query.filter_by(title='Test Event 1').first().id
+
+    with query_budget(20):
+        response = client.post(
+            f'/api/events/{event_id}/attendees/bulk',
+            headers={'Authorization': f'Bearer {publisher_token}'},
+            json=ids[:150] + [f'bulk{i}@test.com' for i in range(150, 300)]
+        )
+    data = json.loads(response.data)
+    assert data['counts']['added'] == 99
+    assert data['counts']['over_capacity'] == 201
@@ -0,0 +1,146 @@
+import json
+import time
+import pytest
+from app.services.cache import MemoryCache, SQLiteCache
+
+def test_memory_cache_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache = MemoryCache(max_entries=2, ttl=60)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    assert cache.get('a') == b'1'  # 'b' is now least recently used
+    cache.set('c', b'3')
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == b'1'
+    assert cache.get('c') == b'3'
+    assert cache.stats.to_dict() == {'hits': 3, 'misses': 1, 'evictions': 1, 'expirations': 0}
+
+def test_memory_cache_ttl():
+    """Test that entries expire after their TTL."""
+    cache = MemoryCache(ttl=0.05)
+    cache.set('a', b'1')
+    time.sleep(0.1)
+    
+    assert cache.get('a') is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+@pytest.mark.parametrize('make_cache', [
+    lambda tmp_path: MemoryCache(ttl=60),
+    lambda tmp_path: SQLiteCache(str(tmp_path / 'cache.sqlite3'), ttl=60),
+])
+def test_cache_tag_invalidation(tmp_path, make_cache):
+    """Test that invalidating a tag evicts exactly the entries carrying it."""
+    cache = make_cache(tmp_path)
+    cache.set('list?page=1', b'list1', tags=['events'])
+    cache.set('list?page=2', b'list2', tags=['events'])
+    cache.set('event/1', b'one', tags=['event:1'])
+    cache.set('event/2', b'two', tags=['event:2'])
+    
+    cache.invalidate_tags(['events', 'event:1'])
+    
+    assert cache.get('list?page=1') is None
+    assert cache.get('list?page=2') is None
+    assert cache.get('event/1') is None
+    assert cache.get('event/2') == b'two'
+
+def test_sqlite_cache_shared_between_instances(tmp_path):
+    """Test that separate SQLite cache instances (one per worker) see the same entries."""
+    path = str(tmp_path / 'cache.sqlite3')
+    worker_a = SQLiteCache(path, max_entries=2, ttl=60)
+    worker_b = SQLiteCache(path, max_entries=2, ttl=60)
+    
+    worker_a.set('event/1', b'one', tags=['event:1'])
+    assert worker_b.get('event/1') == b'one'
+    
+    worker_b.invalidate_tags(['event:1'])
+    assert worker_a.get('event/1') is None
+    
+    worker_a.set('x', b'x')
+    worker_a.set('y', b'y')
+    worker_a.set('z', b'z')
+    assert len(worker_b) == 2
+    assert worker_a.stats.evictions == 1
+
+def test_published_event_responses_are_cached(client, app):
+    """Test that anonymous reads are served from the cache until an update invalidates them."""
+    response = client.get('/api/events/')
+    assert response.headers['X-Cache'] == 'MISS'
+    response = client.get('/api/events/')
+    assert response.headers['X-Cache'] == 'HIT'
+    event_id = json.loads(response.data)[0]['id']
+    
+    client.get(f'/api/events/{event_id}')
+    response = client.get(f'/api/events/{event_id}')
+    assert response.headers['X-Cache'] == 'HIT'
+    assert json.loads(response.data)['id'] == event_id
+
+def test_cached_listing_keyed_by_representation(client):
+    """Test that cached NDJSON and JSON listings are kept apart, in the cache and in ETags."""
+    ndjson_headers = {'Accept': 'application/x-ndjson'}
+    response = client.get('/api/events/', headers=ndjson_headers)
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Vary'] == 'Accept'
+    ndjson_etag = response.headers['ETag']
+    response = client.get('/api/events/', headers=ndjson_headers)
+    assert response.headers['X-Cache'] == 'HIT'
+    assert response.headers['Vary'] == 'Accept'
+    
+    response = client.get('/api/events/')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.mimetype == 'application/json'
+    assert isinstance(json.loads(response.data), list)
+    assert response.headers['ETag'] != ndjson_etag
+    
+    # A JSON client revalidating with the NDJSON validator gets the full body
+    response = client.get('/api/events/', headers={'If-None-Match': ndjson_etag})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+
+def test_cache_invalidated_on_write(client, publisher_token, user_token):
+    """Test that updates and registrations evict the affected cached responses."""
+    response = client.get('/api/events/')
+    event_id = json.loads(response.data)[0]['id']
+    client.get(f'/api/events/{event_id}')
+    
+    client.put(f'/api/events/{event_id}', headers={
+        'Authorization': f'Bearer {publisher_token}'
+    }, json={'title': 'Retitled Event'})
+    
+    response = client.get(f'/api/events/{event_id}')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)['title'] == 'Retitled Event'
+    response = client.get('/api/events/')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)[0]['title'] == 'Retitled Event'
+    
+    client.delete(f'/api/events/{event_id}/unregister', headers={
+        'Authorization': f'Bearer {user_token}'
+    })
+    response = client.get(f'/api/events/{event_id}')
+    assert json.loads(response.data)['attendee_count'] == 0
+
+def test_cache_stats(client, admin_token):
+    """Test that the cache counters are exposed to admins."""
+    client.get('/api/events/')
+    client.get('/api/events/')
+    
+    response = client.get('/api/events/cache-stats', headers={
+        'Authorization': f'Bearer {admin_token}'
+    })
+    assert response.status_code == 200
+    stats = json.loads(response.data)
+    assert stats['backend'] == 'memory'
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+
+def test_cached_response_revalidation(client):
+    """Test that a cache hit still answers If-None-Match with 304."""
+    response = client.get('/api/events/')
+    etag = response.headers['ETag']
+    
+    response = client.get('/api/events/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['X-Cache'] == 'HIT'
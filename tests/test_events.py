@@ -302,4 +302,712 @@ def test_my_registrations(client, user_token):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert len(data) > 0
-    assert any(e['id'] == event_id for e in data) 
\ No newline at end of file
+    assert any(e['id'] == event_id for e in data)
+
+
+def _add_published_events(app, count, location='Paged Hall'):
+    """Insert published events for pagination tests, all starting at distinct times."""
+    from app import db
+    from app.models import Event, User
+    
+    with app.app_context():
+        publisher = User.query.filter_by(username='publisher_test').first()
+        base = datetime(2024, 1, 1, 9, 0, 0)
+        db.session.add_all([
+            Event(
+                title=f'Paged Event {i}',
+                description='Pagination test event',
+                location=location,
+                start_time=base + timedelta(days=i // 2),  # pairs share a start time
+                end_time=base + timedelta(days=i // 2, hours=2),
+                is_published=True,
+                publisher_id=publisher.id
+            )
+            for i in range(count)
+        ])
+        db.session.commit()
+
+def test_get_events_keyset_pagination(client, app):
+    """Test walking the published event listing page by page with the cursor."""
+    _add_published_events(app, 7)
+    
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        url = '/api/events/?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        response = client.get(url)
+        assert response.status_code == 200
+        page = json.loads(response.data)
+        assert len(page) <= 3
+        seen.extend(page)
+        pages += 1
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    
+    assert pages == 3
+    assert len(seen) == 8  # 7 new events plus the published fixture event
+    assert len({e['id'] for e in seen}) == 8
+    
+    # Results are ordered by (start_time, id) with no gaps or repeats
+    keys = [(e['start_time'], e['id']) for e in seen]
+    assert keys == sorted(keys)
+
+def test_get_events_filters(client, app):
+    """Test filtering published events by date range, location and publisher."""
+    _add_published_events(app, 6, location='Filter Arena')
+    
+    response = client.get('/api/events/?location=filter arena')
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == 6
+    
+    response = client.get('/api/events/?location=Filter&from=2024-01-02T00:00:00&to=2024-01-02T23:59:59')
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert len(data) == 2
+    assert all(e['start_time'].startswith('2024-01-02') for e in data)
+    
+    response = client.get('/api/events/?publisher_id=999')
+    assert response.status_code == 200
+    assert json.loads(response.data) == []
+
+def test_get_events_invalid_arguments(client):
+    """Test that malformed cursors, limits and dates are rejected."""
+    assert client.get('/api/events/?cursor=not-a-cursor').status_code == 400
+    assert client.get('/api/events/?limit=0').status_code == 400
+    assert client.get('/api/events/?from=yesterday').status_code == 400
+    assert client.get('/api/events/?publisher_id=abc').status_code == 400
+
+def test_my_events_pagination(client, publisher_token):
+    """Test that the publisher's own listing is paginated as well."""
+    response = client.get('/api/events/my-events?limit=1', headers={
+        'Authorization': f'Bearer {publisher_token}'
+    })
+    
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == 1
+    assert response.headers.get('X-Next-Cursor')
+
+def test_attendee_count_kept_in_sync(client, app, user_token):
+    """Test that register/unregister keep the denormalized attendee counter accurate."""
+    from app.models import Event
+    
+    response = client.get('/api/events/')
+    event_id = json.loads(response.data)[0]['id']
+    assert json.loads(response.data)[0]['attendee_count'] == 1  # fixture registration
+    
+    response = client.delete(f'/api/events/{event_id}/unregister', headers={
+        'Authorization': f'Bearer {user_token}'
+    })
+    assert json.loads(response.data)['event']['attendee_count'] == 0
+    
+    response = client.post(f'/api/events/{event_id}/register', headers={
+        'Authorization': f'Bearer {user_token}'
+    })
+    assert json.loads(response.data)['event']['attendee_count'] == 1
+    
+    with app.app_context():
+        assert Event.query.get(event_id).attendee_count == 1
+
+def test_attendee_count_increments_in_one_transaction(app):
+    """Test that several counter updates before a commit all take effect."""
+    from app import db
+    from app.models import Event, User
+    
+    with app.app_context():
+        event = Event.query.filter_by(title='Test Event 1').first()
+        for name in ('first', 'second', 'third'):
+            user = User(username=name, email=f'{name}@example.com', password='password')
+            db.session.add(user)
+            assert event.register_user(user)
+            # The counter reads back as a number between updates
+            assert isinstance(event.attendee_count, int)
+        assert event.attendee_count == 4
+        db.session.commit()
+        event_id = event.id
+    
+    with app.app_context():
+        assert Event.query.get(event_id).attendee_count == 4
+
+def test_recount_attendees_command(app):
+    """Test that the repair command recomputes drifted attendee and held seat counters."""
+    from app import db
+    from app.models import Event, User, seat_holds
+    
+    with app.app_context():
+        db.session.execute(db.update(Event).values(attendee_count=42, held_count=7))
+        event_id = Event.query.filter_by(title='Test Event 1').first().id
+        user_ids = [u.id for u in User.query.all()]
+        db.session.execute(seat_holds.insert(), [
+            {'event_id': event_id, 'user_id': user_ids[0], 'expires_at': datetime(2100, 1, 1)},
+            {'event_id': event_id, 'user_id': user_ids[1], 'expires_at': datetime(2000, 1, 1)},
+        ])
+        db.session.commit()
+    
+    result = app.test_cli_runner().invoke(args=['events', 'recount-attendees'])
+    assert 'Recounted attendees for 2 events' in result.output
+    
+    with app.app_context():
+        counts = sorted((e.attendee_count, e.held_count) for e in Event.query.all())
+        assert counts == [(0, 0), (1, 1)]
+        # The expired hold no longer reserves a seat
+        assert db.session.query(seat_holds).count() == 1
+
+def test_recount_attendees_promotes_waitlist(app):
+    """Test that seats freed by the recount go to the waitlist."""
+    from app import db
+    from app.models import Event, User, event_attendees, event_waitlist
+    
+    with app.app_context():
+        event = Event.query.filter_by(title='Test Event 1').first()
+        event.capacity = 1
+        db.session.execute(event_attendees.delete())
+        db.session.execute(db.update(Event).values(attendee_count=1))
+        user_id = User.query.filter_by(email='user@test.com').first().id
+        db.session.execute(event_waitlist.insert().values(event_id=event.id, user_id=user_id, position=1))
+        db.session.commit()
+        event_id = event.id
+    
+    result = app.test_cli_runner().invoke(args=['events', 'recount-attendees'])
+    assert 'Promoted 1 users from waitlists' in result.output
+    
+    with app.app_context():
+        assert Event.query.get(event_id).attendee_count == 1
+        assert db.session.query(event_waitlist).count() == 0
+        assert db.session.query(event_attendees).count() == 1
+
+def test_register_rejection_reasons(client, app, user_token):
+    """Test that registration reports why it was rejected."""
+    from app import db
+    from app.models import Event
+    
+    response = client.get('/api/events/')
+    event_id = json.loads(response.data)[0]['id']
+    headers = {'Authorization': f'Bearer {user_token}'}
+    
+    # The fixture user is already registered for the published event
+    response = client.post(f'/api/events/{event_id}/register', headers=headers)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Already registered for this event'
+    
+    # Fill the event, then free the user's seat so only capacity blocks them
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        event.capacity = 1
+        db.session.commit()
+    client.delete(f'/api/events/{event_id}/unregister', headers=headers)
+    with app.app_context():
+        db.session.execute(db.update(Event).where(Event.id == event_id).values(attendee_count=1))
+        db.session.commit()
+    
+    response = client.post(f'/api/events/{event_id}/register', headers=headers)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Event is at full capacity'
+    
+    response = client.post('/api/events/9999/register', headers=headers)
+    assert response.status_code == 404
+    
+    response = client.delete(f'/api/events/{event_id}/unregister', headers=headers)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Not registered for this event'
+
+def test_non_positive_capacity_is_unlimited(client, app, user_token):
+    """Test that a zero or negative capacity is reported and enforced as unlimited."""
+    from app import db
+    from app.models import Event
+    
+    response = client.get('/api/events/')
+    event_id = json.loads(response.data)[0]['id']
+    headers = {'Authorization': f'Bearer {user_token}'}
+    client.delete(f'/api/events/{event_id}/unregister', headers=headers)
+    
+    with app.app_context():
+        db.session.execute(db.update(Event).where(Event.id == event_id).values(capacity=-1, attendee_count=5))
+        db.session.commit()
+    
+    response = client.get(f'/api/events/{event_id}', headers=headers)
+    assert json.loads(response.data)['is_full'] is False
+    response = client.post(f'/api/events/{event_id}/register', headers=headers)
+    assert response.status_code == 200
+    assert json.loads(response.data)['event']['is_full'] is False
+
+def test_my_registrations_pagination(client, app, user_token):
+    """Test that registrations are paged in the order they were made."""
+    _add_published_events(app, 4)
+    headers = {'Authorization': f'Bearer {user_token}'}
+    
+    response = client.get('/api/events/?location=Paged')
+    new_ids = [e['id'] for e in json.loads(response.data)]
+    for event_id in reversed(new_ids):
+        client.post(f'/api/events/{event_id}/register', headers=headers)
+    
+    response = client.get('/api/events/my-registrations?limit=3', headers=headers)
+    assert response.status_code == 200
+    first_page = json.loads(response.data)
+    cursor = response.headers['X-Next-Cursor']
+    
+    response = client.get(f'/api/events/my-registrations?limit=3&cursor={cursor}', headers=headers)
+    second_page = json.loads(response.data)
+    assert 'X-Next-Cursor' not in response.headers
+    
+    ids = [e['id'] for e in first_page + second_page]
+    assert len(ids) == 5  # fixture registration plus the four new ones
+    assert ids[1:] == list(reversed(new_ids))
+
+def test_get_event_conditional(client, user_token):
+    """Test ETag / Last-Modified revalidation of a single event."""
+    response = client.get('/api/events/')
+    event_id = json.loads(response.data)[0]['id']
+    
+    response = client.get(f'/api/events/{event_id}')
+    etag = response.headers['ETag']
+    last_modified = response.headers['Last-Modified']
+    assert etag and last_modified
+    
+    response = client.get(f'/api/events/{event_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    response = client.get(f'/api/events/{event_id}', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+    
+    # A registration change produces a new representation
+    client.delete(f'/api/events/{event_id}/unregister', headers={
+        'Authorization': f'Bearer {user_token}'
+    })
+    response = client.get(f'/api/events/{event_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_get_events_conditional(client, publisher_token):
+    """Test that listings revalidate against the collection version."""
+    response = client.get('/api/events/')
+    etag = response.headers['ETag']
+    
+    response = client.get('/api/events/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    future_time = datetime.utcnow() + timedelta(days=30)
+    client.post('/api/events/', headers={
+        'Authorization': f'Bearer {publisher_token}'
+    }, json={
+        'title': 'Fresh Event',
+        'description': 'Changes the collection version',
+        'location': 'Test Location',
+        'start_time': future_time.isoformat(),
+        'end_time': (future_time + timedelta(hours=1)).isoformat(),
+        'is_published': True
+    })
+    
+    response = client.get('/api/events/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(json.loads(response.data)) == 2
+
+def test_my_registrations_conditional(client, user_token):
+    """Test that the registrations listing revalidates until the user registers again."""
+    headers = {'Authorization': f'Bearer {user_token}'}
+    response = client.get('/api/events/my-registrations', headers=headers)
+    etag = response.headers['ETag']
+    
+    response = client.get('/api/events/my-registrations', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    event_id = json.loads(client.get('/api/events/').data)[0]['id']
+    client.delete(f'/api/events/{event_id}/unregister', headers=headers)
+    
+    response = client.get('/api/events/my-registrations', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert json.loads(response.data) == []
+
+def test_event_attendees_streamed(client, publisher_token):
+    """Test that the attendee list is streamed as JSON or NDJSON."""
+    response = client.get('/api/events/', headers={})
+    event_id = json.loads(response.data)[0]['id']
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+    
+    response = client.get(f'/api/events/{event_id}/attendees', headers=headers)
+    assert response.is_streamed
+    data = json.loads(response.data)
+    assert data['attendee_count'] == 1
+    assert [a['username'] for a in data['attendees']] == ['user_test']
+    
+    response = client.get(f'/api/events/{event_id}/attendees', headers={
+        **headers, 'Accept': 'application/x-ndjson'
+    })
+    assert response.mimetype == 'application/x-ndjson'
+    lines = response.data.decode().splitlines()
+    assert [json.loads(line)['username'] for line in lines] == ['user_test']
+
+def test_event_attendees_paginated(client, app, publisher_token, query_budget):
+    """Test paging through attendees by registration time with filters and projection."""
+    from app import db
+    from app.models import Event, User
+
+    with app.app_context():
+        event = Event.query.filter_by(title='Test Event 1').first()
+        event_id = event.id
+        for name in ('alice', 'alfred', 'bob', 'al_x'):
+            user = User(username=name, email=f'{name}@example.com', password='password')
+            db.session.add(user)
+            event.register_user(user)
+        db.session.commit()
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+
+    usernames, cursor = [], None
+    while True:
+        with query_budget(4):
+            response = client.get(f'/api/events/{event_id}/attendees?limit=2' + (f'&cursor={cursor}' if cursor else ''), headers=headers)
+        data = json.loads(response.data)
+        assert data['attendee_count'] == 5
+        assert len(data['attendees']) <= 2
+        usernames += [a['username'] for a in data['attendees']]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+    assert usernames == ['user_test', 'alice', 'alfred', 'bob', 'al_x']
+    assert set(data['attendees'][0]) == {'id', 'username', 'email', 'role', 'created_at', 'updated_at', 'registered_at'}
+
+    # Prefix filters match literally, so _ is not a wildcard
+    response = client.get(f'/api/events/{event_id}/attendees?username=al', headers=headers)
+    assert [a['username'] for a in json.loads(response.data)['attendees']] == ['alice', 'alfred', 'al_x']
+    response = client.get(f'/api/events/{event_id}/attendees?username=al_', headers=headers)
+    assert [a['username'] for a in json.loads(response.data)['attendees']] == ['al_x']
+    response = client.get(f'/api/events/{event_id}/attendees?email=bob@', headers=headers)
+    assert [a['username'] for a in json.loads(response.data)['attendees']] == ['bob']
+
+    response = client.get(f'/api/events/{event_id}/attendees?fields=username,registered_at&limit=1', headers=headers)
+    attendee = json.loads(response.data)['attendees'][0]
+    assert set(attendee) == {'id', 'username', 'registered_at'}
+
+    response = client.get(f'/api/events/{event_id}/attendees?fields=password_hash', headers=headers)
+    assert response.status_code == 400
+    response = client.get(f'/api/events/{event_id}/attendees?cursor=bogus', headers=headers)
+    assert response.status_code == 400
+
+def test_attendee_registered_at_required(client, app, publisher_token):
+    """Test that every registration has the timestamp the attendee cursor is built from."""
+    from sqlalchemy.exc import IntegrityError
+    from app import db
+    from app.models import Event, User, event_attendees
+
+    with app.app_context():
+        event_id = Event.query.filter_by(title='Test Event 1').first().id
+        user = User(username='legacy', email='legacy@example.com', password='password')
+        db.session.add(user)
+        db.session.flush()
+        with pytest.raises(IntegrityError):
+            with db.session.begin_nested():
+                db.session.execute(event_attendees.insert().values(user_id=user.id, event_id=event_id, registered_at=None))
+        # The value the migration backfills for registrations without one
+        db.session.execute(event_attendees.insert().values(
+            user_id=user.id, event_id=event_id, registered_at=datetime(1970, 1, 1)
+        ))
+        db.session.commit()
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+
+    response = client.get(f'/api/events/{event_id}/attendees?limit=1', headers=headers)
+    assert response.status_code == 200
+    assert [a['username'] for a in json.loads(response.data)['attendees']] == ['legacy']
+    cursor = response.headers['X-Next-Cursor']
+    response = client.get(f'/api/events/{event_id}/attendees?limit=1&cursor={cursor}', headers=headers)
+    assert [a['username'] for a in json.loads(response.data)['attendees']] == ['user_test']
+
+def test_export_event_attendees_csv(client, app, publisher_token, user_token, query_budget):
+    """Test streaming the attendee list as CSV, plain and gzip-encoded."""
+    import csv
+    import gzip
+    from app import db
+    from app.models import Event, User
+
+    with app.app_context():
+        event = Event.query.filter_by(title='Test Event 1').first()
+        event_id = event.id
+        event.capacity = 1000
+        for i in range(600):
+            user = User(username=f'csv{i}', email=f'csv{i}@test.com', password='password')
+            db.session.add(user)
+            event.register_user(user)
+        db.session.add(User(username='=cmd()', email='formula@test.com', password='password'))
+        event.register_user(User.query.filter_by(username='=cmd()').first())
+        db.session.commit()
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+
+    with query_budget(4):
+        response = client.get(f'/api/events/{event_id}/attendees.csv', headers=headers)
+        assert response.is_streamed
+        body = response.data.decode()
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment' in response.headers['Content-Disposition']
+    rows = list(csv.reader(body.splitlines()))
+    assert rows[0] == ['user_id', 'username', 'email', 'registered_at']
+    assert len(rows) == 603
+    assert rows[1][1:3] == ['user_test', 'user@test.com']
+    assert datetime.fromisoformat(rows[1][3])
+    # Cells a spreadsheet would evaluate as formulas are escaped
+    assert rows[-1][1] == "'=cmd()"
+
+    response = client.get(f'/api/events/{event_id}/attendees.csv', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data).decode() == body
+
+    response = client.get(f'/api/events/{event_id}/attendees.csv', headers={'Authorization': f'Bearer {user_token}'})
+    assert response.status_code == 403
+
+def test_get_events_ndjson(client, app):
+    """Test the NDJSON variant of the event listing."""
+    _add_published_events(app, 3)
+    
+    response = client.get('/api/events/?limit=2', headers={'Accept': 'application/x-ndjson'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert len(response.data.decode().splitlines()) == 2
+    assert response.headers['X-Next-Cursor']
+
+def _create_event(client, token, **fields):
+    """Create an event through the API and return its id."""
+    future_time = datetime.utcnow() + timedelta(days=30)
+    payload = {
+        'description': 'An event',
+        'location': 'Test Location',
+        'start_time': future_time.isoformat(),
+        'end_time': (future_time + timedelta(hours=2)).isoformat(),
+        'is_published': True,
+        **fields
+    }
+    response = client.post('/api/events/', headers={'Authorization': f'Bearer {token}'}, json=payload)
+    return json.loads(response.data)['event']['id']
+
+def test_search_events(client, publisher_token):
+    """Test ranked, prefix-matching full-text search over published events."""
+    conference = _create_event(client, publisher_token, title='Python Conference',
+                               description='Talks about programming')
+    meetup = _create_event(client, publisher_token, title='Coffee Meetup',
+                           description='A relaxed conference side event')
+    _create_event(client, publisher_token, title='Secret Conference', is_published=False)
+    
+    response = client.get('/api/events/search?q=conf')
+    assert response.status_code == 200
+    ids = [e['id'] for e in json.loads(response.data)]
+    assert ids == [conference, meetup]  # title matches rank above description matches
+    
+    response = client.get('/api/events/search?q=python prog')
+    assert [e['id'] for e in json.loads(response.data)] == [conference]
+    
+    response = client.get('/api/events/search?q=conference&limit=1')
+    assert len(json.loads(response.data)) == 1
+    assert response.headers['X-Next-Offset'] == '1'
+    response = client.get('/api/events/search?q=conference&limit=1&offset=1')
+    assert [e['id'] for e in json.loads(response.data)] == [meetup]
+    assert 'X-Next-Offset' not in response.headers
+    
+    assert client.get('/api/events/search?q=').status_code == 400
+
+def test_search_index_follows_updates_and_deletes(client, publisher_token):
+    """Test that the search index is kept in sync with event changes."""
+    event_id = _create_event(client, publisher_token, title='Jazz Night')
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+    
+    client.put(f'/api/events/{event_id}', headers=headers, json={'title': 'Blues Night'})
+    assert json.loads(client.get('/api/events/search?q=jazz').data) == []
+    assert [e['id'] for e in json.loads(client.get('/api/events/search?q=blues').data)] == [event_id]
+    
+    client.delete(f'/api/events/{event_id}', headers=headers)
+    assert json.loads(client.get('/api/events/search?q=blues').data) == []
+
+def test_event_listing_query_budget(client, app, query_budget):
+    """Test that listing 200 events takes at most 3 queries."""
+    _add_published_events(app, 200)
+
+    with query_budget(3):
+        response = client.get('/api/events/?limit=200')
+        data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert len(data) == 200
+
+def test_event_reads_query_budget(client, app, publisher_token, query_budget):
+    """Test that detail, attendee and publisher listings stay within small query budgets."""
+    from app import db
+    from app.models import Event, User
+
+    with app.app_context():
+        event = Event.query.filter_by(title='Test Event 1').first()
+        event_id = event.id
+        for i in range(20):
+            user = User(username=f'budget{i}', email=f'budget{i}@test.com', password='password')
+            db.session.add(user)
+            event.register_user(user)
+        db.session.commit()
+
+    headers = {'Authorization': f'Bearer {publisher_token}'}
+    with query_budget(3):
+        assert client.get(f'/api/events/{event_id}').status_code == 200
+    with query_budget(4):
+        response = client.get(f'/api/events/{event_id}/attendees', headers=headers)
+        assert len(json.loads(response.data)['attendees']) == 21
+    with query_budget(4):
+        assert client.get('/api/events/my-events', headers=headers).status_code == 200
+
+def test_get_events_sparse_fields(client, app, query_budget):
+    """Test that ?fields= returns and loads only the requested columns."""
+    _add_published_events(app, 5)
+
+    with query_budget(2) as tracker:
+        response = client.get('/api/events/?fields=title,start_time,location')
+        data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert len(data) == 6
+    assert all(set(event) == {'id', 'title', 'start_time', 'location'} for event in data)
+    page_query = tracker.statements[-1]
+    assert 'events.description' not in page_query
+    assert 'events.title' in page_query
+
+    # Computed fields load the columns they depend on
+    response = client.get('/api/events/?fields=is_full')
+    assert set(json.loads(response.data)[0]) == {'id', 'is_full'}
+
+def test_get_events_unknown_field_or_include(client):
+    """Test that unknown fields and includes are rejected."""
+    response = client.get('/api/events/?fields=title,secret')
+    assert response.status_code == 400
+    assert 'secret' in json.loads(response.data)['message']
+
+    response = client.get('/api/events/1?include=attendees')
+    assert response.status_code == 400
+    assert 'attendees' in json.loads(response.data)['message']
+
+def test_get_events_include_publisher(client, app, query_budget):
+    """Test that publishers are resolved with one batched query for the whole page."""
+    _add_published_events(app, 20)
+
+    with query_budget(3):
+        response = client.get('/api/events/?include=publisher&fields=title')
+        data = json.loads(response.data)
+
+    assert len(data) == 21
+    assert all(event['publisher']['username'] == 'publisher_test' for event in data)
+    assert 'email' not in data[0]['publisher']
+
+def test_include_registration_status(client, user_token, publisher_token):
+    """Test that registration status comes with the event instead of a separate request."""
+    headers = {'Authorization': f'Bearer {user_token}'}
+    event = json.loads(client.get('/api/events/1?include=registration_status', headers=headers).data)
+    assert event['registration_status']['registered'] is True
+    assert event['registration_status']['registered_at'] is not None
+    assert event['title'] == 'Test Event 1'
+
+    listing = json.loads(client.get('/api/events/?include=registration_status', headers=headers).data)
+    assert listing[0]['registration_status']['registered'] is True
+
+    other = json.loads(client.get('/api/events/1?include=registration_status', headers={
+        'Authorization': f'Bearer {publisher_token}'
+    }).data)
+    assert other['registration_status'] == {'registered': False, 'registered_at': None}
+
+    anonymous = json.loads(client.get('/api/events/1?include=registration_status').data)
+    assert anonymous['registration_status'] is None
+
+def test_representations_have_distinct_etags(client):
+    """Test that a projected response does not validate against the full one."""
+    full = client.get('/api/events/1')
+    projected = client.get('/api/events/1?fields=title')
+
+    assert full.headers['ETag'] != projected.headers['ETag']
+    response = client.get('/api/events/1?fields=title', headers={'If-None-Match': full.headers['ETag']})
+    assert response.status_code == 200
+
+def _user_headers(app, name):
+    """Create a regular user and return their authorization headers."""
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models import User
+
+    with app.app_context():
+        user = User(username=name, email=f'{name}@test.com', password='password')
+        db.session.add(user)
+        db.session.commit()
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+def test_waitlist_join_and_leave(client, app, user_token, publisher_token):
+    """Test joining and leaving the waitlist of a full event."""
+    event_id = _create_event(client, publisher_token, title='Small Event', capacity=1)
+    first = {'Authorization': f'Bearer {user_token}'}
+    second = _user_headers(app, 'waitlist_second')
+    third = _user_headers(app, 'waitlist_third')
+
+    # A free seat is taken right away
+    response = client.post(f'/api/events/{event_id}/waitlist', headers=first)
+    assert response.status_code == 200
+    assert json.loads(response.data)['status'] == 'registered'
+
+    response = client.post(f'/api/events/{event_id}/waitlist', headers=second)
+    assert response.status_code == 201
+    assert json.loads(response.data) == {'message': 'Added to the waitlist', 'status': 'waitlisted', 'position': 1}
+    response = client.post(f'/api/events/{event_id}/waitlist', headers=third)
+    assert json.loads(response.data)['position'] == 2
+
+    response = client.post(f'/api/events/{event_id}/waitlist', headers=second)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Already on the waitlist for this event'
+
+    response = client.delete(f'/api/events/{event_id}/waitlist', headers=second)
+    assert response.status_code == 200
+    response = client.get(f'/api/events/{event_id}/waitlist', headers=third)
+    assert json.loads(response.data) == {'event_id': event_id, 'position': 1, 'waitlist_length': 1}
+
+    response = client.delete(f'/api/events/{event_id}/waitlist', headers=second)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'Not on the waitlist for this event'
+
+    response = client.post(f'/api/events/{event_id}/waitlist', headers={'Authorization': f'Bearer {publisher_token}'})
+    assert response.status_code == 403
+    response = client.post('/api/events/9999/waitlist', headers=second)
+    assert response.status_code == 404
+
+def test_waitlist_promotion(client, app, user_token, publisher_token):
+    """Test that freed and added seats go to the head of the waitlist in order."""
+    from app import db
+    from app.models import Event, event_waitlist
+
+    event_id = _create_event(client, publisher_token, title='Small Event', capacity=1)
+    first = {'Authorization': f'Bearer {user_token}'}
+    waiting = [_user_headers(app, f'waitlist_user_{i}') for i in range(3)]
+    client.post(f'/api/events/{event_id}/register', headers=first)
+    for headers in waiting:
+        client.post(f'/api/events/{event_id}/waitlist', headers=headers)
+
+    # Unregistering hands the seat to the head of the waitlist
+    response = client.delete(f'/api/events/{event_id}/unregister', headers=first)
+    assert json.loads(response.data)['event']['attendee_count'] == 1
+    response = client.get(f'/api/events/{event_id}?include=registration_status', headers=waiting[0])
+    assert json.loads(response.data)['registration_status']['registered'] is True
+    response = client.get(f'/api/events/{event_id}/waitlist', headers=waiting[1])
+    assert json.loads(response.data)['position'] == 1
+
+    # Raising the capacity promotes as many as fit
+    response = client.put(f'/api/events/{event_id}', headers={'Authorization': f'Bearer {publisher_token}'},
+                          json={'capacity': 5})
+    assert json.loads(response.data)['event']['attendee_count'] == 3
+
+    with app.app_context():
+        assert db.session.get(Event, event_id).attendee_count == 3
+        assert db.session.execute(
+            db.select(db.func.count()).select_from(event_waitlist)
+            .where(event_waitlist.c.event_id == event_id)
+        ).scalar() == 0
+
+def test_delete_event_with_waitlist(client, app, user_token, publisher_token):
+    """Test that deleting an event removes its waitlist."""
+    from app import db
+    from app.models import event_waitlist
+
+    event_id = _create_event(client, publisher_token, title='Small Event', capacity=1)
+    client.post(f'/api/events/{event_id}/register', headers={'Authorization': f'Bearer {user_token}'})
+    client.post(f'/api/events/{event_id}/waitlist', headers=_user_headers(app, 'waitlist_deleted'))
+
+    response = client.delete(f'/api/events/{event_id}', headers={'Authorization': f'Bearer {publisher_token}'})
+    assert response.status_code == 200
+    with app.app_context():
+        assert db.session.execute(db.select(event_waitlist)).first() is None
@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timedelta
+from app import db
+from app.models import Event, idempotency_keys
+from app.services.admission import get_gate
+
+def _headers(token, key):
+    return {'Authorization': f'Bearer {token}', 'Idempotency-Key': key}
+
+def test_retry_replays_first_response(client, app, user_token):
+    """Test that a retried unregister/register gets the original response back."""
+    first = client.delete('/api/events/1/unregister', headers=_headers(user_token, 'unregister-1'))
+    assert first.status_code == 200
+    assert 'Idempotent-Replayed' not in first.headers
+
+    # Run again, the handler would answer "Not registered for this event"
+    retry = client.delete('/api/events/1/unregister', headers=_headers(user_token, 'unregister-1'))
+    assert retry.status_code == 200
+    assert retry.data == first.data
+    assert retry.headers['Content-Type'] == first.headers['Content-Type']
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+
+    first = client.post('/api/events/1/register', headers=_headers(user_token, 'register-1'))
+    retry = client.post('/api/events/1/register', headers=_headers(user_token, 'register-1'))
+    assert (first.status_code, retry.status_code) == (200, 200)
+    assert retry.data == first.data
+    with app.app_context():
+        assert db.session.get(Event, 1).attendee_count == 1
+
+    # Without a key every request runs
+    response = client.post('/api/events/1/register', headers={'Authorization': f'Bearer {user_token}'})
+    assert json.loads(response.data)['message'] == 'Already registered for this event'
+
+def test_create_event_once_per_key(client, app, publisher_token):
+    """Test that retrying an event creation does not create a duplicate."""
+    payload = {
+        'title': 'Retried Event',
+        'description': 'Sent twice',
+        'location': 'Flaky Network',
+        'start_time': '2030-01-01T10:00:00',
+        'end_time': '2030-01-01T12:00:00',
+    }
+    first = client.post('/api/events/', headers=_headers(publisher_token, 'create-1'), json=payload)
+    retry = client.post('/api/events/', headers=_headers(publisher_token, 'create-1'), json=payload)
+    assert (first.status_code, retry.status_code) == (201, 201)
+    assert json.loads(retry.data)['event']['id'] == json.loads(first.data)['event']['id']
+    with app.app_context():
+        assert Event.query.filter_by(title='Retried Event').count() == 1
+
+    # The same key cannot stand for another request
+    response = client.post('/api/events/', headers=_headers(publisher_token, 'create-1'),
+                           json={**payload, 'title': 'Another Event'})
+    assert response.status_code == 422
+
+def test_keys_are_scoped_to_user_and_route(client, user_token, publisher_token):
+    """Test that one key used by different users or on different routes does not collide."""
+    response = client.delete('/api/events/1/unregister', headers=_headers(user_token, 'shared'))
+    assert response.status_code == 200
+    response = client.post('/api/events/1/register', headers=_headers(user_token, 'shared'))
+    assert response.status_code == 200
+    assert 'Idempotent-Replayed' not in response.headers
+
+    response = client.delete('/api/events/1/unregister', headers=_headers(publisher_token, 'shared'))
+    assert json.loads(response.data)['message'] == 'Not registered for this event'
+
+def test_shed_responses_are_not_stored(client, app, user_token):
+    """Test that a 429 from the admission gate is not replayed on retry."""
+    client.delete('/api/events/1/unregister', headers={'Authorization': f'Bearer {user_token}'})
+    gate = get_gate(app)
+    for _ in range(app.config['ADMISSION_MAX_IN_FLIGHT']):
+        gate.enter(1)
+    response = client.post('/api/events/1/register', headers=_headers(user_token, 'busy'))
+    assert response.status_code == 429
+
+    for _ in range(app.config['ADMISSION_MAX_IN_FLIGHT']):
+        gate.leave(1)
+    response = client.post('/api/events/1/register', headers=_headers(user_token, 'busy'))
+    assert response.status_code == 200
+
+def test_expired_keys_are_pruned(client, app, user_token):
+    """Test that stored responses expire and are pruned."""
+    client.delete('/api/events/1/unregister', headers=_headers(user_token, 'old'))
+    with app.app_context():
+        db.session.execute(idempotency_keys.update().values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+
+    # An expired key runs the request again
+    response = client.delete('/api/events/1/unregister', headers=_headers(user_token, 'old'))
+    assert json.loads(response.data)['message'] == 'Not registered for this event'
+    assert 'Idempotent-Replayed' not in response.headers
+
+    result = app.test_cli_runner().invoke(args=['events', 'prune-idempotency-keys'])
+    assert 'Pruned 0 idempotency keys' in result.output
+    with app.app_context():
+        db.session.execute(idempotency_keys.update().values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=['events', 'prune-idempotency-keys'])
+    assert 'Pruned 1 idempotency keys' in result.output
+
+def test_invalid_idempotency_key(client, user_token):
+    """Test that empty or overlong keys are refused."""
+    response = client.post('/api/events/1/register', headers=_headers(user_token, 'k' * 256))
+    assert response.status_code == 400
+    response = client.post('/api/events/1/register', headers=_headers(user_token, ''))
+    assert response.status_code == 400
@@ -0,0 +1,96 @@
+import json
+import logging
+import pytest
+from app import create_app, db
+from app.utils import log
+from app.utils.log import JSONFormatter, SamplingFilter
+
+def _record(level=logging.DEBUG, msg='Event %s loaded', args=(1,), **extra):
+    record = logging.makeLogRecord({'name': 'app.test', 'levelno': level, 'levelname': logging.getLevelName(level),
+                                    'msg': msg, 'args': args})
+    record.__dict__.update(extra)
+    return record
+
+@pytest.fixture
+def logging_app(capsys):
+    """An app logging through the background queue (tests normally log synchronously)."""
+    def build(**config):
+        settings = {'TESTING': False, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:', 'QUERY_DEBUG': False}
+        settings.update(config)
+        app = create_app(settings)
+        with app.app_context():
+            db.create_all()
+        return app
+    yield build
+
+    # Back to synchronous logging for the rest of the suite
+    create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+
+def _logged_lines(capsys):
+    """Flush the queue and return the JSON records written to stderr."""
+    log._stop_listener()
+    return [json.loads(line) for line in capsys.readouterr().err.splitlines() if line.startswith('{')]
+
+def test_json_formatter():
+    """Test that records become single-line JSON objects including extra fields."""
+    entry = json.loads(JSONFormatter().format(_record(event_id=7)))
+
+    assert entry['level'] == 'DEBUG'
+    assert entry['logger'] == 'app.test'
+    assert entry['message'] == 'Event 1 loaded'
+    assert entry['event_id'] == 7
+    assert 'time' in entry
+
+def test_json_formatter_includes_exception():
+    """Test that tracebacks are kept in their own field."""
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        import sys
+        record = _record(level=logging.ERROR, exc_info=sys.exc_info())
+
+    entry = json.loads(JSONFormatter().format(record))
+    assert 'ValueError: boom' in entry['exception']
+
+def test_sampling_filter():
+    """Test that only the configured levels are sampled and kept records are marked."""
+    assert not SamplingFilter({'DEBUG': 0}).filter(_record())
+    assert SamplingFilter({'DEBUG': 0}).filter(_record(level=logging.INFO))
+
+    sampler = SamplingFilter({'DEBUG': 0.25})
+    kept = [record for record in (_record() for _ in range(4000)) if sampler.filter(record)]
+    assert 800 < len(kept) < 1200
+    assert all(record.sample_rate == 0.25 for record in kept)
+
+def test_request_logs_written_as_json(logging_app, capsys):
+    """Test that request logging goes through the queue as JSON with the request attached."""
+    app = logging_app(LOG_LEVEL='DEBUG', LOG_DEBUG_ENABLED=True, LOG_SAMPLE_RATES={})
+
+    response = app.test_client().get('/api/events/999')
+    assert response.status_code == 404
+
+    lines = _logged_lines(capsys)
+    entry = next(line for line in lines if line['message'] == 'Event 999 not found')
+    assert entry['logger'] == 'app.routes.events'
+    assert entry['path'] == '/api/events/999'
+    assert entry['endpoint'] == 'events.get_event'
+
+def test_debug_logging_disabled(logging_app, capsys):
+    """Test that LOG_DEBUG_ENABLED = False drops debug records before they are built."""
+    app = logging_app(LOG_LEVEL='DEBUG', LOG_DEBUG_ENABLED=False)
+
+    assert not logging.getLogger('app.routes.events').isEnabledFor(logging.DEBUG)
+    app.test_client().get('/api/events/999')
+    assert not [line for line in _logged_lines(capsys) if line['level'] == 'DEBUG']
+
+def test_production_disables_debug_logging():
+    """Test that the production settings never enable debug logging."""
+    from config import ProductionConfig
+    assert ProductionConfig.LOG_DEBUG_ENABLED is False
+
+def test_event_views_do_not_print(client, capsys):
+    """Test that hot paths no longer write to stdout."""
+    client.get('/api/events/1')
+    client.get('/api/events/2')
+
+    assert capsys.readouterr().out == ''
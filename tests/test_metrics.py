@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import textwrap
+from prometheus_client.parser import text_string_to_metric_families
+
+def _parse(text):
+    """Parse Prometheus text output into {(name, labels): value}"""
+    samples = {}
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            samples[(sample.name, tuple(sorted(sample.labels.items())))] = sample.value
+    return samples
+
+def _samples(response):
+    return _parse(response.data.decode('utf-8'))
+
+def _value(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0)
+
+def test_metrics_endpoint(client):
+    """Test that /metrics serves the Prometheus text format."""
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert b'event_manager_request_duration_seconds' in response.data
+
+def test_request_metrics_recorded(client):
+    """Test that requests record wall time, SQL statements and response size per endpoint."""
+    labels = {'endpoint': 'events.get_events', 'method': 'GET'}
+    before = _samples(client.get('/metrics'))
+
+    response = client.get('/api/events/?limit=1')
+    size = len(response.data)
+    response.close()
+
+    after = _samples(client.get('/metrics'))
+    duration = dict(labels, status='200')
+    assert _value(after, 'event_manager_request_duration_seconds_count', **duration) == \
+        _value(before, 'event_manager_request_duration_seconds_count', **duration) + 1
+
+    queries = _value(after, 'event_manager_request_db_queries_sum', **labels) - \
+        _value(before, 'event_manager_request_db_queries_sum', **labels)
+    assert queries >= 2  # Listing version check and the page itself
+
+    assert _value(after, 'event_manager_response_size_bytes_sum', **labels) - \
+        _value(before, 'event_manager_response_size_bytes_sum', **labels) == size
+
+    assert _value(after, 'event_manager_request_db_duration_seconds_count', **labels) == \
+        _value(before, 'event_manager_request_db_duration_seconds_count', **labels) + 1
+
+def test_unmatched_urls_share_a_label(client):
+    """Test that unknown URLs do not create a series each."""
+    client.get('/api/nope/1').close()
+    client.get('/api/nope/2').close()
+
+    samples = _samples(client.get('/metrics'))
+    assert _value(samples, 'event_manager_request_duration_seconds_count',
+                  endpoint='unmatched', method='GET', status='404') >= 2
+
+def test_metrics_aggregate_worker_processes(tmp_path):
+    """Test that multiprocess mode merges the samples of separate worker processes."""
+    script = textwrap.dedent('''
+        import sys
+        from app import create_app, db
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+        with app.app_context():
+            db.create_all()
+        client = app.test_client()
+        if sys.argv[1] == 'request':
+            client.get('/api/events/').close()
+        else:
+            sys.stdout.write(client.get('/metrics').data.decode('utf-8'))
+    ''')
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    # Two "workers" each serve a request, a third serves the scrape
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', script, 'request'], cwd=root, env=env, check=True)
+    output = subprocess.run([sys.executable, '-c', script, 'scrape'], cwd=root, env=env, check=True,
+                            capture_output=True, text=True).stdout
+
+    assert _value(_parse(output), 'event_manager_request_db_queries_count',
+                  endpoint='events.get_events', method='GET') == 2
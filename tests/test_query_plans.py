@@ -0,0 +1,150 @@
+import re
+from datetime import datetime
+import pytest
+from sqlalchemy import event as sa_event
+from app import db
+from app.utils.pagination import encode_cursor
+
+# Tables that grow with usage: a plain scan of any of them is a regression
+LARGE_TABLES = ('events', 'event_attendees', 'event_waitlist', 'seat_holds', 'users')
+
+# SQLite reports "SCAN <table>" for a full scan, "SCAN <table> USING [COVERING] INDEX ..."
+# for an ordered index walk and "SEARCH ..." for an index lookup
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+POSTGRES_FULL_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+def _capture_statements(app, fn):
+    """Run fn and return the (statement, parameters) of every query it executed"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    sa_event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        fn()
+    finally:
+        sa_event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return statements
+
+def _full_scans(statement, parameters):
+    """Tables the database would scan in full to run the statement"""
+    connection = db.session.connection()
+    if connection.dialect.name == 'postgresql':
+        # Tiny test tables always favour seq scans; ask whether an index could be used at all
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        plan = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).scalars().all()
+        pattern = POSTGRES_FULL_SCAN
+    else:
+        plan = [row.detail for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+        pattern = SQLITE_FULL_SCAN
+
+    scans = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and match.group(1) in LARGE_TABLES:
+            scans.append(line.strip())
+    return scans
+
+def assert_no_full_scans(app, fn):
+    statements = _capture_statements(app, fn)
+    assert statements, 'no queries were captured'
+    with app.app_context():
+        for statement, parameters in statements:
+            scans = _full_scans(statement, parameters)
+            assert not scans, f'full table scan {scans} for query:\n{statement}'
+        db.session.rollback()
+
+def _auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+@pytest.mark.parametrize('path', [
+    '/api/events/',
+    '/api/events/?from=2023-01-01T00:00:00Z&to=2024-01-01T00:00:00Z',
+    '/api/events/?location=Test',
+    '/api/events/search?q=test',
+])
+def test_public_event_queries_use_indexes(client, app, path):
+    """Test that the public event listings never scan whole tables."""
+    assert_no_full_scans(app, lambda: client.get(path))
+
+def test_event_detail_queries_use_indexes(client, app, user_token):
+    """Test that event detail views look rows up by key."""
+    assert_no_full_scans(app, lambda: client.get('/api/events/1'))
+    assert_no_full_scans(app, lambda: client.get('/api/events/1', headers=_auth(user_token)))
+
+def test_publisher_queries_use_indexes(client, app, publisher_token):
+    """Test that a publisher's listings and attendee lists use indexes."""
+    headers = _auth(publisher_token)
+    assert_no_full_scans(app, lambda: client.get('/api/events/all', headers=headers))
+    assert_no_full_scans(app, lambda: client.get('/api/events/my-events', headers=headers))
+    assert_no_full_scans(app, lambda: client.get('/api/events/1/attendees', headers=headers))
+    cursor = encode_cursor(datetime(2023, 1, 1), 1)
+    assert_no_full_scans(app, lambda: client.get(
+        f'/api/events/1/attendees?cursor={cursor}&username=user&fields=username', headers=headers
+    ))
+
+def test_admin_listing_uses_index(client, app, admin_token):
+    """Test that the unfiltered event listing walks the start time index."""
+    assert_no_full_scans(app, lambda: client.get('/api/events/all', headers=_auth(admin_token)))
+
+def test_user_queries_use_indexes(client, app, user_token):
+    """Test that registration and profile queries use indexes."""
+    headers = _auth(user_token)
+    assert_no_full_scans(app, lambda: client.get('/api/events/my-registrations', headers=headers))
+    assert_no_full_scans(app, lambda: client.get('/api/users/publishers', headers=headers))
+    assert_no_full_scans(app, lambda: client.get('/api/auth/me', headers=headers))
+
+def test_registration_queries_use_indexes(client, app, user_token):
+    """Test that registering and unregistering touch rows by key only."""
+    headers = _auth(user_token)
+    assert_no_full_scans(app, lambda: client.delete('/api/events/1/unregister', headers=headers))
+    assert_no_full_scans(app, lambda: client.post('/api/events/1/register', headers=headers))
+
+def test_waitlist_queries_use_indexes(client, app, user_token):
+    """Test that joining, leaving and promoting from the waitlist touch rows by key only."""
+    from app.models import Event
+    from app.services.registration import promote_waitlist
+
+    with app.app_context():
+        db.session.execute(db.update(Event).where(Event.id == 1).values(capacity=1))
+        db.session.commit()
+
+    headers = _auth(user_token)
+    assert_no_full_scans(app, lambda: client.delete('/api/events/1/unregister', headers=headers))
+    assert_no_full_scans(app, lambda: client.post('/api/events/1/register', headers=headers))
+    assert_no_full_scans(app, lambda: client.get('/api/events/1/waitlist', headers=headers))
+    assert_no_full_scans(app, lambda: client.delete('/api/events/1/waitlist', headers=headers))
+
+    def promote():
+        with app.app_context():
+            promote_waitlist(1)
+            db.session.rollback()
+    assert_no_full_scans(app, promote)
+
+def test_seat_hold_queries_use_indexes(client, app, user_token):
+    """Test that holds are taken, confirmed, released and reclaimed by key only."""
+    from app.services.registration import release_expired_holds
+
+    headers = _auth(user_token)
+    client.delete('/api/events/1/unregister', headers=headers)
+    assert_no_full_scans(app, lambda: client.post('/api/events/1/hold', headers=headers))
+    assert_no_full_scans(app, lambda: client.delete('/api/events/1/hold', headers=headers))
+    client.post('/api/events/1/hold', headers=headers)
+    assert_no_full_scans(app, lambda: client.post('/api/events/1/hold/confirm', headers=headers))
+
+    def reclaim():
+        with app.app_context():
+            release_expired_holds(1)
+            db.session.rollback()
+    assert_no_full_scans(app, reclaim)
+
+def test_login_query_uses_index(client, app):
+    """Test that logging in looks the user up by the unique email index."""
+    assert_no_full_scans(app, lambda: client.post('/api/auth/login', json={
+        'email': 'user@test.com',
+        'password': 'password'
+    }))
@@ -0,0 +1,94 @@
+import logging
+import pytest
+from datetime import datetime
+from app import create_app, db
+from app.models import Event
+from app.utils.query_tracking import track_queries
+
+def _add_events(count, publisher_id):
+    """Insert unpublished events so lazy loads have several parents to run for."""
+    db.session.add_all([
+        Event(
+            title=f'Lazy Event {i}',
+            description='N+1 test event',
+            location='Lazy Hall',
+            start_time=datetime(2024, 1, 1, 9, 0, 0),
+            end_time=datetime(2024, 1, 1, 11, 0, 0),
+            publisher_id=publisher_id
+        )
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def test_track_queries_counts_statements(app):
+    """Test that every statement run inside the block is recorded."""
+    with track_queries(app) as tracker:
+        with app.app_context():
+            Event.query.all()
+            Event.query.count()
+
+    assert len(tracker) == 2
+    assert not tracker.n_plus_one()
+
+def test_detects_n_plus_one_lazy_loads(app):
+    """Test that lazy-loading a relationship per row is reported by name."""
+    with app.app_context():
+        _add_events(5, publisher_id=2)
+
+    with track_queries(app) as tracker:
+        with app.app_context():
+            for event in Event.query.all():
+                event.attendees
+
+    assert tracker.n_plus_one() == {'Event.attendees': 7}
+    assert 'Event.attendees lazy-loaded 7 times' in tracker.report()
+
+def test_eager_loading_is_not_n_plus_one(app):
+    """Test that a batched eager load of the same relationship is not reported."""
+    with app.app_context():
+        _add_events(5, publisher_id=2)
+
+    with track_queries(app) as tracker:
+        with app.app_context():
+            for event in Event.query.options(db.selectinload(Event.attendees)).all():
+                event.attendees
+
+    assert len(tracker) == 2
+    assert not tracker.n_plus_one()
+
+def test_query_budget_fails_on_n_plus_one(app, query_budget):
+    """Test that the budget fixture rejects N+1 patterns even under the statement limit."""
+    with app.app_context():
+        _add_events(5, publisher_id=2)
+
+    with pytest.raises(AssertionError, match='Event.attendees'):
+        with query_budget(100):
+            with app.app_context():
+                for event in Event.query.all():
+                    event.attendees
+
+def test_dev_mode_warns_about_n_plus_one(caplog):
+    """Test that QUERY_DEBUG logs the relationship a request lazy-loads per row."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'QUERY_DEBUG': True,
+    })
+
+    @app.route('/attendee-counts')
+    def attendee_counts():
+        return {'counts': [len(event.attendees) for event in Event.query.all()]}
+
+    with app.app_context():
+        db.create_all()
+        _add_events(5, publisher_id=1)
+
+    with caplog.at_level(logging.WARNING):
+        response = app.test_client().get('/attendee-counts')
+
+    assert response.status_code == 200
+    assert 'N+1 query: GET /attendee-counts lazy-loaded Event.attendees 5 times' in caplog.text
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
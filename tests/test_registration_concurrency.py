@@ -0,0 +1,350 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Event, UserRole, event_attendees, event_waitlist, seat_holds
+from app.utils.query_tracking import track_queries
+from app.services.admission import create_admission_gate, get_gate
+from app.services.holds import get_sweeper
+from app.services.registration import register_attendee
+
+CAPACITY = 40
+USERS = 160
+THREADS = 8
+
+@pytest.fixture
+def stress_app(tmp_path):
+    """App backed by a file database so each thread gets its own connection."""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'stress.db'}",
+        'BCRYPT_LOG_ROUNDS': 4,
+        'PASSWORD_HASH_WORKERS': 0,
+        # Let every attempt reach the database guards; the gate has its own tests below
+        'ADMISSION_BACKEND': 'null',
+    })
+
+    with app.app_context():
+        db.create_all()
+        publisher = User(username='stress_publisher', email='stress_publisher@test.com',
+                         password='password', role=UserRole.PUBLISHER)
+        db.session.add(publisher)
+        db.session.commit()
+
+        # Bulk insert attendees with a placeholder hash; they never log in
+        db.session.execute(User.__table__.insert(), [
+            {'username': f'stress_user_{i}', 'email': f'stress_user_{i}@test.com',
+             'password_hash': 'unused', 'role': UserRole.USER}
+            for i in range(USERS)
+        ])
+        event = Event(
+            title='Popular Event',
+            description='Everyone wants in',
+            location='Main Hall',
+            start_time=datetime(2024, 6, 1, 18, 0),
+            end_time=datetime(2024, 6, 1, 22, 0),
+            capacity=CAPACITY,
+            is_published=True,
+            publisher_id=publisher.id
+        )
+        db.session.add(event)
+        db.session.commit()
+
+        app.config['STRESS_EVENT_ID'] = event.id
+        app.config['STRESS_TOKENS'] = [
+            create_access_token(identity=str(user_id))
+            for (user_id,) in db.session.query(User.id).filter(User.role == UserRole.USER)
+        ]
+
+    yield app
+
+    get_sweeper(app).stop()
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+def test_concurrent_registration_never_overbooks(stress_app):
+    """Hammer one event from many threads and check capacity is enforced exactly."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    tokens = stress_app.config['STRESS_TOKENS']
+    statuses = []
+    messages = []
+    lock = threading.Lock()
+
+    def worker(chunk):
+        client = stress_app.test_client()
+        for token in chunk:
+            response = client.post(f'/api/events/{event_id}/register', headers={
+                'Authorization': f'Bearer {token}'
+            })
+            with lock:
+                statuses.append(response.status_code)
+                messages.append(json.loads(response.data)['message'])
+
+    threads = [threading.Thread(target=worker, args=(tokens[i::THREADS],)) for i in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{len(statuses)} registration attempts from {THREADS} threads in {elapsed:.2f}s "
+          f"({len(statuses) / elapsed:.0f} registrations/sec)")
+
+    assert len(statuses) == USERS
+    assert statuses.count(200) == CAPACITY
+    assert messages.count('Event is at full capacity') == USERS - CAPACITY
+
+    with stress_app.app_context():
+        event = db.session.get(Event, event_id)
+        assert event.attendee_count == CAPACITY
+        assert len(event.attendees) == CAPACITY
+
+def test_concurrent_duplicate_registration(stress_app):
+    """The same user registering from several threads at once gets exactly one seat."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    token = stress_app.config['STRESS_TOKENS'][0]
+    statuses = []
+
+    def worker():
+        response = stress_app.test_client().post(f'/api/events/{event_id}/register', headers={
+            'Authorization': f'Bearer {token}'
+        })
+        statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses.count(200) == 1
+    assert statuses.count(400) == THREADS - 1
+
+    with stress_app.app_context():
+        assert db.session.get(Event, event_id).attendee_count == 1
+
+def test_concurrent_idempotent_retries(stress_app):
+    """Duplicates sent with one Idempotency-Key at once run once and share the response."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    token = stress_app.config['STRESS_TOKENS'][0]
+    responses = []
+
+    def worker():
+        response = stress_app.test_client().post(f'/api/events/{event_id}/register', headers={
+            'Authorization': f'Bearer {token}',
+            'Idempotency-Key': 'retry-storm'
+        })
+        responses.append((response.status_code, response.data))
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(responses) == THREADS
+    assert {status for status, _ in responses} == {200}
+    assert len({body for _, body in responses}) == 1
+
+    with stress_app.app_context():
+        assert db.session.get(Event, event_id).attendee_count == 1
+
+def _user_ids(stress_app):
+    """Ids of the stress users, in the order of STRESS_TOKENS."""
+    with stress_app.app_context():
+        return [user_id for (user_id,) in db.session.query(User.id).filter(User.role == UserRole.USER)]
+
+def _run_concurrently(stress_app, method, path, tokens):
+    """Send one request per token from THREADS threads and return the status codes."""
+    statuses = []
+    lock = threading.Lock()
+
+    def worker(chunk):
+        client = stress_app.test_client()
+        for token in chunk:
+            response = client.open(path, method=method, headers={'Authorization': f'Bearer {token}'})
+            with lock:
+                statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=worker, args=(tokens[i::THREADS],)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return statuses
+
+def test_concurrent_waitlist_promotion(stress_app):
+    """Seats freed concurrently go to the head of the waitlist, once each, in order."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    tokens = stress_app.config['STRESS_TOKENS']
+    registered, waiting = tokens[:CAPACITY], tokens[CAPACITY:]
+
+    with stress_app.app_context():
+        user_ids = _user_ids(stress_app)
+        for user_id in user_ids[:CAPACITY]:
+            register_attendee(event_id, user_id)
+
+    statuses = _run_concurrently(stress_app, 'POST', f'/api/events/{event_id}/waitlist', waiting)
+    assert statuses == [201] * len(waiting)
+
+    with stress_app.app_context():
+        queue = [row.user_id for row in db.session.execute(
+            db.select(event_waitlist.c.user_id, event_waitlist.c.position)
+            .where(event_waitlist.c.event_id == event_id)
+            .order_by(event_waitlist.c.position)
+        )]
+        assert sorted(queue) == sorted(user_ids[CAPACITY:])
+
+    started = time.perf_counter()
+    statuses = _run_concurrently(stress_app, 'DELETE', f'/api/events/{event_id}/unregister', registered)
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(statuses)} unregistrations with promotion from {THREADS} threads in {elapsed:.2f}s "
+          f"({len(statuses) / elapsed:.0f}/sec)")
+    assert statuses == [200] * CAPACITY
+
+    with stress_app.app_context():
+        event = db.session.get(Event, event_id)
+        attendees = {user_id for (user_id,) in db.session.execute(
+            db.select(event_attendees.c.user_id).where(event_attendees.c.event_id == event_id)
+        )}
+        still_waiting = [user_id for (user_id,) in db.session.execute(
+            db.select(event_waitlist.c.user_id)
+            .where(event_waitlist.c.event_id == event_id)
+            .order_by(event_waitlist.c.position)
+        )]
+
+        assert event.attendee_count == len(attendees) == CAPACITY
+        # The first CAPACITY in line were promoted and the rest kept their order
+        assert attendees == set(queue[:CAPACITY])
+        assert still_waiting == queue[CAPACITY:]
+        assert not attendees & set(still_waiting)
+
+def _seat_counts(stress_app, event_id):
+    """(registrations, holds) of the event, checked against its counters in one snapshot."""
+    with stress_app.app_context():
+        row = db.session.execute(db.select(
+            Event.attendee_count,
+            Event.held_count,
+            db.select(db.func.count()).where(event_attendees.c.event_id == event_id).scalar_subquery(),
+            db.select(db.func.count()).where(seat_holds.c.event_id == event_id).scalar_subquery(),
+        ).where(Event.id == event_id)).one()
+        assert row[:2] == row[2:]
+        return tuple(row[2:])
+
+def test_concurrent_holds_never_overbook(stress_app):
+    """Holds and confirmations from many threads never hand out more seats than capacity."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    tokens = stress_app.config['STRESS_TOKENS']
+
+    started = time.perf_counter()
+    statuses = _run_concurrently(stress_app, 'POST', f'/api/events/{event_id}/hold', tokens)
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(statuses)} hold attempts from {THREADS} threads in {elapsed:.2f}s "
+          f"({len(statuses) / elapsed:.0f}/sec)")
+    assert statuses.count(201) == CAPACITY
+    assert statuses.count(400) == USERS - CAPACITY
+    assert _seat_counts(stress_app, event_id) == (0, CAPACITY)
+
+    with stress_app.app_context():
+        holders = {user_id for (user_id,) in db.session.execute(db.select(seat_holds.c.user_id))}
+    holder_tokens = [token for token, user_id in zip(tokens, _user_ids(stress_app)) if user_id in holders]
+    others = [token for token in tokens if token not in holder_tokens]
+
+    # Half the holders confirm while everyone else keeps trying to register
+    confirming = holder_tokens[:CAPACITY // 2]
+    results = {}
+    threads = [
+        threading.Thread(target=lambda: results.update(confirm=_run_concurrently(
+            stress_app, 'POST', f'/api/events/{event_id}/hold/confirm', confirming))),
+        threading.Thread(target=lambda: results.update(register=_run_concurrently(
+            stress_app, 'POST', f'/api/events/{event_id}/register', others))),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results['confirm'] == [200] * len(confirming)
+    assert results['register'] == [400] * len(others)
+    assert _seat_counts(stress_app, event_id) == (CAPACITY // 2, CAPACITY // 2)
+
+    # The unconfirmed holds lapse and their seats go to the next wave
+    expired = get_sweeper(stress_app).run_pending(
+        now=datetime.utcnow() + timedelta(seconds=stress_app.config['SEAT_HOLD_TTL'] + 1)
+    )
+    assert expired == CAPACITY // 2
+    assert _seat_counts(stress_app, event_id) == (CAPACITY // 2, 0)
+
+    statuses = _run_concurrently(stress_app, 'POST', f'/api/events/{event_id}/register', others)
+    assert statuses.count(200) == CAPACITY // 2
+    assert _seat_counts(stress_app, event_id) == (CAPACITY, 0)
+
+def test_sweeper_thread_releases_holds(stress_app):
+    """The background sweeper releases unconfirmed holds once their TTL runs out."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    stress_app.config['SEAT_HOLD_TTL'] = 1
+
+    statuses = _run_concurrently(stress_app, 'POST', f'/api/events/{event_id}/hold',
+                                 stress_app.config['STRESS_TOKENS'][:20])
+    assert statuses == [201] * 20
+
+    deadline = time.monotonic() + 10
+    while _seat_counts(stress_app, event_id) != (0, 0) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert _seat_counts(stress_app, event_id) == (0, 0)
+    assert get_sweeper(stress_app).expired == 20
+
+def test_admission_gate_sheds_doomed_attempts(stress_app):
+    """With the gate on, attempts for a sold-out event never reach the database."""
+    event_id = stress_app.config['STRESS_EVENT_ID']
+    tokens = stress_app.config['STRESS_TOKENS']
+    stress_app.config.update(ADMISSION_BACKEND='memory', ADMISSION_MAX_IN_FLIGHT=4)
+    stress_app.extensions['admission_gate'] = create_admission_gate(stress_app)
+    gate = get_gate(stress_app)
+
+    started = time.perf_counter()
+    statuses = _run_concurrently(stress_app, 'POST', f'/api/events/{event_id}/register', tokens)
+    elapsed = time.perf_counter() - started
+    print(f"\n{len(statuses)} gated registration attempts from {THREADS} threads in {elapsed:.2f}s "
+          f"({len(statuses) / elapsed:.0f}/sec), {gate.stats.to_dict()}")
+
+    # Shedding never leaves seats empty: attempts are only shed while others are in flight
+    assert statuses.count(200) == CAPACITY
+    assert statuses.count(400) + statuses.count(429) == USERS - CAPACITY
+    stats = gate.stats.to_dict()
+    assert stats['shed'] == statuses.count(429)
+    assert stats['accepted'] + stats['rejected'] + stats['shed'] == USERS
+    assert _seat_counts(stress_app, event_id) == (CAPACITY, 0)
+
+    with stress_app.app_context():
+        registered = {user_id for (user_id,) in db.session.execute(
+            db.select(event_attendees.c.user_id).where(event_attendees.c.event_id == event_id)
+        )}
+    tokens_by_user = dict(zip(_user_ids(stress_app), tokens))
+    attendee = next(token for user_id, token in tokens_by_user.items() if user_id in registered)
+    others = [token for user_id, token in tokens_by_user.items() if user_id not in registered]
+
+    # The event is now known to be full
+    statuses = _run_concurrently(stress_app, 'POST', f'/api/events/{event_id}/register', others)
+    assert statuses == [400] * len(others)
+    assert gate.stats.to_dict()['rejected'] == stats['rejected'] + len(others)
+    with track_queries(stress_app) as tracker:
+        response = stress_app.test_client().post(f'/api/events/{event_id}/register', headers={
+            'Authorization': f'Bearer {others[0]}'
+        })
+    assert response.status_code == 400
+    assert len(tracker) == 0
+
+    # A freed seat reopens the event
+    response = stress_app.test_client().delete(f'/api/events/{event_id}/unregister', headers={
+        'Authorization': f'Bearer {attendee}'
+    })
+    assert response.status_code == 200
+    response = stress_app.test_client().post(f'/api/events/{event_id}/register', headers={
+        'Authorization': f'Bearer {others[0]}'
+    })
+    assert response.status_code == 200
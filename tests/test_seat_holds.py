@@ -0,0 +1,134 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import User, Event, seat_holds
+from app.services.admission import get_gate
+from app.services.holds import get_sweeper
+
+@pytest.fixture
+def small_event(app):
+    """A published event with a single seat and no registrations."""
+    with app.app_context():
+        event = Event(
+            title='Flash Sale',
+            description='One seat only',
+            location='Small Room',
+            start_time=datetime(2024, 6, 1, 18, 0),
+            end_time=datetime(2024, 6, 1, 20, 0),
+            capacity=1,
+            is_published=True,
+            publisher_id=User.query.filter_by(email='publisher@test.com').first().id
+        )
+        db.session.add(event)
+        db.session.commit()
+        return event.id
+
+def _headers(app, name):
+    """Create a regular user and return their authorization headers."""
+    with app.app_context():
+        user = User(username=name, email=f'{name}@test.com', password='password')
+        db.session.add(user)
+        db.session.commit()
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+def _expire_all_holds(app):
+    """Move every hold's deadline into the past."""
+    with app.app_context():
+        db.session.execute(seat_holds.update().values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.session.commit()
+
+def test_hold_and_confirm(client, app, small_event):
+    """Test that a held seat counts against capacity until it is confirmed."""
+    first = _headers(app, 'hold_first')
+    second = _headers(app, 'hold_second')
+
+    response = client.post(f'/api/events/{small_event}/hold', headers=first)
+    assert response.status_code == 201
+    hold = json.loads(response.data)['hold']
+    assert hold['event_id'] == small_event
+    assert datetime.fromisoformat(hold['expires_at']) > datetime.utcnow()
+
+    event = json.loads(client.get(f'/api/events/{small_event}').data)
+    assert event['held_count'] == 1
+    assert event['attendee_count'] == 0
+    assert event['is_full'] is True
+
+    # The held seat is not available to anyone else
+    response = client.post(f'/api/events/{small_event}/hold', headers=second)
+    assert json.loads(response.data)['message'] == 'Event is at full capacity'
+    response = client.post(f'/api/events/{small_event}/register', headers=second)
+    assert json.loads(response.data)['message'] == 'Event is at full capacity'
+
+    # Known to be full, so turned away by the admission gate before any database check
+    response = client.post(f'/api/events/{small_event}/hold', headers=first)
+    assert json.loads(response.data)['message'] == 'Event is at full capacity'
+    get_gate(app).reopen(small_event)
+    response = client.post(f'/api/events/{small_event}/hold', headers=first)
+    assert json.loads(response.data)['message'] == 'Already holding a seat for this event'
+
+    response = client.post(f'/api/events/{small_event}/hold/confirm', headers=first)
+    assert response.status_code == 200
+    event = json.loads(response.data)['event']
+    assert (event['attendee_count'], event['held_count']) == (1, 0)
+
+    response = client.post(f'/api/events/{small_event}/hold/confirm', headers=first)
+    assert response.status_code == 400
+    assert json.loads(response.data)['message'] == 'No seat held for this event'
+    response = client.post(f'/api/events/{small_event}/hold', headers=first)
+    assert json.loads(response.data)['message'] == 'Already registered for this event'
+
+def test_release_hold(client, app, small_event):
+    """Test that releasing a hold frees the seat."""
+    headers = _headers(app, 'hold_release')
+    client.post(f'/api/events/{small_event}/hold', headers=headers)
+
+    response = client.delete(f'/api/events/{small_event}/hold', headers=headers)
+    assert response.status_code == 200
+    assert json.loads(client.get(f'/api/events/{small_event}').data)['held_count'] == 0
+
+    response = client.delete(f'/api/events/{small_event}/hold', headers=headers)
+    assert response.status_code == 400
+    response = client.delete('/api/events/9999/hold', headers=headers)
+    assert response.status_code == 404
+
+def test_sweeper_expires_due_holds(client, app, small_event):
+    """Test that the sweeper releases holds at their deadline and promotes the waitlist."""
+    holder = _headers(app, 'hold_expiring')
+    waiting = _headers(app, 'hold_waiting')
+    client.post(f'/api/events/{small_event}/hold', headers=holder)
+    response = client.post(f'/api/events/{small_event}/waitlist', headers=waiting)
+    assert json.loads(response.data)['status'] == 'waitlisted'
+
+    sweeper = get_sweeper(app)
+    assert sweeper.pending() == 1
+    assert sweeper.run_pending() == 0
+    assert sweeper.run_pending(now=datetime.utcnow() + timedelta(seconds=app.config['SEAT_HOLD_TTL'] + 1)) == 1
+    assert sweeper.pending() == 0
+
+    event = json.loads(client.get(f'/api/events/{small_event}?include=registration_status', headers=waiting).data)
+    assert (event['attendee_count'], event['held_count']) == (1, 0)
+    assert event['registration_status']['registered'] is True
+
+    response = client.post(f'/api/events/{small_event}/hold/confirm', headers=holder)
+    assert json.loads(response.data)['message'] == 'No seat held for this event'
+
+def test_expired_hold_cannot_be_confirmed(client, app, small_event):
+    """Test that a hold past its deadline is refused and its seat reclaimed on demand."""
+    holder = _headers(app, 'hold_late')
+    other = _headers(app, 'hold_other')
+    client.post(f'/api/events/{small_event}/hold', headers=holder)
+    _expire_all_holds(app)
+
+    response = client.post(f'/api/events/{small_event}/hold/confirm', headers=holder)
+    assert response.status_code == 410
+    assert json.loads(response.data)['message'] == 'Seat hold has expired'
+
+    # Without waiting for the sweeper, the next registration takes the expired seat once
+    # the admission gate's knowledge that the event is full has lapsed
+    get_gate(app).reopen(small_event)
+    response = client.post(f'/api/events/{small_event}/register', headers=other)
+    assert response.status_code == 200
+    event = json.loads(response.data)['event']
+    assert (event['attendee_count'], event['held_count']) == (1, 0)
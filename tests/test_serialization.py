@@ -0,0 +1,78 @@
+import json
+import pytest
+from datetime import datetime
+from flask import jsonify
+from app.utils import json_provider
+from app.utils.json_provider import RawJSON, json_array
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def encoder(request, monkeypatch):
+    """Run a test with orjson and with the json module fallback."""
+    if request.param == 'orjson':
+        if json_provider.orjson is None:
+            pytest.skip('orjson is not installed')
+    else:
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    return request.param
+
+def test_provider_encodes_datetimes(app, encoder):
+    """Test that datetimes are written as ISO 8601 like to_dict() does."""
+    with app.test_request_context():
+        response = jsonify({'at': datetime(2024, 5, 1, 12, 30, 15, 250), 'n': 1})
+
+    assert json.loads(response.data) == {'at': '2024-05-01T12:30:15.000250', 'n': 1}
+    assert response.mimetype == 'application/json'
+
+def test_provider_embeds_raw_json(app, encoder):
+    """Test that pre-encoded documents are written out unchanged."""
+    with app.test_request_context():
+        raw = RawJSON(b'{"id":1}')
+        assert json.loads(jsonify({'event': raw}).data) == {'event': {'id': 1}}
+        assert json.loads(json_array([raw, {'id': 2}])) == [{'id': 1}, {'id': 2}]
+
+def test_orjson_splices_raw_json_without_parsing(app, monkeypatch):
+    """Test that orjson writes nested pre-encoded documents without decoding them."""
+    if json_provider.orjson is None:
+        pytest.skip('orjson is not installed')
+    def fail(*args, **kwargs):
+        raise AssertionError('RawJSON was parsed')
+    monkeypatch.setattr(json_provider.json, 'loads', fail)
+    with app.test_request_context():
+        body = jsonify({'events': [RawJSON(b'{"id":1}')]}).data
+    assert body == b'{"events":[{"id":1}]}'
+
+def test_provider_parses_request_bodies(client, encoder):
+    """Test that request JSON is decoded by the provider."""
+    response = client.post('/api/auth/login', data='{"email": "nobody@test.com", "password": "x"}',
+                           content_type='application/json')
+    assert response.status_code == 401
+
+def _cache(app):
+    return app.extensions['event_json_cache']
+
+def test_published_event_encoded_once(client, app, user_token):
+    """Test that repeated reads of a published event reuse its encoded JSON."""
+    headers = {'Authorization': f'Bearer {user_token}'}
+    first = client.get('/api/events/1', headers=headers)
+    hits = _cache(app).hits
+    second = client.get('/api/events/1', headers=headers)
+
+    assert first.data == second.data
+    assert _cache(app).hits == hits + 1
+    assert json.loads(second.data)['title'] == 'Test Event 1'
+
+def test_event_encoding_follows_changes(client, app, user_token):
+    """Test that a new attendee count produces a fresh encoding."""
+    headers = {'Authorization': f'Bearer {user_token}'}
+    before = json.loads(client.get('/api/events/1', headers=headers).data)
+
+    client.delete('/api/events/1/unregister', headers=headers)
+    after = json.loads(client.get('/api/events/1', headers=headers).data)
+
+    assert after['attendee_count'] == before['attendee_count'] - 1
+
+def test_unpublished_events_not_cached(client, app, publisher_token):
+    """Test that drafts are encoded on every request instead of being cached."""
+    client.get('/api/events/2', headers={'Authorization': f'Bearer {publisher_token}'})
+
+    assert all(key[0] != 2 for key in _cache(app)._entries)
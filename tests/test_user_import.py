@@ -0,0 +1,94 @@
+import io
+import json
+from app import db
+from app.models import User, UserRole
+
+def _csv(rows):
+    return 'username,email,password\n' + ''.join(f'{u},{e},{p}\n' for u, e, p in rows)
+
+def test_bulk_create_users(client, app, admin_token):
+    """Test importing users from a JSON array, with invalid and duplicate rows rejected."""
+    response = client.post('/api/users/bulk', headers={'Authorization': f'Bearer {admin_token}'}, json=[
+        {'username': 'alice', 'email': 'alice@Example.com', 'password': 'secret'},
+        {'username': 'bob', 'email': 'bob@example.com', 'password': 'secret'},
+        {'username': 'alice', 'email': 'alice2@example.com', 'password': 'secret'},
+        {'username': 'carol', 'email': 'user@test.com', 'password': 'secret'},
+        {'username': 'dave', 'email': 'not-an-email', 'password': 'secret'},
+        {'username': 'erin', 'email': 'erin@example.com'},
+    ])
+    assert response.status_code == 200
+    data = json.loads(response.data)
+
+    assert data['processed'] == 6
+    assert data['created'] == 2
+    assert [(row['row'], row['message']) for row in data['rejected'][:3]] == [
+        (3, 'Username already exists'), (4, 'Email already exists'), (5, data['rejected'][2]['message'])
+    ]
+    assert data['rejected'][3] == {'row': 6, 'username': 'erin', 'email': 'erin@example.com', 'message': 'Missing required fields'}
+
+    with app.app_context():
+        alice = User.query.filter_by(username='alice').first()
+        assert alice.email == 'alice@example.com'
+        assert alice.role == UserRole.USER
+        assert alice.check_password('secret')
+
+    response = client.post('/api/auth/login', json={'email': 'bob@example.com', 'password': 'secret'})
+    assert response.status_code == 200
+
+def test_bulk_create_users_upload_and_resume(client, app, admin_token):
+    """Test uploading a CSV file in chunks, stopping at malformed input and resuming."""
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    app.config['USER_IMPORT_CHUNK_SIZE'] = 2
+    rows = [(f'csv{i}', f'csv{i}@example.com', 'secret') for i in range(5)]
+
+    response = client.post(
+        '/api/users/bulk', headers=headers, content_type='multipart/form-data',
+        data={'file': (io.BytesIO(_csv(rows).encode()), 'users.csv')}
+    )
+    data = json.loads(response.data)
+    assert data['processed'] == 5
+    assert data['created'] == 5
+
+    body = ''.join(json.dumps({'username': f'line{i}', 'email': f'line{i}@example.com', 'password': 'x'}) + '\n' for i in range(3))
+    response = client.post('/api/users/bulk', headers=headers, data=body + '{oops\n', content_type='application/x-ndjson')
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['message'] == 'Invalid JSON on line 4'
+    assert data['processed'] == 3
+    assert data['created'] == 3
+
+    # Resuming after the rows already done skips them
+    body += json.dumps({'username': 'line3', 'email': 'line3@example.com', 'password': 'x'}) + '\n'
+    response = client.post('/api/users/bulk?skip=3', headers=headers, data=body, content_type='application/x-ndjson')
+    data = json.loads(response.data)
+    assert data['processed'] == 4
+    assert data['created'] == 1
+    assert data['rejected'] == []
+
+def test_bulk_create_users_requires_admin(client, publisher_token):
+    """Test that only admins can import users."""
+    response = client.post('/api/users/bulk', headers={'Authorization': f'Bearer {publisher_token}'}, json=[])
+    assert response.status_code == 403
+
+def test_import_users_command_resumes(app, tmp_path):
+    """Test the CLI import on the process pool, resuming from its progress file."""
+    path = tmp_path / 'users.csv'
+    path.write_text(_csv([(f'cli{i}', f'cli{i}@example.com', 'secret') for i in range(4)]))
+    (tmp_path / 'users.csv.progress').write_text(json.dumps({'processed': 1, 'created': 1}))
+    app.config['USER_IMPORT_HASH_WORKERS'] = 2
+
+    result = app.test_cli_runner().invoke(args=['users', 'import', str(path), '--chunk-size', '2'])
+    assert result.exit_code == 0, result.output
+    assert 'Resuming after 1 rows' in result.output
+    assert 'Imported 3 users' in result.output
+    assert not (tmp_path / 'users.csv.progress').exists()
+
+    with app.app_context():
+        usernames = set(db.session.execute(db.select(User.username).where(User.username.like('cli%'))).scalars())
+        assert usernames == {'cli1', 'cli2', 'cli3'}
+        assert User.query.filter_by(username='cli3').first().check_password('secret')
+
+    # Restarting imports the skipped first row and rejects the others as duplicates
+    result = app.test_cli_runner().invoke(args=['users', 'import', str(path), '--restart'])
+    assert 'Imported 1 users, rejected 3 rows' in result.output
+    assert 'Row 3: Username already exists' in result.output
@@ -169,4 +169,37 @@ def test_revoke_privileges(client, admin_token):
     assert response.status_code == 200
     data = json.loads(response.data)
     assert data['message'] == 'User privileges revoked successfully'
-    assert data['user']['role'] == UserRole.USER 
\ No newline at end of file
+    assert data['user']['role'] == UserRole.USER
+
+
+def test_get_user_conditional(client, user_token):
+    """Test ETag revalidation of user resources."""
+    headers = {'Authorization': f'Bearer {user_token}'}
+    response = client.get('/api/auth/me', headers=headers)
+    etag = response.headers['ETag']
+    user_id = json.loads(response.data)['id']
+    
+    response = client.get('/api/auth/me', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+    
+    response = client.get(f'/api/users/{user_id}', headers={**headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+def test_user_listings_query_budget(client, app, admin_token, query_budget):
+    """Test that user listings take a fixed number of queries however many users exist."""
+    from app import db
+
+    with app.app_context():
+        db.session.add_all([
+            User(username=f'listed{i}', email=f'listed{i}@test.com', password='password', role=UserRole.PUBLISHER)
+            for i in range(50)
+        ])
+        db.session.commit()
+
+    headers = {'Authorization': f'Bearer {admin_token}'}
+    with query_budget(3):
+        response = client.get('/api/users/', headers=headers)
+        assert len(json.loads(response.data)) == 53
+    with query_budget(3):
+        response = client.get('/api/users/publishers', headers=headers)
+        assert len(json.loads(response.data)) == 52